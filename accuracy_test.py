@@ -11,8 +11,8 @@ import numpy as np
 import pandas as pd
 from sklearn.metrics import mean_absolute_error, r2_score, root_mean_squared_error
 
+from feature_store import get_feature_store
 from modeling import load_predictor_bundle
-from train_models import _build_features, TARGET_COLUMNS, AUXILIARY_TARGETS
 
 
 DATASET_PATH = Path("data/player_game_logs.csv")
@@ -35,18 +35,22 @@ def run_accuracy_test() -> None:
     print("  NBA PREDICTOR — ACCURACY TEST")
     print("=" * 62)
 
-    print("\nLoading dataset...")
-    frame = pd.read_csv(DATASET_PATH)
-    frame["game_date"] = pd.to_datetime(frame["game_date"], errors="coerce")
-    frame = frame.dropna(subset=["game_date"]).copy()
-
-    print("Building features...")
-    feature_frame = _build_features(frame)
+    print("\nLoading features...")
+    store = get_feature_store(DATASET_PATH)
+    # Per-date row counts locate the validation split, so only the tail of the store is read.
+    rows_by_date = store.manifest()["target_rows_by_date"]
+    split_idx = int(sum(rows_by_date.values()) * (1 - VALIDATION_RATIO))
+    rows_before = 0
+    for first_date, count in rows_by_date.items():
+        if rows_before + count > split_idx:
+            break
+        rows_before += count
+
+    feature_frame = store.load(start=first_date)
     feature_frame = feature_frame.dropna(subset=TARGETS).copy()
-    feature_frame = feature_frame.sort_values("game_date").reset_index(drop=True)
-
-    split_idx = int(len(feature_frame) * (1 - VALIDATION_RATIO))
-    val = feature_frame.iloc[split_idx:].copy()
+    # Stable, so rows sharing the boundary date split the same way as a full-dataset sort.
+    feature_frame = feature_frame.sort_values("game_date", kind="stable").reset_index(drop=True)
+    val = feature_frame.iloc[split_idx - rows_before:].copy()
 
     date_min = val["game_date"].min().date()
     date_max = val["game_date"].max().date()
@@ -63,12 +67,9 @@ def run_accuracy_test() -> None:
 
     results: dict[str, dict] = {}
     for target in TARGETS:
-        spec = bundle.specs[target]
-
         def _eval(subset: pd.DataFrame) -> dict:
-            X = subset.reindex(columns=spec.feature_names or [], fill_value=0.0)
             y = subset[target]
-            preds = pd.Series(bundle.models[target].predict(X), index=subset.index)
+            preds = pd.Series(bundle.predict_frame(target, subset), index=subset.index)
             abs_err = (y - preds).abs()
             within = {tol: float((abs_err <= tol).mean()) for tol in TOLERANCES[target]}
             median_line = y.median()
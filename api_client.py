@@ -1,15 +1,21 @@
 import threading
 import time
-from functools import lru_cache
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Sequence
 from datetime import datetime
 
-import requests
-from nba_api.stats.endpoints import commonplayerinfo, leaguedashplayerstats, playergamelog
-from nba_api.stats.static import players as nba_static_players
+from nba_api.stats.endpoints import commonplayerinfo, leaguedashplayerstats, playergamelog, playergamelogs
 from nba_api.library.http import NBAHTTP
 
 from config import settings
+from game_log import compact_game_logs
+from game_log_store import get_game_log_store
+from grading import get_box_score_grader
+from http_replay import build_session, install_nba_api_session
+from nba_scheduler import schedule_nba_call
+from player_directory import get_player_directory
+from singleflight import get_group
+from swr_cache import SWRCache, refresh_in_background
 
 # Bypass NBA.com bot detection by mimicking a real browser request
 NBAHTTP.headers = {
@@ -25,34 +31,30 @@ NBAHTTP.headers = {
     "Pragma": "no-cache",
     "Cache-Control": "no-cache",
 }
+install_nba_api_session()
 
 _NBA_API_TIMEOUT = 60  # seconds — stats.nba.com can be slow
 _GAME_LOG_TTL = 3600  # 1 hour — refresh game logs once per hour
-_game_log_cache: dict[tuple, tuple[float, tuple]] = {}
-_game_log_cache_lock = threading.Lock()
-
-
-def _nba_api_fetch_with_retry(make_endpoint, max_attempts: int = 3, backoff: float = 3.0):
-    """Call make_endpoint() and retry on connection/timeout errors."""
-    last_exc = None
-    for attempt in range(max_attempts):
-        try:
-            return make_endpoint()
-        except (OSError, requests.RequestException, requests.Timeout, requests.ConnectionError) as exc:
-            last_exc = exc
-            if attempt < max_attempts - 1:
-                time.sleep(backoff * (attempt + 1))
-    raise last_exc
+_GAME_LOG_MAX_STALE = 12 * 3600  # past this, a stale player-season is refreshed inline
+_DASHBOARD_TTL = 6 * 3600
+_DASHBOARD_MAX_STALE = 48 * 3600
+_DASHBOARD_ERROR_TTL = 300  # a failed dashboard load is retried at most this often
+_COMPACT_LOG_CACHE_SIZE = 2048  # player-seasons kept decoded per worker
+_game_log_flight = get_group("nba.player_game_log")
+_league_game_log_flight = get_group("nba.league_game_logs")
+# Season-level LeagueDashPlayerStats pulls, versioned and refreshed in the background.
+_dashboard_cache = SWRCache(
+    "nba.player_dashboards",
+    ttl=_DASHBOARD_TTL,
+    max_stale=_DASHBOARD_MAX_STALE,
+    error_ttl=_DASHBOARD_ERROR_TTL,
+)
 
 
 def _season_string(season_start_year: int) -> str:
     return f"{season_start_year}-{str(season_start_year + 1)[-2:]}"
 
 
-def _normalize_player_name(value: str) -> str:
-    return " ".join(str(value).lower().replace(".", "").split())
-
-
 def _normalize_game_date(value: str | None) -> str:
     if not value:
         return ""
@@ -68,9 +70,23 @@ def _normalize_game_date(value: str | None) -> str:
         return text
 
 
-@lru_cache(maxsize=4)
 def _season_player_dashboard(season_start_year: int) -> list[dict[str, Any]]:
+    return _dashboard_cache.get(
+        ("season", int(season_start_year)),
+        lambda: _fetch_player_dashboard(season_start_year),
+    )
+
+
+def _recent_player_dashboard(season_start_year: int, last_n_games: int) -> list[dict[str, Any]]:
+    return _dashboard_cache.get(
+        ("recent", int(season_start_year), int(last_n_games)),
+        lambda: _fetch_player_dashboard(season_start_year, last_n_games=last_n_games),
+    )
+
+
+def _fetch_player_dashboard(season_start_year: int, last_n_games: int | None = None) -> list[dict[str, Any]]:
     season = _season_string(season_start_year)
+    recent_filter = {"last_n_games": str(last_n_games)} if last_n_games else {}
     def _fetch():
         endpoint = leaguedashplayerstats.LeagueDashPlayerStats(
             season=season,
@@ -78,98 +94,202 @@ def _season_player_dashboard(season_start_year: int) -> list[dict[str, Any]]:
             measure_type_detailed_defense="Advanced",
             per_mode_detailed="PerGame",
             timeout=_NBA_API_TIMEOUT,
+            **recent_filter,
         )
         return endpoint.get_data_frames()[0].to_dict(orient="records")
-    return _nba_api_fetch_with_retry(_fetch)
-
-
-@lru_cache(maxsize=8)
-def _recent_player_dashboard(season_start_year: int, last_n_games: int) -> list[dict[str, Any]]:
+    return schedule_nba_call("LeagueDashPlayerStats", _fetch)
+
+
+def _game_log_row_to_dict(row: dict[str, Any], player_id: str, static_player: dict[str, Any] | None) -> dict[str, Any]:
+    matchup = str(row.get("MATCHUP", ""))
+    opponent_abbr = matchup.split()[-1] if matchup else None
+    return {
+        "game": {
+            "id": row.get("Game_ID") or row.get("GAME_ID"),
+            "date": row.get("GAME_DATE"),
+        },
+        "team": {
+            "id": row.get("TEAM_ID"),
+            "code": row.get("TEAM_ABBREVIATION"),
+        },
+        "player": {
+            "id": player_id,
+            "firstname": (static_player or {}).get("first_name"),
+            "lastname": (static_player or {}).get("last_name"),
+        },
+        "opponent_abbr": opponent_abbr,
+        "points": row.get("PTS", 0),
+        "fgm": row.get("FGM", 0),
+        "fga": row.get("FGA", 0),
+        "fgp": row.get("FG_PCT", 0),
+        "ftp": row.get("FT_PCT", 0),
+        "tpm": row.get("FG3M", 0),
+        "tpa": row.get("FG3A", 0),
+        "tpp": row.get("FG3_PCT", 0),
+        "offReb": row.get("OREB", 0),
+        "defReb": row.get("DREB", 0),
+        "totReb": row.get("REB", 0),
+        "assists": row.get("AST", 0),
+        "pFouls": row.get("PF", 0),
+        "steals": row.get("STL", 0),
+        "turnovers": row.get("TOV", 0),
+        "blocks": row.get("BLK", 0),
+        "plusMinus": row.get("PLUS_MINUS", 0),
+        "min": row.get("MIN", 0),
+    }
+
+
+def _store_entry(game: dict[str, Any]) -> tuple[str, str, dict[str, Any]]:
+    game_info = game.get("game") or {}
+    return str(game_info.get("id")), _normalize_game_date(game_info.get("date")), game
+
+
+_compact_logs: OrderedDict[tuple[str, int], tuple[tuple, Sequence[dict[str, Any]]]] = OrderedDict()
+_compact_logs_lock = threading.Lock()
+
+
+def _load_stored_game_logs(player_id: str, season_start_year: int) -> Sequence[dict[str, Any]]:
+    """
+    Stored rows for one player-season as a compact PlayerGameLog, decoded once
+    per store write instead of once per call.
+    """
+    store = get_game_log_store()
+    meta = store.get_meta(player_id, season_start_year)
+    key = (str(player_id), int(season_start_year))
+    version = (meta["last_fetched_at"], meta["latest_game_date"]) if meta else None
+    with _compact_logs_lock:
+        cached = _compact_logs.get(key)
+        if cached is not None and cached[0] == version:
+            _compact_logs.move_to_end(key)
+            return cached[1]
+    game_logs = compact_game_logs(store.load(player_id, season_start_year))
+    with _compact_logs_lock:
+        _compact_logs[key] = (version, game_logs)
+        _compact_logs.move_to_end(key)
+        while len(_compact_logs) > _COMPACT_LOG_CACHE_SIZE:
+            _compact_logs.popitem(last=False)
+    return game_logs
+
+
+def _cached_player_game_logs(
+    player_id: str,
+    season_start_year: int,
+    covers_date: str | None = None,
+) -> Sequence[dict[str, Any]]:
+    """
+    Per-player season logs backed by the shared on-disk store.
+    Stale entries are returned immediately while a background refresh fetches
+    games on or after the latest stored date; only missing or very stale
+    entries block. When covers_date is given, stored rows that already reach
+    that date are used as-is.
+    """
+    store = get_game_log_store()
+    meta = store.get_meta(player_id, season_start_year)
+    key = (str(player_id), int(season_start_year))
+
+    def refresh() -> None:
+        # Concurrent misses for the same player-season share one upstream fetch.
+        _game_log_flight.do(key, lambda: _refresh_player_game_logs(player_id, season_start_year))
+
+    if meta is not None:
+        age = time.time() - meta["last_fetched_at"]
+        covered = bool(covers_date) and meta["latest_game_date"] >= covers_date
+        if age < _GAME_LOG_TTL or covered:
+            return _load_stored_game_logs(player_id, season_start_year)
+        if age < _GAME_LOG_TTL + _GAME_LOG_MAX_STALE:
+            refresh_in_background(("nba.player_game_log",) + key, refresh)
+            return _load_stored_game_logs(player_id, season_start_year)
+
+    refresh()
+    return _load_stored_game_logs(player_id, season_start_year)
+
+
+def _refresh_player_game_logs(player_id: str, season_start_year: int) -> None:
+    store = get_game_log_store()
+    meta = store.get_meta(player_id, season_start_year)
+    if meta is not None and time.time() - meta["last_fetched_at"] < _GAME_LOG_TTL:
+        return  # refreshed by another caller (or worker) while this one was waiting
     season = _season_string(season_start_year)
+    static_player = get_player_directory().get(player_id)
+    date_from = ""
+    if meta is not None and meta["latest_game_date"]:
+        date_from = datetime.fromisoformat(meta["latest_game_date"]).strftime("%m/%d/%Y")
+
     def _fetch():
-        endpoint = leaguedashplayerstats.LeagueDashPlayerStats(
+        endpoint = playergamelog.PlayerGameLog(
+            player_id=player_id,
             season=season,
-            season_type_all_star="Regular Season",
-            measure_type_detailed_defense="Advanced",
-            per_mode_detailed="PerGame",
-            last_n_games=str(last_n_games),
+            date_from_nullable=date_from,
             timeout=_NBA_API_TIMEOUT,
         )
-        return endpoint.get_data_frames()[0].to_dict(orient="records")
-    return _nba_api_fetch_with_retry(_fetch)
+        frame = endpoint.get_data_frames()[0]
+        if frame.empty:
+            return []
+        return [_game_log_row_to_dict(row, player_id, static_player) for row in frame.to_dict(orient="records")]
 
+    fetched_at = time.time()
+    games = schedule_nba_call("PlayerGameLog", _fetch)
+    store.merge(player_id, season_start_year, [_store_entry(game) for game in games], fetched_at=fetched_at)
 
-def _cached_player_game_logs(player_id: str, season_start_year: int) -> tuple:
-    """Cached per-player game log fetch — expires after 1 hour."""
-    key = (player_id, season_start_year)
-    now = time.time()
-    with _game_log_cache_lock:
-        if key in _game_log_cache:
-            cached_at, result = _game_log_cache[key]
-            if now - cached_at < _GAME_LOG_TTL:
-                return result
 
-    season = _season_string(season_start_year)
-    team_lookup = {player["id"]: player for player in nba_static_players.get_players()}
-    static_player = team_lookup.get(int(player_id)) if str(player_id).isdigit() else None
+def prime_league_game_logs(season_start_year: int, player_ids: set[str] | None = None) -> int:
+    """
+    Refresh the game-log store for a whole season with one league-wide
+    PlayerGameLogs call (only games since the last bulk load), split per player.
+    Skips the call when every requested player is already fresh. Returns the
+    number of players whose rows were written.
+    """
+    return _league_game_log_flight.do(
+        int(season_start_year),
+        lambda: _load_league_game_logs(season_start_year, player_ids),
+    )
 
-    def _fetch():
-        endpoint = playergamelog.PlayerGameLog(player_id=player_id, season=season, timeout=_NBA_API_TIMEOUT)
-        frame = endpoint.get_data_frames()[0]
-        if frame.empty:
-            return ()
-        results = []
-        for row in frame.to_dict(orient="records"):
-            matchup = str(row.get("MATCHUP", ""))
-            opponent_abbr = matchup.split()[-1] if matchup else None
-            results.append(
-                {
-                    "game": {
-                        "id": row.get("Game_ID") or row.get("GAME_ID"),
-                        "date": row.get("GAME_DATE"),
-                    },
-                    "team": {
-                        "id": row.get("TEAM_ID"),
-                        "code": row.get("TEAM_ABBREVIATION"),
-                    },
-                    "player": {
-                        "id": player_id,
-                        "firstname": (static_player or {}).get("first_name"),
-                        "lastname": (static_player or {}).get("last_name"),
-                    },
-                    "opponent_abbr": opponent_abbr,
-                    "points": row.get("PTS", 0),
-                    "fgm": row.get("FGM", 0),
-                    "fga": row.get("FGA", 0),
-                    "fgp": row.get("FG_PCT", 0),
-                    "ftp": row.get("FT_PCT", 0),
-                    "tpm": row.get("FG3M", 0),
-                    "tpa": row.get("FG3A", 0),
-                    "tpp": row.get("FG3_PCT", 0),
-                    "offReb": row.get("OREB", 0),
-                    "defReb": row.get("DREB", 0),
-                    "totReb": row.get("REB", 0),
-                    "assists": row.get("AST", 0),
-                    "pFouls": row.get("PF", 0),
-                    "steals": row.get("STL", 0),
-                    "turnovers": row.get("TOV", 0),
-                    "blocks": row.get("BLK", 0),
-                    "plusMinus": row.get("PLUS_MINUS", 0),
-                    "min": row.get("MIN", 0),
-                }
-            )
-        return tuple(results)
 
-    result = _nba_api_fetch_with_retry(_fetch)
-    with _game_log_cache_lock:
-        _game_log_cache[key] = (now, result)
-    return result
+def _load_league_game_logs(season_start_year: int, player_ids: set[str] | None) -> int:
+    store = get_game_log_store()
+    now = time.time()
+    if player_ids:
+        metas = [store.get_meta(str(player_id), season_start_year) for player_id in player_ids]
+        if all(meta is not None and now - meta["last_fetched_at"] < _GAME_LOG_TTL for meta in metas):
+            return 0
+    league_meta = store.get_league_meta(season_start_year)
+    if league_meta is not None and now - league_meta["last_fetched_at"] < _GAME_LOG_TTL and not player_ids:
+        return 0
+    date_from = ""
+    if league_meta is not None and league_meta["latest_game_date"]:
+        date_from = datetime.fromisoformat(league_meta["latest_game_date"]).strftime("%m/%d/%Y")
+
+    def _fetch():
+        endpoint = playergamelogs.PlayerGameLogs(
+            season_nullable=_season_string(season_start_year),
+            season_type_nullable="Regular Season",
+            date_from_nullable=date_from,
+            timeout=_NBA_API_TIMEOUT,
+        )
+        return endpoint.get_data_frames()[0]
+
+    fetched_at = time.time()
+    frame = schedule_nba_call("PlayerGameLogs", _fetch)
+    directory = get_player_directory()
+    games_by_player: dict[str, list[tuple[str, str, dict[str, Any]]]] = {
+        str(player_id): [] for player_id in (player_ids or ())
+    }
+    for row in frame.to_dict(orient="records"):
+        player_id = str(row.get("PLAYER_ID"))
+        iso_date = _normalize_game_date(str(row.get("GAME_DATE", ""))[:10])
+        if iso_date:
+            # Match the "MON DD, YYYY" dates PlayerGameLog returns.
+            row["GAME_DATE"] = datetime.fromisoformat(iso_date).strftime("%b %d, %Y").upper()
+        game = _game_log_row_to_dict(row, player_id, directory.get(player_id))
+        games_by_player.setdefault(player_id, []).append(_store_entry(game))
+    store.merge_league(season_start_year, games_by_player, fetched_at=fetched_at)
+    return len(games_by_player)
 
 
 class NBAApiClient:
     def __init__(self) -> None:
         self.base_url = f"https://{settings.rapidapi_host}"
-        self.session = requests.Session()
+        self.session = build_session()
         if settings.rapidapi_key:
             self.session.headers.update(
                 {
@@ -239,41 +359,30 @@ class NBAApiClient:
         }
 
     def _search_players_nba_api(self, query: str) -> list[dict[str, Any]]:
-        query_lower = query.lower().strip()
-        found_players = nba_static_players.find_players_by_full_name(query)
-        if not found_players:
-            found_players = [
-                player
-                for player in nba_static_players.get_players()
-                if query_lower in player["last_name"].lower()
-                or query_lower in player["full_name"].lower()
-            ]
-        found_players = sorted(
-            found_players,
-            key=lambda player: (
-                player["full_name"].lower() != query_lower,
-                player["last_name"].lower() != query_lower,
-                not player.get("is_active", False),
-                player["full_name"],
-            ),
-        )
-        return [self._format_static_player(player) for player in found_players[:20]]
+        return [self._format_static_player(player) for player in get_player_directory().search(query, limit=20)]
 
     def _get_player_details_nba_api(self, player_id: str) -> dict[str, Any] | None:
-        fallback_candidates = [player for player in nba_static_players.get_players() if str(player["id"]) == str(player_id)]
-        fallback = self._format_static_player(fallback_candidates[0]) if fallback_candidates else None
+        static_player = get_player_directory().get(player_id)
+        fallback = self._format_static_player(static_player) if static_player else None
         try:
-            endpoint = commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=_NBA_API_TIMEOUT)
-            frame = endpoint.get_data_frames()[0]
+            frame = schedule_nba_call(
+                "CommonPlayerInfo",
+                lambda: commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=_NBA_API_TIMEOUT).get_data_frames()[0],
+            )
             if frame.empty:
                 return fallback
             return self._format_common_player_info(frame.iloc[0].to_dict(), fallback=fallback)
         except Exception:
             return fallback
 
-    def _get_player_statistics_nba_api(self, player_id: str, season_start_year: int | None = None) -> list[dict[str, Any]]:
+    def _get_player_statistics_nba_api(
+        self,
+        player_id: str,
+        season_start_year: int | None = None,
+        covers_date: str | None = None,
+    ) -> Sequence[dict[str, Any]]:
         season_year = season_start_year if season_start_year is not None else settings.season_start_year
-        return list(_cached_player_game_logs(str(player_id), int(season_year)))
+        return _cached_player_game_logs(str(player_id), int(season_year), covers_date=covers_date)
 
 
     def search_players(self, query: str) -> list[dict[str, Any]]:
@@ -289,7 +398,7 @@ class NBAApiClient:
             return players[0] if players else None
         return self._get_player_details_nba_api(player_id)
 
-    def get_player_statistics(self, player_id: str, season_start_year: int | None = None) -> list[dict[str, Any]]:
+    def get_player_statistics(self, player_id: str, season_start_year: int | None = None) -> Sequence[dict[str, Any]]:
         if settings.rapidapi_key:
             season = season_start_year if season_start_year is not None else settings.season_start_year
             data = self._get("/players/statistics", {"id": str(player_id), "season": str(season)})
@@ -307,13 +416,30 @@ class NBAApiClient:
         if not target_date:
             return None
 
+        normalized_opponent = str(opponent_abbr or "").strip().upper()
+        if not settings.rapidapi_key:
+            try:
+                return get_box_score_grader().lookup(
+                    target_date,
+                    player_id=player_id,
+                    opponent_abbr=normalized_opponent or None,
+                )
+            except Exception as exc:
+                print(f"Box score grading error for {target_date}: {exc}")
+
         season_year = int(target_date[:4])
         candidate_seasons = sorted({season_year, season_year - 1}, reverse=True)
-        normalized_opponent = str(opponent_abbr or "").strip().upper()
 
         for season_start_year in candidate_seasons:
             try:
-                game_logs = self.get_player_statistics(player_id, season_start_year=season_start_year)
+                if settings.rapidapi_key:
+                    game_logs = self.get_player_statistics(player_id, season_start_year=season_start_year)
+                else:
+                    game_logs = self._get_player_statistics_nba_api(
+                        player_id,
+                        season_start_year=season_start_year,
+                        covers_date=target_date,
+                    )
             except Exception:
                 continue
             matches = []
@@ -342,37 +468,7 @@ class NBAApiClient:
         return None
 
     def resolve_player_id_by_name(self, full_name: str) -> int | None:
-        normalized_target = _normalize_player_name(full_name)
-        exact_matches = [
-            player
-            for player in nba_static_players.get_players()
-            if _normalize_player_name(player.get("full_name", "")) == normalized_target
-        ]
-        if exact_matches:
-            exact_matches.sort(
-                key=lambda player: (
-                    not player.get("is_active", False),
-                    player.get("from_year") is None,
-                    -(player.get("from_year") or 0),
-                )
-            )
-            return int(exact_matches[0]["id"])
-
-        partial_matches = [
-            player
-            for player in nba_static_players.get_players()
-            if normalized_target in _normalize_player_name(player.get("full_name", ""))
-        ]
-        if not partial_matches:
-            return None
-        partial_matches.sort(
-            key=lambda player: (
-                not player.get("is_active", False),
-                player.get("from_year") is None,
-                -(player.get("from_year") or 0),
-            )
-        )
-        return int(partial_matches[0]["id"])
+        return get_player_directory().resolve_id(full_name)
 
     def get_team_rotation(self, team_abbr: str, limit: int = 5) -> list[dict[str, Any]]:
         season_year = settings.season_start_year
@@ -9,8 +9,11 @@ from threading import Lock, Thread
 
 from flask import Flask, Response, render_template, request
 
-from api_client import NBAApiClient
+from api_client import NBAApiClient, prime_league_game_logs
+from board_engine import BoardEngine, BoardSnapshot, BoardSource, pooled
+from board_refresher import board_refresher_stats, register_board, snapshot_age, start_board_refresher
 from config import settings
+from grading import get_box_score_grader
 from historical_backtest import get_historical_backtest_overview, run_historical_backtest, run_batch_backtest
 try:
     from model_insights import get_model_insights
@@ -29,8 +32,17 @@ except ImportError:
     OddsApiClient = None
     OddsApiProviderError = Exception
 from parlayplay_client import ParlayPlayClient, ParlayPlayProviderError
-from prediction import predict_player_statline, predict_player_stats
+from game_log_store import get_game_log_store, on_new_games
+from injury_client import on_injury_report_change
+from live_context import context_version, start_context_refresher
+from modeling import load_predictor_bundle, model_load_stats, model_version, on_bundle_swap
+from prediction import predict_player_statline, predict_player_statlines
+from prediction_cache import PredictionCache, prediction_cache_stats
 from prizepicks_client import PrizePicksClient, PrizePicksProviderError
+from prop_probability import probability_engine
+from nba_scheduler import BACKGROUND, get_scheduler, request_priority
+from singleflight import singleflight_stats
+from swr_cache import swr_stats
 from underdog_client import UnderdogClient, UnderdogProviderError
 
 app = Flask(__name__)
@@ -57,6 +69,13 @@ TRACKED_MARKETS = [
 ]
 UNDERDOG_MARKET_FILTERS = ["all"] + [market_label for market_label, _ in TRACKED_MARKETS]
 UNDERDOG_BOARD_PREDICTION_WORKERS = 6
+# board_refresher names of the snapshots behind each board page, keyed by _board_context source_name.
+BOARD_REFRESH_NAMES = {
+    "Underdog": "underdog",
+    "Underdog NCAAB": "underdog_ncaab",
+    "PrizePicks": "prizepicks",
+    "ParlayPlay": "parlayplay",
+}
 TRACKING_FIELDNAMES = [
     "created_at",
     "sportsbook",
@@ -1137,15 +1156,25 @@ def _fetch_actual_rows_from_tracking(*, game_date: str) -> tuple[list[dict[str,
             message += f" Available tracked dates: {available_dates}."
         return [], [message]
 
+    # Without RapidAPI every pick is graded from one league-wide box-score pull for the date.
+    grader = None if settings.rapidapi_key else get_box_score_grader()
     fetched_rows = []
     errors = []
     for player_id, player_name, opponent_abbr in candidates.keys():
         try:
-            actuals = client.get_player_actual_result(
-                player_id,
-                game_date=game_date,
-                opponent_abbr=opponent_abbr or None,
-            )
+            if grader is not None:
+                actuals = grader.lookup(
+                    game_date,
+                    player_id=player_id,
+                    player_name=player_name,
+                    opponent_abbr=opponent_abbr or None,
+                )
+            else:
+                actuals = client.get_player_actual_result(
+                    player_id,
+                    game_date=game_date,
+                    opponent_abbr=opponent_abbr or None,
+                )
         except Exception as exc:
             print(f"Auto actual fetch error for {player_name or player_id}: {exc}")
             actuals = None
@@ -1232,6 +1261,49 @@ def _edge_signal(
     return "Pass", "signal-pass", note
 
 
+def _attach_win_probabilities(board_rows: list[dict]) -> None:
+    """
+    Score every board row through the residual probability engine in one pass.
+    Rows with a pick side are scored on that side, the rest on the likelier one.
+    Leaves the rows untouched when the models carry no residuals or metrics.
+    """
+    if not board_rows:
+        return
+    try:
+        bundle = load_predictor_bundle()
+        engine = probability_engine(bundle.metadata, bundle.version)
+    except Exception as exc:
+        print(f"Probability engine error: {exc}")
+        return
+    if engine is None:
+        return
+    scored = engine.evaluate(
+        [row["market"] for row in board_rows],
+        [row["model_projection"] for row in board_rows],
+        [row["sportsbook_line"] for row in board_rows],
+        sides=[{"more": 1, "less": -1}.get(row.get("pick_side") or "", 0) for row in board_rows],
+        payouts=[row.get("payout_multiplier") for row in board_rows],
+    )
+    for index, row in enumerate(board_rows):
+        win_probability = float(scored["win_probability"][index])
+        if win_probability != win_probability:
+            continue
+        expected_value = float(scored["expected_value"][index])
+        row["p_over"] = round(float(scored["p_over"][index]), 4)
+        row["p_under"] = round(float(scored["p_under"][index]), 4)
+        row["win_probability"] = round(win_probability, 4)
+        row["expected_value"] = round(expected_value, 4)
+        row["probability_side_label"] = "Over" if scored["side"][index] > 0 else "Under"
+        row["win_probability_label"] = f"{win_probability * 100:.0f}%"
+        row["expected_value_label"] = f"{expected_value * 100:+.0f}%"
+
+
+def _board_rank_key(row: dict) -> tuple[float, float]:
+    """Rank by expected value per unit staked, then by edge; rows without probabilities sort by edge after scored ones."""
+    expected_value = row.get("expected_value")
+    return (float("-inf") if expected_value is None else float(expected_value), float(row.get("absolute_edge") or 0.0))
+
+
 def _build_market_cards(
     prediction: dict[str, float],
     line_inputs: dict[str, float | None],
@@ -1442,6 +1514,7 @@ def _board_context(
         line_movers=line_movers or [],
         latest_snapshot_at=latest_snapshot_at,
         book_discrepancies=book_discrepancies or [],
+        snapshot_age=snapshot_age(BOARD_REFRESH_NAMES.get(source_name, "")),
     )
 
 
@@ -1450,25 +1523,36 @@ def _build_parlay_combos(
     sizes: tuple[int, ...] = (2, 3, 4, 5),
     candidate_pool: int = 25,
 ) -> dict[int, list[dict]]:
-    """Best N-pick combos by max total edge, no duplicate players per combo."""
+    """
+    Best N-pick combos, no duplicate players per combo. With model win
+    probabilities a combo scores by the log of its expected payout factor,
+    i.e. the product of each leg's win probability and payout multiplier
+    (legs on different players treated as independent); otherwise by total
+    edge weighted by historical market hit rate.
+    """
+    import math
     from itertools import combinations
 
+    use_probabilities = any(r.get("win_probability") is not None for r in board_rows)
+
     def _confidence_score(r: dict) -> float:
+        if use_probabilities:
+            return math.log(float(r["win_probability"]) * float(r.get("payout_multiplier") or 1.0))
         hit_rate = MARKET_HIT_RATE.get(r.get("market", ""), 0.5)
         return float(r.get("absolute_edge", 0.0)) * hit_rate
 
-    eligible = sorted(
-        [r for r in board_rows if float(r.get("edge") or 0.0) > 0],
-        key=_confidence_score,
-        reverse=True,
-    )[:candidate_pool]
+    if use_probabilities:
+        candidates = [r for r in board_rows if float(r.get("win_probability") or 0.0) > 0.5]
+    else:
+        candidates = [r for r in board_rows if float(r.get("edge") or 0.0) > 0]
+    eligible = sorted(candidates, key=_confidence_score, reverse=True)[:candidate_pool]
 
     result: dict[int, list[dict]] = {}
     for size in sizes:
         if len(eligible) < size:
             result[size] = []
             continue
-        best_score = -1.0
+        best_score = float("-inf")
         best_combo: list[dict] = []
         for combo in combinations(eligible, size):
             if len({str(r["player_id"]) for r in combo}) < size:
@@ -1528,258 +1612,275 @@ def _resolve_player_id_cached(player_name: str) -> int | None:
     return client.resolve_player_id_by_name(player_name)
 
 
-@lru_cache(maxsize=2048)
-def _cached_prediction_triplet(
-    player_id: str,
-    opponent_abbr: str,
-    game_date: str,
-) -> tuple[float, float, float, object]:
-    result = predict_player_statline(
-        player_id,
-        opponent_abbr=opponent_abbr or None,
-        game_date=game_date or None,
-    )
-    return (result["points"], result["assists"], result["rebounds"], result.get("confirmed_starter"), result.get("expected_minutes", 0.0))
-
+# (player_id, opponent_abbr, game_date) -> prediction triplet, stamped with game-log, context and model versions.
+_prediction_cache = PredictionCache(
+    "predictions.triplets",
+    ttl=settings.prediction_cache_ttl_seconds,
+    max_bytes=settings.prediction_cache_max_bytes,
+)
 
-def _get_prediction_summary_cached(
-    *,
-    player_id: str,
-    opponent_abbr: str,
-    game_date: str,
-) -> dict[str, float]:
-    points, assists, rebounds, confirmed_starter, expected_minutes = _cached_prediction_triplet(
-        player_id,
-        opponent_abbr,
-        game_date,
-    )
-    summary = _build_prediction_summary(points, assists, rebounds)
-    summary["confirmed_starter"] = confirmed_starter
-    summary["expected_minutes"] = expected_minutes
-    return summary
 
+def _prediction_requests(cache_keys) -> list[dict[str, str | None]]:
+    return [
+        {"player_id": player_id, "opponent_abbr": opponent_abbr or None, "game_date": game_date or None}
+        for player_id, opponent_abbr, game_date in cache_keys
+    ]
 
-@lru_cache(maxsize=1)
-def _cached_underdog_board_snapshot() -> dict[str, object]:
-    board_entries = underdog_client.fetch_board_entries()
-    prediction_cache: dict[tuple[str, str, str], dict[str, float]] = {}
-    unmatched_players: set[str] = set()
-    board_rows: list[dict[str, str | float | None]] = []
-    resolved_entries: list[tuple[object, int, str, str, tuple[str, str, str]]] = []
-    unique_prediction_keys: dict[tuple[str, str, str], str] = {}
 
-    for entry in board_entries:
-        player_id = _resolve_player_id_cached(entry.player_name)
-        if player_id is None:
-            unmatched_players.add(entry.player_name)
+def _cached_prediction_triplets(cache_keys) -> dict[tuple[str, str, str], tuple | Exception]:
+    """
+    (points, assists, rebounds, confirmed_starter, expected_minutes) per
+    (player_id, opponent_abbr, game_date); misses are predicted in one batch.
+    Failed keys map to their exception and are not cached.
+    """
+    results: dict[tuple[str, str, str], tuple | Exception] = {}
+    current_model, current_context = model_version(), context_version()
+    cache_keys = list(dict.fromkeys(cache_keys))
+    # Read from the shared store, so games merged or corrected by another worker or the nightly ingest outdate entries here too.
+    game_log_versions = get_game_log_store().game_log_versions(settings.season_start_year, {cache_key[0] for cache_key in cache_keys})
+    stamps = {}
+    for cache_key in cache_keys:
+        stamps[cache_key] = _prediction_cache.versions(game_log_versions.get(str(cache_key[0])), current_context, current_model)
+        triplet = _prediction_cache.get(cache_key, stamps[cache_key])
+        if triplet is not None:
+            results[cache_key] = triplet
+    missing = [cache_key for cache_key in stamps if cache_key not in results]
+    predictions = predict_player_statlines(_prediction_requests(missing), max_workers=UNDERDOG_BOARD_PREDICTION_WORKERS)
+    for cache_key, result in zip(missing, predictions):
+        if isinstance(result, Exception):
+            results[cache_key] = result
             continue
+        triplet = (result["points"], result["assists"], result["rebounds"], result.get("confirmed_starter"), result.get("expected_minutes", 0.0))
+        results[cache_key] = triplet
+        _prediction_cache.put(cache_key, stamps[cache_key], triplet, context_version=result.get("context_version"))
+    return results
 
-        game_date = _parse_start_date(entry.start_time)
-        opponent_abbr = entry.opponent_abbr if entry.opponent_abbr in NBA_TEAM_OPTIONS else ""
-        cache_key = (str(player_id), opponent_abbr, game_date)
-        resolved_entries.append((entry, player_id, opponent_abbr, game_date, cache_key))
-        unique_prediction_keys.setdefault(cache_key, entry.player_name)
-
-    if unique_prediction_keys:
-        max_workers = min(UNDERDOG_BOARD_PREDICTION_WORKERS, len(unique_prediction_keys))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {
-                executor.submit(
-                    _get_prediction_summary_cached,
-                    player_id=cache_key[0],
-                    opponent_abbr=cache_key[1],
-                    game_date=cache_key[2],
-                ): cache_key
-                for cache_key in unique_prediction_keys
-            }
-            for future in as_completed(future_map):
-                cache_key = future_map[future]
-                player_name = unique_prediction_keys[cache_key]
-                try:
-                    prediction_cache[cache_key] = future.result()
-                except Exception as exc:
-                    print(f"Underdog board prediction error for {player_name}: {exc}")
 
-    for entry, player_id, opponent_abbr, game_date, cache_key in resolved_entries:
-        prediction = prediction_cache.get(cache_key)
-        if prediction is None:
-            continue
+def _drop_stale_predictions(old_bundle, new_bundle) -> None:
+    _prediction_cache.clear()
+    # Serve the current snapshots until the background rebuilds with the new models land.
+    board_engine.refresh_all()
+
+
+def _drop_predictions_for_new_games(season: int, player_ids: set[str]) -> None:
+    _prediction_cache.invalidate_players(player_ids)
+
+
+def _drop_predictions_for_injury_update() -> None:
+    _prediction_cache.invalidate_context()
+
 
-        prediction = prediction_cache[cache_key]
-        if float(prediction.get("expected_minutes") or 0.0) < 15.0:
+on_bundle_swap(_drop_stale_predictions)
+on_new_games(_drop_predictions_for_new_games)
+on_injury_report_change(_drop_predictions_for_injury_update)
+
+
+def _get_prediction_summaries_cached(cache_keys) -> dict[tuple[str, str, str], dict[str, float] | Exception]:
+    summaries: dict[tuple[str, str, str], dict[str, float] | Exception] = {}
+    for cache_key, triplet in _cached_prediction_triplets(cache_keys).items():
+        if isinstance(triplet, Exception):
+            summaries[cache_key] = triplet
             continue
-        model_projection = prediction[entry.market_label]
-        edge_value, edge_label = _pick_edge_summary(
-            model_projection,
-            entry.line_score,
-            selection_key=entry.selection_key,
-            selection_label=entry.selection_label,
-        )
-        signal_label, signal_class, signal_note = _edge_signal(
-            entry.market_label,
-            edge_value,
-            favor_positive_only=bool(entry.selection_key),
-        )
-        confirmed_starter = prediction.get("confirmed_starter")
-        high_confidence_assists = bool(
-            entry.market_label == "Assists"
-            and edge_value is not None and edge_value >= 1.0
-            and (entry.selection_label or "").lower() in ("higher", "over", "line")
-            and entry.line_score < 5.0
-            and confirmed_starter is True
-        )
-        board_rows.append(
+        points, assists, rebounds, confirmed_starter, expected_minutes = triplet
+        summary = _build_prediction_summary(points, assists, rebounds)
+        summary["confirmed_starter"] = confirmed_starter
+        summary["expected_minutes"] = expected_minutes
+        summaries[cache_key] = summary
+    return summaries
+
+
+def _nba_prediction_key(entry, player_id: int) -> tuple[str, str, str]:
+    opponent_abbr = entry.opponent_abbr if entry.opponent_abbr in NBA_TEAM_OPTIONS else ""
+    return (str(player_id), opponent_abbr, _parse_start_date(entry.start_time))
+
+
+def _prime_board_game_logs(player_ids: set[int]) -> None:
+    if not settings.rapidapi_key:
+        # One league-wide game-log pull instead of a PlayerGameLog call per player.
+        prime_league_game_logs(settings.season_start_year, player_ids={str(player_id) for player_id in player_ids})
+
+
+def _board_row(entry, player_id, prediction: dict[str, float]) -> dict[str, str | float | None] | None:
+    """An entry's line against the model projection for its market; pick-style entries carry their side and payout."""
+    model_projection = prediction.get(entry.market_label)
+    if model_projection is None:
+        return None
+    selection_key = getattr(entry, "selection_key", None)
+    edge_value, edge_label = _pick_edge_summary(
+        model_projection,
+        entry.line_score,
+        selection_key=selection_key,
+        selection_label=getattr(entry, "selection_label", None),
+    )
+    signal_label, signal_class, signal_note = _edge_signal(
+        entry.market_label,
+        edge_value,
+        favor_positive_only=bool(selection_key),
+    )
+    opponent_abbr = entry.opponent_abbr if entry.opponent_abbr in NBA_TEAM_OPTIONS else ""
+    row = {
+        "player_name": entry.player_name,
+        "player_id": player_id,
+        "market": entry.market_label,
+        "opponent_abbr": opponent_abbr or "N/A",
+        "game_date": _parse_start_date(entry.start_time) or "N/A",
+        "sportsbook_line": round(entry.line_score, 1),
+        "model_projection": model_projection,
+        "edge": edge_value,
+        "edge_label": edge_label,
+        "edge_class": _edge_class(edge_value),
+        "signal_label": signal_label,
+        "signal_class": signal_class,
+        "signal_note": signal_note,
+        "absolute_edge": abs(edge_value) if edge_value is not None else 0.0,
+    }
+    if hasattr(entry, "selection_key"):
+        row.update(
             {
-                "player_name": entry.player_name,
-                "player_id": player_id,
-                "market": entry.market_label,
                 "selection_label": entry.selection_label or "Line",
+                "pick_side": _normalize_pick_side(selection_key),
                 "payout_multiplier": entry.payout_multiplier,
                 "payout_multiplier_label": f"{entry.payout_multiplier:.2f}x" if entry.payout_multiplier is not None else "N/A",
-                "opponent_abbr": opponent_abbr or "N/A",
-                "game_date": game_date or "N/A",
-                "sportsbook_line": round(entry.line_score, 1),
-                "model_projection": model_projection,
-                "edge": edge_value,
-                "edge_label": edge_label,
-                "edge_class": _edge_class(edge_value),
-                "signal_label": signal_label,
-                "signal_class": signal_class,
-                "signal_note": signal_note,
-                "absolute_edge": abs(edge_value) if edge_value is not None else 0.0,
-                "confirmed_starter": confirmed_starter,
-                "high_confidence_assists": high_confidence_assists,
             }
         )
+    return row
 
-    # For each player/market/date group keep only the edge-aligned pick (positive edge).
-    # Underdog sends both Higher and Lower for every line; only one direction is ever
-    # useful and showing both confuses the board.
-    deduped: dict[tuple, dict] = {}
-    for row in board_rows:
-        key = (str(row.get("player_id", "")), str(row.get("market", "")), str(row.get("game_date", "")))
-        existing = deduped.get(key)
-        if existing is None:
-            deduped[key] = row
-        else:
-            # Prefer the row whose edge is positive (pick agrees with model)
-            row_edge = float(row.get("edge") or 0.0)
-            existing_edge = float(existing.get("edge") or 0.0)
-            if row_edge > existing_edge:
-                deduped[key] = row
-    board_rows = list(deduped.values())
-
-    board_rows.sort(key=lambda row: float(row["absolute_edge"]), reverse=True)
-    return {
-        "board_rows": tuple(board_rows),
-        "total_lines": len(board_entries),
-        "matched_players": len(prediction_cache),
-        "unmatched_players": len(unmatched_players),
-    }
 
+def _underdog_board_row(entry, player_id: int, prediction: dict[str, float]) -> dict[str, str | float | None] | None:
+    if float(prediction.get("expected_minutes") or 0.0) < 15.0:
+        return None
+    row = _board_row(entry, player_id, prediction)
+    if row is None:
+        return None
+    confirmed_starter = prediction.get("confirmed_starter")
+    row["confirmed_starter"] = confirmed_starter
+    row["high_confidence_assists"] = bool(
+        entry.market_label == "Assists"
+        and row["edge"] is not None and row["edge"] >= 1.0
+        and (entry.selection_label or "").lower() in ("higher", "over", "line")
+        and entry.line_score < 5.0
+        and confirmed_starter is True
+    )
+    return row
+
+
+def _ncaab_board_row(entry, player_id: str, prediction: dict[str, float]) -> dict[str, str | float | None] | None:
+    row = _board_row(entry, player_id, prediction)
+    if row is None:
+        return None
+    # NCAAB opponents are college teams, not NBA_TEAM_OPTIONS.
+    row["opponent_abbr"] = entry.opponent_abbr or "N/A"
+    row["confirmed_starter"] = None
+    row["high_confidence_assists"] = False
+    return row
 
-@lru_cache(maxsize=1)
-def _cached_ncaab_board_snapshot() -> dict[str, object]:
+
+def _predict_ncaab_summary(cache_key: tuple[str, str], player_name: str) -> dict[str, float]:
     from ncaa_prediction import predict_player_statline as _ncaa_predict_statline
-    board_entries = underdog_client.fetch_board_entries(sport="ncaab")
-    prediction_cache: dict[tuple[str, str], dict[str, float]] = {}
-    unmatched_players: set[str] = set()
-    board_rows: list[dict] = []
-    unique_keys: dict[tuple[str, str], str] = {}
-
-    for entry in board_entries:
-        game_date = _parse_start_date(entry.start_time)
-        opponent = entry.opponent_abbr or ""
-        cache_key = (entry.player_name.lower(), opponent.upper())
-        unique_keys.setdefault(cache_key, entry.player_name)
-
-    max_workers = min(UNDERDOG_BOARD_PREDICTION_WORKERS, max(len(unique_keys), 1))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        def _fetch_ncaa(key_name_pair):
-            key, player_name = key_name_pair
-            _, opponent = key
-            try:
-                result = _ncaa_predict_statline(player_name, opponent=opponent or None)
-                summary = _build_prediction_summary(
-                    float(result["points"]),
-                    float(result["assists"]),
-                    float(result["rebounds"]),
-                )
-                return key, summary
-            except Exception:
-                return key, None
 
-        for key, summary in executor.map(_fetch_ncaa, unique_keys.items()):
-            if summary is not None:
-                prediction_cache[key] = summary
-            else:
-                unmatched_players.add(unique_keys[key])
+    result = _ncaa_predict_statline(player_name, opponent=cache_key[1] or None)
+    return _build_prediction_summary(float(result["points"]), float(result["assists"]), float(result["rebounds"]))
 
-    for entry in board_entries:
-        opponent = entry.opponent_abbr or ""
-        cache_key = (entry.player_name.lower(), opponent.upper())
-        prediction = prediction_cache.get(cache_key)
 
-        model_projection = prediction.get(entry.market_label) if prediction else None
+def _pick_preference(row: dict) -> tuple[float, float]:
+    """Of a Higher/Lower pair on one line, keep the higher expected value, then the positive edge (pick agrees with model)."""
+    return (_board_rank_key(row)[0], float(row.get("edge") or 0.0))
 
-        game_date = _parse_start_date(entry.start_time)
-        edge_value, edge_label = _pick_edge_summary(
-            model_projection,
-            entry.line_score,
-            selection_key=entry.selection_key,
-            selection_label=entry.selection_label,
-        )
-        signal_label, signal_class, signal_note = _edge_signal(
-            entry.market_label,
-            edge_value,
-            favor_positive_only=bool(entry.selection_key),
-        )
-        board_rows.append({
-            "player_name": entry.player_name,
-            "player_id": entry.player_name.lower(),
-            "market": entry.market_label,
-            "selection_label": entry.selection_label or "Line",
-            "payout_multiplier": entry.payout_multiplier,
-            "payout_multiplier_label": f"{entry.payout_multiplier:.2f}x" if entry.payout_multiplier is not None else "N/A",
-            "opponent_abbr": opponent or "N/A",
-            "game_date": game_date or "N/A",
-            "sportsbook_line": round(entry.line_score, 1),
-            "model_projection": model_projection,
-            "edge": edge_value,
-            "edge_label": edge_label,
-            "edge_class": _edge_class(edge_value),
-            "signal_label": signal_label,
-            "signal_class": signal_class,
-            "signal_note": signal_note,
-            "absolute_edge": abs(edge_value) if edge_value is not None else 0.0,
-            "confirmed_starter": None,
-            "high_confidence_assists": False,
-        })
 
-    deduped: dict[tuple, dict] = {}
-    for row in board_rows:
-        key = (str(row["player_id"]), str(row["market"]), str(row["game_date"]))
-        existing = deduped.get(key)
-        if existing is None:
-            deduped[key] = row
-        else:
-            if float(row.get("edge") or 0.0) > float(existing.get("edge") or 0.0):
-                deduped[key] = row
-    board_rows = sorted(deduped.values(), key=lambda r: float(r["absolute_edge"]), reverse=True)
+def _pick_dedupe_key(row: dict) -> tuple[str, str, str]:
+    return (str(row.get("player_id", "")), str(row.get("market", "")), str(row.get("game_date", "")))
+
+
+# Underdog sends both Higher and Lower for every line; only one direction is ever
+# useful and showing both confuses the board, so those boards keep one pick per line.
+board_engine = BoardEngine(
+    [
+        BoardSource(
+            name="underdog",
+            label="Underdog",
+            fetch_entries=lambda fresh: underdog_client.fetch_board_entries(fresh=fresh),
+            resolve=_resolve_player_id_cached,
+            prediction_key=_nba_prediction_key,
+            predict=_get_prediction_summaries_cached,
+            build_row=_underdog_board_row,
+            rank_key=_board_rank_key,
+            dedupe_key=_pick_dedupe_key,
+            prefer_key=_pick_preference,
+            prepare=_prime_board_game_logs,
+            finalize=_attach_win_probabilities,
+        ),
+        BoardSource(
+            name="underdog_ncaab",
+            label="Underdog NCAAB",
+            fetch_entries=lambda fresh: underdog_client.fetch_board_entries(sport="ncaab", fresh=fresh),
+            resolve=lambda player_name: player_name.lower(),
+            prediction_key=lambda entry, player_id: (player_id, (entry.opponent_abbr or "").upper()),
+            predict=pooled(_predict_ncaab_summary, UNDERDOG_BOARD_PREDICTION_WORKERS),
+            build_row=_ncaab_board_row,
+            rank_key=_board_rank_key,
+            dedupe_key=_pick_dedupe_key,
+            prefer_key=_pick_preference,
+        ),
+        BoardSource(
+            name="prizepicks",
+            label="PrizePicks",
+            fetch_entries=lambda fresh: prizepicks_client.fetch_board_entries(fresh=fresh),
+            resolve=_resolve_player_id_cached,
+            prediction_key=_nba_prediction_key,
+            predict=_get_prediction_summaries_cached,
+            build_row=_board_row,
+            rank_key=_board_rank_key,
+            prepare=_prime_board_game_logs,
+            finalize=_attach_win_probabilities,
+        ),
+        BoardSource(
+            name="parlayplay",
+            label="ParlayPlay",
+            fetch_entries=lambda fresh: parlayplay_client.fetch_board_entries(fresh=fresh),
+            resolve=_resolve_player_id_cached,
+            prediction_key=_nba_prediction_key,
+            predict=_get_prediction_summaries_cached,
+            build_row=_board_row,
+            rank_key=_board_rank_key,
+            prepare=_prime_board_game_logs,
+            finalize=_attach_win_probabilities,
+        ),
+    ],
+    ttl=settings.board_cache_ttl_seconds,
+    max_stale=settings.board_cache_max_stale_seconds,
+)
+
+_BOARD_START_TIMES = {
+    "underdog": lambda: underdog_client.board_start_times("nba"),
+    "underdog_ncaab": lambda: underdog_client.board_start_times("ncaab"),
+    "prizepicks": prizepicks_client.board_start_times,
+    "parlayplay": parlayplay_client.board_start_times,
+}
+for _board_name, _start_times in _BOARD_START_TIMES.items():
+    register_board(
+        _board_name,
+        lambda name=_board_name: board_engine.refresh(name),
+        lambda name=_board_name: board_engine.built_at(name),
+        _start_times,
+    )
+if odds_api_client is not None:
+    register_board("odds_api", lambda: odds_api_client.fetch_entries(fresh=True), odds_api_client.entries_fetched_at)
 
-    return {
-        "board_rows": tuple(board_rows),
-        "total_lines": len(board_entries),
-        "matched_players": len(prediction_cache),
-        "unmatched_players": len(unmatched_players),
-    }
+
+def _cached_underdog_board_snapshot() -> BoardSnapshot:
+    return board_engine.snapshot("underdog")
+
+
+def _cached_ncaab_board_snapshot() -> BoardSnapshot:
+    return board_engine.snapshot("underdog_ncaab")
 
 
 def _prewarm_underdog_board_cache() -> None:
     if not underdog_client.is_configured():
         return
     try:
-        _cached_underdog_board_snapshot()
+        with request_priority(BACKGROUND):
+            _cached_underdog_board_snapshot()
     except Exception as exc:
         print(f"Underdog board prewarm error: {exc}")
 
@@ -1793,6 +1894,8 @@ def _start_underdog_board_prewarm() -> None:
         _underdog_prewarm_started = True
 
     Thread(target=_prewarm_underdog_board_cache, daemon=True).start()
+    start_context_refresher()
+    start_board_refresher()
 
 
 def _append_tracking_rows(
@@ -2352,7 +2455,7 @@ def prizepicks_board():
     min_edge = max(_parse_optional_float(request.args.get("min_edge")) or 0.0, 0.0)
 
     try:
-        board_entries = prizepicks_client.fetch_board_entries()
+        snapshot = board_engine.snapshot("prizepicks")
     except PrizePicksProviderError as exc:
         return _board_context(
             title="PrizePicks Edge Board",
@@ -2385,63 +2488,15 @@ def prizepicks_board():
             total_pages=1,
         )
 
-    prediction_cache: dict[tuple[str, str, str], dict[str, float]] = {}
-    unmatched_players: set[str] = set()
-    board_rows: list[dict[str, str | float | None]] = []
-
-    for entry in board_entries:
-        player_id = client.resolve_player_id_by_name(entry.player_name)
-        if player_id is None:
-            unmatched_players.add(entry.player_name)
-            continue
-
-        game_date = _parse_start_date(entry.start_time)
-        opponent_abbr = entry.opponent_abbr if entry.opponent_abbr in NBA_TEAM_OPTIONS else ""
-        cache_key = (str(player_id), opponent_abbr, game_date)
-        if cache_key not in prediction_cache:
-            try:
-                points, assists, rebounds = predict_player_stats(
-                    str(player_id),
-                    opponent_abbr=opponent_abbr or None,
-                    game_date=game_date or None,
-                )
-                prediction_cache[cache_key] = _build_prediction_summary(points, assists, rebounds)
-            except Exception as exc:
-                print(f"PrizePicks board prediction error for {entry.player_name}: {exc}")
-                continue
-
-        prediction = prediction_cache[cache_key]
-        model_projection = prediction[entry.market_label]
-        edge_value, edge_label = _edge_summary(model_projection, entry.line_score)
-        signal_label, signal_class, signal_note = _edge_signal(entry.market_label, edge_value)
-        absolute_edge = abs(edge_value) if edge_value is not None else 0.0
-        if absolute_edge < min_edge:
-            continue
-
-        board_rows.append(
-            {
-                "player_name": entry.player_name,
-                "player_id": player_id,
-                "market": entry.market_label,
-                "opponent_abbr": opponent_abbr or "N/A",
-                "game_date": game_date or "N/A",
-                "sportsbook_line": round(entry.line_score, 1),
-                "model_projection": model_projection,
-                "edge": edge_value,
-                "edge_label": edge_label,
-                "edge_class": _edge_class(edge_value),
-                "signal_label": signal_label,
-                "signal_class": signal_class,
-                "signal_note": signal_note,
-                "absolute_edge": absolute_edge,
-            }
-        )
-
-    board_rows.sort(key=lambda row: float(row["absolute_edge"]), reverse=True)
+    board_rows = [
+        dict(row)
+        for row in snapshot.rows
+        if float(row["absolute_edge"]) >= min_edge
+    ]
     pagination = _paginate_board_rows(board_rows, page=page)
     display_rows = pagination["rows"]
-    message = "Biggest PrizePicks model edges ranked by absolute gap."
-    if not board_entries:
+    message = "Biggest PrizePicks model edges ranked by pick strength."
+    if not snapshot.total_lines:
         message = "PrizePicks returned no NBA board rows right now."
     elif not board_rows:
         message = "No rows met your current edge filter."
@@ -2452,11 +2507,11 @@ def prizepicks_board():
         message=message,
         rows=display_rows,
         min_edge=min_edge,
-        total_lines=len(board_entries),
+        total_lines=snapshot.total_lines,
         total_players=int(pagination["total_players"]),
         displayed_players=int(pagination["displayed_players"]),
-        matched_players=len(prediction_cache),
-        unmatched_players=len(unmatched_players),
+        matched_players=snapshot.matched_players,
+        unmatched_players=snapshot.unmatched_players,
         page=int(pagination["page"]),
         total_pages=int(pagination["total_pages"]),
     )
@@ -2646,7 +2701,7 @@ def parlayplay_board():
     min_edge = max(_parse_optional_float(request.args.get("min_edge")) or 0.0, 0.0)
 
     try:
-        board_entries = parlayplay_client.fetch_board_entries()
+        snapshot = board_engine.snapshot("parlayplay")
     except ParlayPlayProviderError as exc:
         return _board_context(
             title="ParlayPlay Edge Board",
@@ -2679,74 +2734,15 @@ def parlayplay_board():
             total_pages=1,
         )
 
-    prediction_cache: dict[tuple[str, str, str], dict[str, float]] = {}
-    unmatched_players: set[str] = set()
-    board_rows: list[dict[str, str | float | None]] = []
-
-    for entry in board_entries:
-        player_id = client.resolve_player_id_by_name(entry.player_name)
-        if player_id is None:
-            unmatched_players.add(entry.player_name)
-            continue
-
-        game_date = _parse_start_date(entry.start_time)
-        opponent_abbr = entry.opponent_abbr if entry.opponent_abbr in NBA_TEAM_OPTIONS else ""
-        cache_key = (str(player_id), opponent_abbr, game_date)
-        if cache_key not in prediction_cache:
-            try:
-                points, assists, rebounds = predict_player_stats(
-                    str(player_id),
-                    opponent_abbr=opponent_abbr or None,
-                    game_date=game_date or None,
-                )
-                prediction_cache[cache_key] = _build_prediction_summary(points, assists, rebounds)
-            except Exception as exc:
-                print(f"ParlayPlay board prediction error for {entry.player_name}: {exc}")
-                continue
-
-        prediction = prediction_cache[cache_key]
-        model_projection = prediction[entry.market_label]
-        edge_value, edge_label = _pick_edge_summary(
-            model_projection,
-            entry.line_score,
-            selection_key=entry.selection_key,
-            selection_label=entry.selection_label,
-        )
-        signal_label, signal_class, signal_note = _edge_signal(
-            entry.market_label,
-            edge_value,
-            favor_positive_only=bool(entry.selection_key),
-        )
-        absolute_edge = abs(edge_value) if edge_value is not None else 0.0
-        if absolute_edge < min_edge:
-            continue
-
-        board_rows.append(
-            {
-                "player_name": entry.player_name,
-                "player_id": player_id,
-                "market": entry.market_label,
-                "selection_label": entry.selection_label or "Line",
-                "payout_multiplier_label": f"{entry.payout_multiplier:.2f}x" if entry.payout_multiplier is not None else "N/A",
-                "opponent_abbr": opponent_abbr or "N/A",
-                "game_date": game_date or "N/A",
-                "sportsbook_line": round(entry.line_score, 1),
-                "model_projection": model_projection,
-                "edge": edge_value,
-                "edge_label": edge_label,
-                "edge_class": _edge_class(edge_value),
-                "signal_label": signal_label,
-                "signal_class": signal_class,
-                "signal_note": signal_note,
-                "absolute_edge": absolute_edge,
-            }
-        )
-
-    board_rows.sort(key=lambda row: float(row["absolute_edge"]), reverse=True)
+    board_rows = [
+        dict(row)
+        for row in snapshot.rows
+        if float(row["absolute_edge"]) >= min_edge
+    ]
     pagination = _paginate_board_rows(board_rows, page=page)
     display_rows = pagination["rows"]
     message = "Biggest ParlayPlay ladder edges ranked by pick strength."
-    if not board_entries:
+    if not snapshot.total_lines:
         message = "ParlayPlay returned no NBA board rows right now."
     elif not board_rows:
         message = "No rows met your current edge filter."
@@ -2757,11 +2753,11 @@ def parlayplay_board():
         message=message,
         rows=display_rows,
         min_edge=min_edge,
-        total_lines=len(board_entries),
+        total_lines=snapshot.total_lines,
         total_players=int(pagination["total_players"]),
         displayed_players=int(pagination["displayed_players"]),
-        matched_players=len(prediction_cache),
-        unmatched_players=len(unmatched_players),
+        matched_players=snapshot.matched_players,
+        unmatched_players=snapshot.unmatched_players,
         page=int(pagination["page"]),
         total_pages=int(pagination["total_pages"]),
     )
@@ -2814,7 +2810,7 @@ def underdog_board():
 
     board_rows = [
         dict(row)
-        for row in snapshot["board_rows"]
+        for row in snapshot.rows
         if float(row["absolute_edge"]) >= min_edge
     ]
 
@@ -2859,7 +2855,7 @@ def underdog_board():
         enriched_rows.append(r)
 
     message = "Biggest Underdog pick edges ranked by pick strength."
-    if not int(snapshot["total_lines"]):
+    if not snapshot.total_lines:
         message = "Underdog returned no NBA board rows right now."
     elif not board_rows:
         if selected_market != "all":
@@ -2867,7 +2863,7 @@ def underdog_board():
         else:
             message = "No rows met your current edge filter."
     elif selected_market != "all":
-        message = f"Underdog {selected_market.lower()} props ranked by model edge."
+        message = f"Underdog {selected_market.lower()} props ranked by pick strength."
 
     # Build cross-book discrepancies from all board rows (not just current page)
     all_enriched = []
@@ -2912,11 +2908,11 @@ def underdog_board():
         message=message,
         rows=enriched_rows,
         min_edge=min_edge,
-        total_lines=int(snapshot["total_lines"]),
+        total_lines=snapshot.total_lines,
         total_players=int(pagination["total_players"]),
         displayed_players=int(pagination["displayed_players"]),
-        matched_players=int(snapshot["matched_players"]),
-        unmatched_players=int(snapshot["unmatched_players"]),
+        matched_players=snapshot.matched_players,
+        unmatched_players=snapshot.unmatched_players,
         page=int(pagination["page"]),
         total_pages=int(pagination["total_pages"]),
         market_filters=UNDERDOG_MARKET_FILTERS,
@@ -3066,6 +3062,19 @@ def live_game_box_score(game_id):
     return render_template('game_box_score.html', box=box, game=game, is_live=is_live)
 
 
+@app.route('/debug/fetch-stats')
+def fetch_stats():
+    """Request coalescing counters (coalesced = duplicate fetches avoided), NBA stats pacing, cache hit rates and model load times (ms)."""
+    return {
+        "singleflight": singleflight_stats(),
+        "nba_scheduler": get_scheduler().stats(),
+        "swr_caches": swr_stats(),
+        "prediction_caches": prediction_cache_stats(),
+        "model_artifacts": model_load_stats(),
+        "board_refresher": board_refresher_stats(),
+    }
+
+
 @app.route('/underdog-board/snapshot', methods=['POST'])
 def save_underdog_snapshot():
     min_edge = max(_parse_optional_float(request.args.get("min_edge")) or 0.0, 0.0)
@@ -3074,7 +3083,7 @@ def save_underdog_snapshot():
         snapshot = _cached_underdog_board_snapshot()
         board_rows = [
             dict(row)
-            for row in snapshot["board_rows"]
+            for row in snapshot.rows
             if float(row["absolute_edge"]) >= min_edge
         ]
         if selected_market != "all":
@@ -3102,7 +3111,7 @@ def export_underdog_board():
 
     board_rows = [
         dict(row)
-        for row in snapshot["board_rows"]
+        for row in snapshot.rows
         if float(row["absolute_edge"]) >= min_edge
     ]
     if selected_market != "all":
@@ -3133,7 +3142,7 @@ def log_all_underdog_lines():
         print(f"Log all underdog error: {exc}")
         return {"error": "Unable to fetch Underdog board."}, 503
 
-    board_rows = [dict(row) for row in snapshot["board_rows"]]
+    board_rows = [dict(row) for row in snapshot.rows]
     tracking_rows = _build_tracking_rows_from_board_rows(board_rows, sportsbook="Underdog")
     logged_rows = _write_tracking_rows(tracking_rows)
     return {"logged": logged_rows, "total": len(tracking_rows)}
@@ -3172,7 +3181,7 @@ def underdog_ncaab_board():
 
     board_rows = [
         dict(row)
-        for row in snapshot["board_rows"]
+        for row in snapshot.rows
         if float(row["absolute_edge"]) >= min_edge
     ]
     if selected_market != "all":
@@ -3186,11 +3195,11 @@ def underdog_ncaab_board():
         message="",
         rows=pagination["rows"],
         min_edge=min_edge,
-        total_lines=int(snapshot["total_lines"]),
-        total_players=int(snapshot["matched_players"]),
+        total_lines=snapshot.total_lines,
+        total_players=snapshot.matched_players,
         displayed_players=len(pagination["rows"]),
-        matched_players=int(snapshot["matched_players"]),
-        unmatched_players=int(snapshot["unmatched_players"]),
+        matched_players=snapshot.matched_players,
+        unmatched_players=snapshot.unmatched_players,
         page=pagination["page"],
         total_pages=pagination["total_pages"],
         market_filters=UNDERDOG_MARKET_FILTERS,
@@ -3246,15 +3255,24 @@ def matchup_predict():
             for player in home_rotation
         ]
 
+        slate_predictions = predict_player_statlines(
+            [
+                {
+                    "player_id": str(player["id"]),
+                    "opponent_abbr": opponent_abbr,
+                    "game_date": game_date or None,
+                    "home": side == "Home",
+                }
+                for player, side, _, opponent_abbr in all_players
+            ],
+            max_workers=UNDERDOG_BOARD_PREDICTION_WORKERS,
+        )
+
         def _predict_slate_player(args):
-            player, side, team_abbr, opponent_abbr = args
+            player, side, team_abbr, opponent_abbr, prediction = args
+            if isinstance(prediction, Exception):
+                raise prediction
             manual_line_inputs = _extract_slate_line_inputs(player["id"], form_data)
-            prediction = predict_player_statline(
-                str(player["id"]),
-                opponent_abbr=opponent_abbr,
-                game_date=game_date or None,
-                home=(side == "Home"),
-            )
             prediction_summary = _build_prediction_summary(
                 prediction["points"],
                 prediction["assists"],
@@ -3315,7 +3333,10 @@ def matchup_predict():
             }
 
         with ThreadPoolExecutor(max_workers=UNDERDOG_BOARD_PREDICTION_WORKERS) as executor:
-            futures = {executor.submit(_predict_slate_player, args): args for args in all_players}
+            futures = {
+                executor.submit(_predict_slate_player, (*args, prediction)): args
+                for args, prediction in zip(all_players, slate_predictions)
+            }
             for future in as_completed(futures):
                 player_args = futures[future]
                 try:
@@ -0,0 +1,151 @@
+"""
+Board pipeline shared by the Underdog, NCAAB, PrizePicks and ParlayPlay pages.
+Every board is built in three stages:
+
+1. resolve: each distinct player name on the board is resolved once through
+   the source's resolver (the shared player directory for NBA boards);
+2. predict: entries are reduced to distinct prediction keys, which the source
+   predicts in one batch on a bounded pool;
+3. score: one row per entry from its line and prediction, then the source's
+   whole-board pass (probabilities), per-pick dedupe and ranking.
+
+The result is an immutable BoardSnapshot cached per source with
+stale-while-revalidate, so routes only filter and paginate it. refresh()
+rebuilds from freshly fetched entries and swaps the snapshot in only if the
+build succeeds.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from swr_cache import SWRCache
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    rows: tuple[Mapping[str, Any], ...]
+    total_lines: int
+    matched_players: int
+    unmatched_players: int
+    built_at: float
+
+
+@dataclass(frozen=True)
+class BoardSource:
+    name: str
+    # Provider name for log lines, e.g. "PrizePicks".
+    label: str
+    # fetch_entries(fresh) -> provider entries with player_name, market_label and line_score.
+    fetch_entries: Callable[[bool], Sequence[Any]]
+    resolve: Callable[[str], Hashable | None]
+    prediction_key: Callable[[Any, Hashable], Hashable]
+    # {prediction key: player name} -> {prediction key: prediction or the exception it raised}.
+    predict: Callable[[dict[Hashable, str]], Mapping[Hashable, Any]]
+    # build_row(entry, player_id, prediction) -> row, or None to leave the entry off the board.
+    build_row: Callable[[Any, Hashable, Any], dict[str, Any] | None]
+    rank_key: Callable[[dict[str, Any]], Any]
+    # Rows sharing a dedupe key keep only the one with the highest prefer_key.
+    dedupe_key: Callable[[dict[str, Any]], Hashable] | None = None
+    prefer_key: Callable[[dict[str, Any]], Any] | None = None
+    # Runs on the resolved player ids before predicting, e.g. to bulk-load their game logs.
+    prepare: Callable[[set[Hashable]], None] | None = None
+    # Whole-board pass over the scored rows before dedupe, e.g. win probabilities.
+    finalize: Callable[[list[dict[str, Any]]], None] | None = None
+
+
+def pooled(predict_one: Callable[[Hashable, str], Any], max_workers: int) -> Callable[[dict[Hashable, str]], dict[Hashable, Any]]:
+    """Batch predictor running predict_one(key, player_name) on at most max_workers threads."""
+
+    def _predict(keys: dict[Hashable, str]) -> dict[Hashable, Any]:
+        def _run(item: tuple[Hashable, str]) -> tuple[Hashable, Any]:
+            key, player_name = item
+            try:
+                return key, predict_one(key, player_name)
+            except Exception as exc:
+                return key, exc
+
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            return dict(executor.map(_run, keys.items()))
+
+    return _predict
+
+
+class BoardEngine:
+    def __init__(self, sources: Iterable[BoardSource], ttl: float, max_stale: float) -> None:
+        self.sources = {source.name: source for source in sources}
+        self._snapshots = SWRCache("board.snapshots", ttl=ttl, max_stale=max_stale)
+
+    def snapshot(self, name: str) -> BoardSnapshot:
+        return self._snapshots.get(name, lambda: self.build(name))
+
+    def refresh(self, name: str) -> BoardSnapshot:
+        """Rebuild from freshly fetched entries; the current snapshot stays if that fails."""
+        return self._snapshots.reload(name, lambda: self.build(name, fresh_entries=True))
+
+    def refresh_all(self) -> int:
+        """Queue background rebuilds of every loaded board, e.g. after a model swap."""
+        return self._snapshots.refresh_all()
+
+    def built_at(self, name: str) -> float | None:
+        entry = self._snapshots.peek(name)
+        return entry[1].built_at if entry is not None else None
+
+    def build(self, name: str, fresh_entries: bool = False) -> BoardSnapshot:
+        source = self.sources[name]
+        entries = source.fetch_entries(fresh_entries)
+
+        player_ids = {player_name: source.resolve(player_name) for player_name in dict.fromkeys(entry.player_name for entry in entries)}
+        unmatched = {player_name for player_name, player_id in player_ids.items() if player_id is None}
+        resolved = [(entry, player_ids[entry.player_name]) for entry in entries if player_ids[entry.player_name] is not None]
+
+        keyed = [(entry, player_id, source.prediction_key(entry, player_id)) for entry, player_id in resolved]
+        unique_keys: dict[Hashable, str] = {}
+        for entry, _, key in keyed:
+            unique_keys.setdefault(key, entry.player_name)
+        if unique_keys and source.prepare is not None:
+            try:
+                source.prepare({player_id for _, player_id, _ in keyed})
+            except Exception as exc:
+                print(f"{source.label} board prepare error: {exc}")
+        predictions = {}
+        for key, prediction in source.predict(unique_keys).items():
+            if isinstance(prediction, Exception):
+                print(f"{source.label} board prediction error for {unique_keys[key]}: {prediction}")
+                unmatched.add(unique_keys[key])
+                continue
+            predictions[key] = prediction
+
+        rows = []
+        for entry, player_id, key in keyed:
+            prediction = predictions.get(key)
+            if prediction is None:
+                continue
+            row = source.build_row(entry, player_id, prediction)
+            if row is not None:
+                rows.append(row)
+        if source.finalize is not None:
+            source.finalize(rows)
+        if source.dedupe_key is not None:
+            prefer_key = source.prefer_key or source.rank_key
+            deduped: dict[Hashable, dict[str, Any]] = {}
+            for row in rows:
+                key = source.dedupe_key(row)
+                if key not in deduped or prefer_key(row) > prefer_key(deduped[key]):
+                    deduped[key] = row
+            rows = list(deduped.values())
+        rows.sort(key=source.rank_key, reverse=True)
+
+        return BoardSnapshot(
+            rows=tuple(MappingProxyType(row) for row in rows),
+            total_lines=len(entries),
+            matched_players=len(predictions),
+            unmatched_players=len(unmatched),
+            built_at=time.time(),
+        )
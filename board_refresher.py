@@ -0,0 +1,185 @@
+"""
+Background board refresher.
+Each registered board names a refresh job that rebuilds its snapshot and swaps
+it into its cache, plus how to read when the served snapshot was built and
+when its games start. A daemon thread queues due jobs on the shared refresh
+pool: every BOARD_REFRESH_SECONDS, or BOARD_REFRESH_NEAR_TIP_SECONDS once the
+next tip-off on the board is within BOARD_REFRESH_NEAR_TIP_MINUTES, when lines
+move the most. Only boards that have been loaded once are refreshed, so an
+unused provider is never polled.
+
+Snapshots are swapped only after a rebuild succeeds (SWRCache.reload), so a
+failing provider leaves the last good snapshot in place; board pages show its
+age and the failure through snapshot_age().
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from config import settings
+from swr_cache import refresh_in_background
+
+# How often the loop wakes to look for due boards.
+_TICK_SECONDS = 15
+
+
+@dataclass
+class _Board:
+    name: str
+    refresh: Callable[[], Any]
+    refreshed_at: Callable[[], float | None]
+    start_times: Callable[[], Iterable[datetime]] | None
+    last_queued: float = 0.0
+    refreshes: int = 0
+    errors: int = 0
+    last_error: str | None = None
+    last_error_at: float | None = None
+
+
+_boards: dict[str, _Board] = {}
+_boards_lock = threading.Lock()
+_refresher_lock = threading.Lock()
+_refresher_started = False
+
+
+def register_board(
+    name: str,
+    refresh: Callable[[], Any],
+    refreshed_at: Callable[[], float | None],
+    start_times: Callable[[], Iterable[datetime]] | None = None,
+) -> None:
+    """
+    refresh() rebuilds the board and swaps it in, raising if it fails;
+    refreshed_at() is when the served snapshot was built (None until first
+    load); start_times() lists the board's game start times without fetching.
+    """
+    with _boards_lock:
+        _boards[name] = _Board(name=name, refresh=refresh, refreshed_at=refreshed_at, start_times=start_times)
+
+
+def _next_tip_off(board: _Board, now: datetime) -> datetime | None:
+    if board.start_times is None:
+        return None
+    upcoming = []
+    for start in board.start_times():
+        start = start if start.tzinfo is not None else start.replace(tzinfo=timezone.utc)
+        if start >= now:
+            upcoming.append(start)
+    return min(upcoming, default=None)
+
+
+def refresh_interval(next_tip_off: datetime | None, now: datetime | None = None) -> float:
+    """Seconds between rebuilds of a board whose next game starts at next_tip_off."""
+    now = now or datetime.now(timezone.utc)
+    near_tip = timedelta(minutes=settings.board_refresh_near_tip_minutes)
+    if next_tip_off is not None and next_tip_off - now <= near_tip:
+        return min(settings.board_refresh_seconds, settings.board_refresh_near_tip_seconds)
+    return settings.board_refresh_seconds
+
+
+def _run_refresh(board: _Board) -> None:
+    try:
+        board.refresh()
+    except Exception as exc:
+        board.errors += 1
+        board.last_error = str(exc) or type(exc).__name__
+        board.last_error_at = time.time()
+        print(f"Board refresh error ({board.name}), serving last good snapshot: {exc}")
+        return
+    board.refreshes += 1
+    board.last_error = None
+    board.last_error_at = None
+
+
+def refresh_due_boards() -> int:
+    """Queue a rebuild of every loaded board whose snapshot is older than its cadence; returns how many were queued."""
+    now = datetime.now(timezone.utc)
+    with _boards_lock:
+        boards = list(_boards.values())
+    queued = 0
+    for board in boards:
+        try:
+            refreshed_at = board.refreshed_at()
+            if refreshed_at is None:
+                continue
+            interval = refresh_interval(_next_tip_off(board, now), now)
+        except Exception as exc:
+            print(f"Board refresh schedule error ({board.name}): {exc}")
+            continue
+        # A failed rebuild leaves refreshed_at behind, so last_queued keeps it from being retried every tick.
+        if time.time() - max(refreshed_at, board.last_queued) < interval:
+            continue
+        if refresh_in_background(("board_refresher", board.name), lambda board=board: _run_refresh(board)):
+            board.last_queued = time.time()
+            queued += 1
+    return queued
+
+
+def _refresh_loop() -> None:
+    while True:
+        time.sleep(_TICK_SECONDS)
+        try:
+            refresh_due_boards()
+        except Exception as exc:
+            print(f"Board refresher error: {exc}")
+
+
+def start_board_refresher() -> None:
+    global _refresher_started
+
+    if settings.board_refresh_seconds <= 0:
+        return
+    with _refresher_lock:
+        if _refresher_started:
+            return
+        _refresher_started = True
+
+    threading.Thread(target=_refresh_loop, name="board-refresher", daemon=True).start()
+
+
+def _age_label(seconds: float) -> str:
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m ago"
+    return f"{int(seconds // 3600)}h {int(seconds % 3600 // 60)}m ago"
+
+
+def snapshot_age(name: str) -> dict[str, Any] | None:
+    """Age of the snapshot a board page is about to show, for the page header; None for an unknown or unloaded board."""
+    with _boards_lock:
+        board = _boards.get(name)
+    if board is None:
+        return None
+    refreshed_at = board.refreshed_at()
+    if refreshed_at is None:
+        return None
+    age = max(0.0, time.time() - refreshed_at)
+    return {
+        "refreshed_at": datetime.fromtimestamp(refreshed_at).strftime("%I:%M %p").lstrip("0"),
+        "age_seconds": round(age),
+        "age_label": _age_label(age),
+        # Two missed refreshes: the provider has been failing or the refresher is off.
+        "stale": age > 2 * max(settings.board_refresh_seconds, settings.board_cache_ttl_seconds),
+        "last_error": board.last_error,
+    }
+
+
+def board_refresher_stats() -> dict[str, dict[str, Any]]:
+    with _boards_lock:
+        boards = list(_boards.values())
+    stats = {}
+    for board in boards:
+        refreshed_at = board.refreshed_at()
+        stats[board.name] = {
+            "age_seconds": round(time.time() - refreshed_at, 1) if refreshed_at is not None else None,
+            "refreshes": board.refreshes,
+            "errors": board.errors,
+            "last_error": board.last_error,
+        }
+    return stats
@@ -38,7 +38,11 @@ class Settings:
     request_timeout: int = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "15"))
     season_start_year: int = int(os.getenv("NBA_SEASON_START_YEAR", str(_default_season_start_year())))
     model_dir: Path = Path(os.getenv("MODEL_DIR", Path(__file__).resolve().parent))
+    native_inference: bool = os.getenv("NATIVE_INFERENCE", "true").lower() == "true"
+    model_reload_check_seconds: float = float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "30"))
     tracking_file: Path = Path(os.getenv("TRACKING_FILE", Path(__file__).resolve().parent / "data" / "prediction_tracking.csv"))
+    game_log_store_path: Path = Path(os.getenv("GAME_LOG_STORE_PATH", Path(__file__).resolve().parent / "data" / "game_logs.sqlite3"))
+    feature_store_dir: Path = Path(os.getenv("FEATURE_STORE_DIR", Path(__file__).resolve().parent / "data" / "feature_store"))
     prizepicks_provider: str = os.getenv("PRIZEPICKS_PROVIDER", "prop_professor")
     prizepicks_api_base: str = os.getenv("PRIZEPICKS_API_BASE", "https://api.prizepicks.com")
     prizepicks_nba_league_id: str = os.getenv("PRIZEPICKS_NBA_LEAGUE_ID", "7")
@@ -64,6 +68,20 @@ class Settings:
     parlayplay_user_agent: str = os.getenv("PARLAYPLAY_USER_AGENT", "Whympire-NBA-Sports-Predictor/1.0")
     parlayplay_accept_language: str = os.getenv("PARLAYPLAY_ACCEPT_LANGUAGE", "en-US,en;q=0.9")
     parlayplay_cookie: str = os.getenv("PARLAYPLAY_COOKIE", "")
+    nba_stats_rate_per_second: float = float(os.getenv("NBA_STATS_RATE_PER_SECOND", "1.0"))
+    nba_stats_burst: int = int(os.getenv("NBA_STATS_BURST", "4"))
+    nba_stats_endpoint_concurrency: int = int(os.getenv("NBA_STATS_ENDPOINT_CONCURRENCY", "2"))
+    board_cache_ttl_seconds: int = int(os.getenv("BOARD_CACHE_TTL_SECONDS", "300"))
+    board_cache_max_stale_seconds: int = int(os.getenv("BOARD_CACHE_MAX_STALE_SECONDS", "1800"))
+    board_refresh_seconds: int = int(os.getenv("BOARD_REFRESH_SECONDS", "300"))
+    board_refresh_near_tip_seconds: int = int(os.getenv("BOARD_REFRESH_NEAR_TIP_SECONDS", "60"))
+    board_refresh_near_tip_minutes: int = int(os.getenv("BOARD_REFRESH_NEAR_TIP_MINUTES", "90"))
+    prediction_cache_ttl_seconds: float = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "900"))
+    prediction_cache_max_bytes: int = int(os.getenv("PREDICTION_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+    http_mode: str = os.getenv("HTTP_MODE", "live").strip().lower()
+    http_fixtures_dir: Path = Path(os.getenv("HTTP_FIXTURES_DIR", Path(__file__).resolve().parent / "data" / "http_fixtures"))
+    http_replay_latency_ms: float = float(os.getenv("HTTP_REPLAY_LATENCY_MS", "0"))
+    http_replay_error_rate: float = float(os.getenv("HTTP_REPLAY_ERROR_RATE", "0"))
     odds_api_key: str = os.getenv("ODDS_API_KEY", "")
     flask_debug: bool = os.getenv("FLASK_DEBUG", "false").lower() == "true"
     flask_port: int = int(os.getenv("PORT", "5001"))
@@ -5,6 +5,9 @@ from pathlib import Path
 
 import pandas as pd
 
+from http_replay import install_nba_api_session
+from nba_scheduler import BACKGROUND, request_priority, schedule_nba_call
+
 try:
     from nba_api.stats.endpoints import leaguedashplayerstats, leaguedashteamstats, playergamelogs
     from nba_api.stats.static import teams as nba_static_teams
@@ -121,26 +124,30 @@ FINAL_SCHEMA = [
 
 
 def _fetch_player_game_logs(season: str, season_type: str) -> pd.DataFrame:
-    endpoint = playergamelogs.PlayerGameLogs(
-        season_nullable=season,
-        season_type_nullable=season_type,
-        date_from_nullable="",
-        date_to_nullable="",
+    frame = schedule_nba_call(
+        "PlayerGameLogs",
+        lambda: playergamelogs.PlayerGameLogs(
+            season_nullable=season,
+            season_type_nullable=season_type,
+            date_from_nullable="",
+            date_to_nullable="",
+        ).get_data_frames()[0],
     )
-    frame = endpoint.get_data_frames()[0]
     frame = frame.rename(columns=GAME_LOG_COLUMN_MAP)
     frame["season_type"] = season_type
     return frame
 
 
 def _fetch_team_context(season: str, season_type: str) -> pd.DataFrame:
-    endpoint = leaguedashteamstats.LeagueDashTeamStats(
-        season=season,
-        season_type_all_star=season_type,
-        measure_type_detailed_defense="Advanced",
-        per_mode_detailed="PerGame",
+    frame = schedule_nba_call(
+        "LeagueDashTeamStats",
+        lambda: leaguedashteamstats.LeagueDashTeamStats(
+            season=season,
+            season_type_all_star=season_type,
+            measure_type_detailed_defense="Advanced",
+            per_mode_detailed="PerGame",
+        ).get_data_frames()[0],
     )
-    frame = endpoint.get_data_frames()[0]
     keep = [column for column in TEAM_CONTEXT_COLUMN_MAP if column in frame.columns]
     frame = frame[keep].rename(columns=TEAM_CONTEXT_COLUMN_MAP)
     team_lookup = {
@@ -153,13 +160,15 @@ def _fetch_team_context(season: str, season_type: str) -> pd.DataFrame:
 
 
 def _fetch_player_context(season: str, season_type: str) -> pd.DataFrame:
-    endpoint = leaguedashplayerstats.LeagueDashPlayerStats(
-        season=season,
-        season_type_all_star=season_type,
-        measure_type_detailed_defense="Advanced",
-        per_mode_detailed="PerGame",
+    frame = schedule_nba_call(
+        "LeagueDashPlayerStats",
+        lambda: leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season,
+            season_type_all_star=season_type,
+            measure_type_detailed_defense="Advanced",
+            per_mode_detailed="PerGame",
+        ).get_data_frames()[0],
     )
-    frame = endpoint.get_data_frames()[0]
     keep = [column for column in PLAYER_CONTEXT_COLUMN_MAP if column in frame.columns]
     frame = frame[keep].rename(columns=PLAYER_CONTEXT_COLUMN_MAP)
     return frame
@@ -261,14 +270,22 @@ def main() -> None:
     )
     parser.add_argument("--season-type", default="Regular Season", help='Season type, for example "Regular Season".')
     parser.add_argument("--output", default="data/player_game_logs.csv", help="Path to write the CSV dataset.")
+    parser.add_argument("--skip-feature-store", action="store_true", help="Do not rebuild the training feature store.")
     args = parser.parse_args()
 
-    dataset = build_dataset(args.seasons, args.season_type)
+    install_nba_api_session()
+    with request_priority(BACKGROUND):
+        dataset = build_dataset(args.seasons, args.season_type)
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     dataset.to_csv(output_path, index=False)
     print(f"Wrote {len(dataset):,} rows to {output_path}")
 
+    if not args.skip_feature_store:
+        from feature_store import get_feature_store
+
+        get_feature_store(output_path).build()
+
 
 if __name__ == "__main__":
     main()
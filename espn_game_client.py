@@ -3,27 +3,38 @@ ESPN game-day client.
 - Live scoreboard: today's game status (scheduled/live/final/postponed)
 - Pre-game lineup: confirmed starters from ESPN game summary (~1 hour pre-tip)
 
-No API key required.
+No API key required. Expired entries are served stale while a background
+refresh runs, up to the *_MAX_STALE cap.
 """
 from __future__ import annotations
 
-import time
-import requests
 from typing import Any
 
+from http_replay import http_get
+from swr_cache import SWRCache
+
 _SCOREBOARD_TTL_LIVE = 30    # 30s when games are in progress
 _SCOREBOARD_TTL_IDLE = 300   # 5 min otherwise
+_SCOREBOARD_MAX_STALE = 1800
 _LINEUP_TTL = 300
+_LINEUP_MAX_STALE = 1800
+_BOXSCORE_TTL = 30  # always short — used during live games
+_BOXSCORE_MAX_STALE = 600
 
-_scoreboard_cache: list[dict] = []
-_scoreboard_cache_time: float = 0.0
 
-_lineup_cache: dict[str, dict[str, bool]] = {}
-_lineup_cache_times: dict[str, float] = {}
+def _scoreboard_ttl(games: list[dict]) -> float:
+    any_live = any(g["status"] == "live" for g in games)
+    return _SCOREBOARD_TTL_LIVE if any_live else _SCOREBOARD_TTL_IDLE
 
-_boxscore_cache: dict[str, dict] = {}
-_boxscore_cache_times: dict[str, float] = {}
-_BOXSCORE_TTL = 30  # always short — used during live games
+
+_scoreboard_cache = SWRCache(
+    "espn.scoreboard",
+    ttl=_SCOREBOARD_TTL_IDLE,
+    max_stale=_SCOREBOARD_MAX_STALE,
+    ttl_for=_scoreboard_ttl,
+)
+_lineup_cache = SWRCache("espn.lineups", ttl=_LINEUP_TTL, max_stale=_LINEUP_MAX_STALE)
+_boxscore_cache = SWRCache("espn.box_scores", ttl=_BOXSCORE_TTL, max_stale=_BOXSCORE_MAX_STALE)
 
 _ESPN_TO_NBA: dict[str, str] = {
     "GS": "GSW", "NY": "NYK", "SA": "SAS", "NO": "NOP",
@@ -48,74 +59,68 @@ def get_scoreboard() -> list[dict[str, Any]]:
     }
     Cached 5 minutes.
     """
-    global _scoreboard_cache, _scoreboard_cache_time
-    now = time.time()
-    any_live = any(g["status"] == "live" for g in _scoreboard_cache)
-    ttl = _SCOREBOARD_TTL_LIVE if any_live else _SCOREBOARD_TTL_IDLE
-    if _scoreboard_cache and (now - _scoreboard_cache_time) < ttl:
-        return _scoreboard_cache
-
     try:
-        resp = requests.get(
-            "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
-            timeout=10,
-            headers=_HEADERS,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        games = []
-        for event in data.get("events", []):
-            comp = (event.get("competitions") or [{}])[0]
-            status_type = comp.get("status", {}).get("type", {})
-            status_name = status_type.get("name", "")
-
-            if "IN_PROGRESS" in status_name:
-                status = "live"
-            elif status_name == "STATUS_FINAL":
-                status = "final"
-            elif "POSTPONE" in status_name or "CANCEL" in status_name:
-                status = "postponed"
-            else:
-                status = "scheduled"
-
-            home_abbr = away_abbr = ""
-            home_score = away_score = None
-            home_record = away_record = ""
-            home_name = away_name = ""
-            for competitor in comp.get("competitors", []):
-                abbr = _normalize_abbr(competitor.get("team", {}).get("abbreviation", ""))
-                name = competitor.get("team", {}).get("displayName", abbr)
-                score = competitor.get("score")
-                record = (competitor.get("records") or [{}])[0].get("summary", "")
-                if competitor.get("homeAway") == "home":
-                    home_abbr, home_name, home_score, home_record = abbr, name, score, record
-                else:
-                    away_abbr, away_name, away_score, away_record = abbr, name, score, record
-
-            games.append({
-                "espn_game_id": str(event.get("id", "")),
-                "home_abbr": home_abbr,
-                "home_name": home_name,
-                "home_score": home_score,
-                "home_record": home_record,
-                "away_abbr": away_abbr,
-                "away_name": away_name,
-                "away_score": away_score,
-                "away_record": away_record,
-                "status": status,
-                "status_detail": status_type.get("shortDetail", ""),
-                "period_detail": status_type.get("detail", ""),
-                "start_time_utc": comp.get("date"),
-            })
-
-        _scoreboard_cache = games
-        _scoreboard_cache_time = now
-        return games
-
+        return _scoreboard_cache.get("today", _fetch_scoreboard)
     except Exception as exc:
         print(f"ESPN scoreboard fetch error: {exc}")
-        return _scoreboard_cache
+        return []
+
+
+def _fetch_scoreboard() -> list[dict[str, Any]]:
+    resp = http_get(
+        "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
+        timeout=10,
+        headers=_HEADERS,
+    )
+    resp.raise_for_status()
+    data = resp.json()
+
+    games = []
+    for event in data.get("events", []):
+        comp = (event.get("competitions") or [{}])[0]
+        status_type = comp.get("status", {}).get("type", {})
+        status_name = status_type.get("name", "")
+
+        if "IN_PROGRESS" in status_name:
+            status = "live"
+        elif status_name == "STATUS_FINAL":
+            status = "final"
+        elif "POSTPONE" in status_name or "CANCEL" in status_name:
+            status = "postponed"
+        else:
+            status = "scheduled"
+
+        home_abbr = away_abbr = ""
+        home_score = away_score = None
+        home_record = away_record = ""
+        home_name = away_name = ""
+        for competitor in comp.get("competitors", []):
+            abbr = _normalize_abbr(competitor.get("team", {}).get("abbreviation", ""))
+            name = competitor.get("team", {}).get("displayName", abbr)
+            score = competitor.get("score")
+            record = (competitor.get("records") or [{}])[0].get("summary", "")
+            if competitor.get("homeAway") == "home":
+                home_abbr, home_name, home_score, home_record = abbr, name, score, record
+            else:
+                away_abbr, away_name, away_score, away_record = abbr, name, score, record
+
+        games.append({
+            "espn_game_id": str(event.get("id", "")),
+            "home_abbr": home_abbr,
+            "home_name": home_name,
+            "home_score": home_score,
+            "home_record": home_record,
+            "away_abbr": away_abbr,
+            "away_name": away_name,
+            "away_score": away_score,
+            "away_record": away_record,
+            "status": status,
+            "status_detail": status_type.get("shortDetail", ""),
+            "period_detail": status_type.get("detail", ""),
+            "start_time_utc": comp.get("date"),
+        })
+
+    return games
 
 
 def get_game_box_score(espn_game_id: str) -> dict[str, Any]:
@@ -132,86 +137,81 @@ def get_game_box_score(espn_game_id: str) -> dict[str, Any]:
     }
     Cached 30s.
     """
-    now = time.time()
-    if espn_game_id in _boxscore_cache and (now - _boxscore_cache_times.get(espn_game_id, 0)) < _BOXSCORE_TTL:
-        return _boxscore_cache[espn_game_id]
-
     game_info = next((g for g in get_scoreboard() if g["espn_game_id"] == espn_game_id), None)
-
     try:
-        resp = requests.get(
-            "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary",
-            params={"event": espn_game_id},
-            timeout=10,
-            headers=_HEADERS,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        teams = []
-        for team_data in data.get("boxscore", {}).get("players", []):
-            abbr = _normalize_abbr(team_data.get("team", {}).get("abbreviation", ""))
-            name = team_data.get("team", {}).get("displayName", abbr)
-            stats_block = (team_data.get("statistics") or [{}])[0]
-            keys = stats_block.get("keys", [])
-
-            def _idx(key):
-                return keys.index(key) if key in keys else None
-
-            i_min   = _idx("minutes")
-            i_pts   = _idx("points")
-            i_reb   = _idx("rebounds")
-            i_ast   = _idx("assists")
-            i_stl   = _idx("steals")
-            i_blk   = _idx("blocks")
-            i_fg    = _idx("fieldGoalsMade-fieldGoalsAttempted")
-            i_three = _idx("threePointFieldGoalsMade-threePointFieldGoalsAttempted")
-            i_ft    = _idx("freeThrowsMade-freeThrowsAttempted")
-            i_pm    = _idx("plusMinus")
-
-            def _get(stats, i):
-                return stats[i] if i is not None and i < len(stats) else "—"
-
-            players = []
-            for athlete in stats_block.get("athletes", []):
-                stats = athlete.get("stats", [])
-                if not stats:
-                    continue
-                players.append({
-                    "name": athlete.get("athlete", {}).get("displayName", ""),
-                    "starter": athlete.get("starter", False),
-                    "active": athlete.get("active", True),
-                    "minutes": _get(stats, i_min),
-                    "points": _get(stats, i_pts),
-                    "rebounds": _get(stats, i_reb),
-                    "assists": _get(stats, i_ast),
-                    "steals": _get(stats, i_stl),
-                    "blocks": _get(stats, i_blk),
-                    "fg": _get(stats, i_fg),
-                    "three": _get(stats, i_three),
-                    "ft": _get(stats, i_ft),
-                    "plus_minus": _get(stats, i_pm),
-                })
-
-            # starters first, then bench, both sorted by minutes desc
-            def _min_val(p):
-                try:
-                    return float(p["minutes"])
-                except (ValueError, TypeError):
-                    return 0.0
-
-            starters = sorted([p for p in players if p["starter"]], key=_min_val, reverse=True)
-            bench = sorted([p for p in players if not p["starter"]], key=_min_val, reverse=True)
-            teams.append({"abbr": abbr, "name": name, "players": starters + bench})
-
-        result = {"game": game_info, "teams": teams}
-        _boxscore_cache[espn_game_id] = result
-        _boxscore_cache_times[espn_game_id] = now
-        return result
-
+        return _boxscore_cache.get(espn_game_id, lambda: _fetch_box_score(espn_game_id, game_info))
     except Exception as exc:
         print(f"ESPN box score error (game {espn_game_id}): {exc}")
-        return _boxscore_cache.get(espn_game_id, {"game": game_info, "teams": []})
+        return {"game": game_info, "teams": []}
+
+
+def _fetch_box_score(espn_game_id: str, game_info: dict[str, Any] | None) -> dict[str, Any]:
+    resp = http_get(
+        "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary",
+        params={"event": espn_game_id},
+        timeout=10,
+        headers=_HEADERS,
+    )
+    resp.raise_for_status()
+    data = resp.json()
+
+    teams = []
+    for team_data in data.get("boxscore", {}).get("players", []):
+        abbr = _normalize_abbr(team_data.get("team", {}).get("abbreviation", ""))
+        name = team_data.get("team", {}).get("displayName", abbr)
+        stats_block = (team_data.get("statistics") or [{}])[0]
+        keys = stats_block.get("keys", [])
+
+        def _idx(key):
+            return keys.index(key) if key in keys else None
+
+        i_min   = _idx("minutes")
+        i_pts   = _idx("points")
+        i_reb   = _idx("rebounds")
+        i_ast   = _idx("assists")
+        i_stl   = _idx("steals")
+        i_blk   = _idx("blocks")
+        i_fg    = _idx("fieldGoalsMade-fieldGoalsAttempted")
+        i_three = _idx("threePointFieldGoalsMade-threePointFieldGoalsAttempted")
+        i_ft    = _idx("freeThrowsMade-freeThrowsAttempted")
+        i_pm    = _idx("plusMinus")
+
+        def _get(stats, i):
+            return stats[i] if i is not None and i < len(stats) else "—"
+
+        players = []
+        for athlete in stats_block.get("athletes", []):
+            stats = athlete.get("stats", [])
+            if not stats:
+                continue
+            players.append({
+                "name": athlete.get("athlete", {}).get("displayName", ""),
+                "starter": athlete.get("starter", False),
+                "active": athlete.get("active", True),
+                "minutes": _get(stats, i_min),
+                "points": _get(stats, i_pts),
+                "rebounds": _get(stats, i_reb),
+                "assists": _get(stats, i_ast),
+                "steals": _get(stats, i_stl),
+                "blocks": _get(stats, i_blk),
+                "fg": _get(stats, i_fg),
+                "three": _get(stats, i_three),
+                "ft": _get(stats, i_ft),
+                "plus_minus": _get(stats, i_pm),
+            })
+
+        # starters first, then bench, both sorted by minutes desc
+        def _min_val(p):
+            try:
+                return float(p["minutes"])
+            except (ValueError, TypeError):
+                return 0.0
+
+        starters = sorted([p for p in players if p["starter"]], key=_min_val, reverse=True)
+        bench = sorted([p for p in players if not p["starter"]], key=_min_val, reverse=True)
+        teams.append({"abbr": abbr, "name": name, "players": starters + bench})
+
+    return {"game": game_info, "teams": teams}
 
 
 def get_game_for_team(team_abbr: str) -> dict[str, Any] | None:
@@ -230,36 +230,33 @@ def get_confirmed_starters(espn_game_id: str) -> dict[str, bool]:
     Empty dict if data not yet available.
     Cached 5 minutes.
     """
-    now = time.time()
-    if espn_game_id in _lineup_cache and (now - _lineup_cache_times.get(espn_game_id, 0)) < _LINEUP_TTL:
-        return _lineup_cache[espn_game_id]
-
     try:
-        resp = requests.get(
-            "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary",
-            params={"event": espn_game_id},
-            timeout=10,
-            headers=_HEADERS,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        starters: dict[str, bool] = {}
-        for roster in data.get("rosters", []):
-            for athlete in roster.get("roster", []):
-                if not athlete.get("starter"):
-                    continue
-                name = (athlete.get("athlete", {}).get("displayName") or "").lower().strip()
-                if name:
-                    starters[name] = True
-
-        _lineup_cache[espn_game_id] = starters
-        _lineup_cache_times[espn_game_id] = now
-        return starters
-
+        return _lineup_cache.get(espn_game_id, lambda: _fetch_confirmed_starters(espn_game_id))
     except Exception as exc:
         print(f"ESPN lineup fetch error (game {espn_game_id}): {exc}")
-        return _lineup_cache.get(espn_game_id, {})
+        return {}
+
+
+def _fetch_confirmed_starters(espn_game_id: str) -> dict[str, bool]:
+    resp = http_get(
+        "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary",
+        params={"event": espn_game_id},
+        timeout=10,
+        headers=_HEADERS,
+    )
+    resp.raise_for_status()
+    data = resp.json()
+
+    starters: dict[str, bool] = {}
+    for roster in data.get("rosters", []):
+        for athlete in roster.get("roster", []):
+            if not athlete.get("starter"):
+                continue
+            name = (athlete.get("athlete", {}).get("displayName") or "").lower().strip()
+            if name:
+                starters[name] = True
+
+    return starters
 
 
 def get_player_game_status(player_name: str, team_abbr: str) -> dict[str, Any]:
@@ -0,0 +1,268 @@
+"""
+Incremental per-player feature state.
+Holds the newest ten games, season running sums and per-opponent aggregates for
+one player-season, so each new game is applied in O(1) instead of re-sorting and
+re-normalizing the whole season on every prediction. States are persisted in
+the game-log store and can be refreshed league-wide right after the nightly
+ingest:
+
+    python feature_state.py --prime
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from config import settings
+from features import (
+    RAW_STAT_KEYS,
+    STAT_KEYS,
+    WINDOWS,
+    assist_specialty_matrix,
+    contextual_feature_row,
+    game_opponent,
+    game_sort_key,
+    game_stat_vector,
+    matchup_abbr,
+    stat_feature_row,
+)
+from game_log import PlayerGameLog, compact_game_logs
+from game_log_store import get_game_log_store
+
+# Bump when the stored layout or the stat columns change; older states are rebuilt.
+_STATE_VERSION = 3
+_EMPTY_DIGEST = hashlib.sha1().hexdigest()
+
+_Game = tuple[tuple[datetime, int], list[float], str]
+
+
+def _games_after(game_logs: list[dict[str, Any]], last_key: tuple[datetime, int] | None) -> tuple[int, list[_Game], _Game | None]:
+    """
+    The game count, the games newer than last_key as (key, stats, opponent)
+    oldest first, and the newest game at or before last_key (None if there is
+    none). A PlayerGameLog is read newest first and stops there, so only those
+    rows are converted; other logs have to be sorted first.
+    """
+    games: list[_Game] = []
+    if isinstance(game_logs, PlayerGameLog):
+        count = len(game_logs)
+        keys = []
+        while len(keys) < count:
+            keys.append(game_logs.sort_key(len(keys)))
+            if last_key is not None and keys[-1] <= last_key:
+                break
+        stats = game_logs.stat_columns(RAW_STAT_KEYS, rows=len(keys)).tolist()
+        games = list(zip(keys, stats, game_logs.opponent_codes(rows=len(keys))))
+    else:
+        keyed = sorted(((game_sort_key(game), game) for game in game_logs), key=lambda item: item[0], reverse=True)
+        count = len(keyed)
+        for key, game in keyed:
+            games.append((key, game_stat_vector(game), game_opponent(game)))
+            if last_key is not None and key <= last_key:
+                break
+    anchor = games.pop() if games and last_key is not None and games[-1][0] <= last_key else None
+    games.reverse()
+    return count, games, anchor
+
+
+def _extend_digest(digest: str, key: tuple[datetime, int], stats: list[float], opponent: str) -> str:
+    """digest extended by one game's key, stats and opponent."""
+    extended = hashlib.sha1(bytes.fromhex(digest))
+    extended.update(np.array([key[0].toordinal(), key[1]], dtype=np.int64).tobytes())
+    extended.update(np.asarray(stats, dtype=np.float64).tobytes())
+    extended.update(opponent.encode("utf-8"))
+    return extended.hexdigest()
+
+
+class PlayerFeatureState:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.games = 0
+        self.last_key: tuple[datetime, int] | None = None
+        # Game-log store revision the applied games were read at; it moves when a stored game is corrected.
+        self.revision: int | None = None
+        # Rolling digest of every applied game, and the one before the newest game was applied.
+        self.digest = _EMPTY_DIGEST
+        self.previous_digest = _EMPTY_DIGEST
+        self.recent: deque[list[float]] = deque(maxlen=WINDOWS[-1])
+        self.recent_specialty: deque[list[float]] = deque(maxlen=WINDOWS[-1])
+        self.season_sums = np.zeros(len(STAT_KEYS))
+        self.specialty_sums = np.zeros(assist_specialty_matrix(np.zeros((1, len(STAT_KEYS)))).shape[1])
+        self.opponents: dict[str, dict[str, Any]] = {}
+        # stat_feature_row of the applied games, built on the first feature_row after they change.
+        self._stat_row: dict[str, float] | None = None
+
+    def _add_game(self, key: tuple[datetime, int], stats: list[float], opponent: str | None) -> None:
+        specialty = assist_specialty_matrix(np.array([stats]))[0]
+        self.games += 1
+        self.last_key = key
+        self._stat_row = None
+        self.previous_digest = self.digest
+        self.digest = _extend_digest(self.digest, key, stats, opponent or "")
+        self.recent.appendleft(stats)
+        self.recent_specialty.appendleft(specialty.tolist())
+        self.season_sums += stats
+        self.specialty_sums += specialty
+        if opponent:
+            summary = self.opponents.setdefault(opponent, {"games": 0, "sums": [0.0] * len(stats), "last": stats})
+            summary["games"] += 1
+            summary["sums"] = [total + value for total, value in zip(summary["sums"], stats)]
+            summary["last"] = stats
+
+    def sync(self, game_logs: list[dict[str, Any]], revision: int | None = None) -> bool:
+        """
+        Apply games newer than the last one seen, converting only those rows.
+        Rebuild from scratch instead when revision (the store's, see
+        game_log_store.get_meta) moved, when the newest applied game no longer
+        matches its digest, or when the game count shows games were added or
+        removed behind it. Without a revision, a correction to an older game
+        goes unnoticed. Returns True when the state changed.
+        """
+        with self._lock:
+            count, games, anchor = _games_after(game_logs, self.last_key)
+            rebuilt = (revision is not None and revision != self.revision) or count != self.games + len(games)
+            if not rebuilt and self.games:
+                rebuilt = (
+                    anchor is None
+                    or anchor[0] != self.last_key
+                    or _extend_digest(self.previous_digest, *anchor) != self.digest
+                )
+            if rebuilt:
+                self._reset()
+                count, games, anchor = _games_after(game_logs, None)
+            for key, stats, opponent in games:
+                self._add_game(key, stats, opponent)
+            if revision is not None:
+                self.revision = revision
+            return rebuilt or bool(games)
+
+    def feature_row(self, upcoming_context: dict[str, Any] | None = None) -> dict[str, float]:
+        with self._lock:
+            if not self.games:
+                raise ValueError("game_logs must contain at least one game.")
+            matchup = None
+            summary = self.opponents.get(matchup_abbr(upcoming_context)) if matchup_abbr(upcoming_context) else None
+            if summary:
+                averages = (np.asarray(summary["sums"]) / summary["games"]).tolist()
+                matchup = (averages, list(summary["last"]), summary["games"])
+            if self._stat_row is None:
+                self._stat_row = stat_feature_row(
+                    np.array(self.recent, dtype=np.float64),
+                    np.array(self.recent_specialty, dtype=np.float64),
+                    season_avg=(self.season_sums / self.games).tolist(),
+                    specialty_season=(self.specialty_sums / self.games).tolist(),
+                )
+            return contextual_feature_row(self._stat_row, matchup, upcoming_context)
+
+    def to_payload(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": _STATE_VERSION,
+                "games": self.games,
+                "last_key": [self.last_key[0].isoformat(), self.last_key[1]] if self.last_key else None,
+                "revision": self.revision,
+                "digest": self.digest,
+                "previous_digest": self.previous_digest,
+                "recent": list(self.recent),
+                "recent_specialty": list(self.recent_specialty),
+                "season_sums": self.season_sums.tolist(),
+                "specialty_sums": self.specialty_sums.tolist(),
+                "opponents": self.opponents,
+            }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any] | None) -> "PlayerFeatureState":
+        state = cls()
+        if not payload or payload.get("version") != _STATE_VERSION:
+            return state
+        last_key = payload.get("last_key")
+        state.games = int(payload["games"])
+        state.last_key = (datetime.fromisoformat(last_key[0]), int(last_key[1])) if last_key else None
+        state.revision = payload["revision"]
+        state.digest = payload["digest"]
+        state.previous_digest = payload["previous_digest"]
+        state.recent.extend(payload["recent"])
+        state.recent_specialty.extend(payload["recent_specialty"])
+        state.season_sums = np.asarray(payload["season_sums"], dtype=np.float64)
+        state.specialty_sums = np.asarray(payload["specialty_sums"], dtype=np.float64)
+        state.opponents = payload["opponents"]
+        return state
+
+
+_states: dict[tuple[str, int], PlayerFeatureState] = {}
+_states_lock = threading.Lock()
+
+
+def _get_state(player_id: str, season: int) -> PlayerFeatureState:
+    key = (str(player_id), int(season))
+    with _states_lock:
+        state = _states.get(key)
+    if state is not None:
+        return state
+    state = PlayerFeatureState.from_payload(get_game_log_store().load_feature_state(*key))
+    with _states_lock:
+        return _states.setdefault(key, state)
+
+
+def player_feature_row(
+    player_id: str,
+    season: int,
+    game_logs: list[dict[str, Any]],
+    upcoming_context: dict[str, Any] | None = None,
+) -> dict[str, float]:
+    """build_feature_row for one player-season, applying only games the stored state has not seen."""
+    store = get_game_log_store()
+    meta = store.get_meta(player_id, season)
+    revision = meta["revision"] if meta else None
+    state = _get_state(player_id, season)
+    if revision is not None and state.revision != revision:
+        # game_logs may have been read before the correction that moved the revision.
+        game_logs = compact_game_logs(store.load(player_id, season))
+    if state.sync(game_logs, revision):
+        store.save_feature_states(season, {str(player_id): state.to_payload()})
+    return state.feature_row(upcoming_context)
+
+
+def refresh_league_feature_states(season: int) -> int:
+    """Bring every stored player-season's state up to date with the game-log store."""
+    store = get_game_log_store()
+    player_ids = store.player_ids(season)
+    # Read before the logs, so a correction stored in between only costs one extra rebuild later.
+    versions = store.game_log_versions(season, player_ids)
+    payloads = {}
+    for player_id in player_ids:
+        state = _get_state(player_id, season)
+        revision = versions[player_id][2] if player_id in versions else None
+        if state.sync(compact_game_logs(store.load(player_id, season)), revision):
+            payloads[player_id] = state.to_payload()
+    store.save_feature_states(season, payloads)
+    return len(payloads)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh incremental feature states for every stored player.")
+    parser.add_argument("--season", type=int, default=settings.season_start_year, help="Season start year, e.g. 2025.")
+    parser.add_argument("--prime", action="store_true", help="Pull new league game logs into the store first.")
+    args = parser.parse_args()
+
+    if args.prime:
+        from api_client import prime_league_game_logs
+        from nba_scheduler import BACKGROUND, request_priority
+
+        with request_priority(BACKGROUND):
+            prime_league_game_logs(args.season)
+    updated = refresh_league_feature_states(args.season)
+    print(f"Updated feature state for {updated:,} players ({args.season})")
+
+
+if __name__ == "__main__":
+    main()
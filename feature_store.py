@@ -0,0 +1,309 @@
+"""
+Materialized training feature store.
+Runs train_models._build_features once per ingest and writes the engineered
+frame as month-partitioned Parquet under FEATURE_STORE_DIR, keyed by a hash of
+the source CSV and the feature code. Training, the historical backtests and the
+accuracy test read only the date range they need instead of re-reading the CSV
+and rebuilding every feature on each call. A changed CSV or feature code gives a
+new fingerprint, so stale stores are rebuilt on first use:
+
+    python feature_store.py --dataset data/player_game_logs.csv
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import fcntl
+import hashlib
+import importlib.util
+import json
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import settings
+
+DEFAULT_DATASET_PATH = Path("data/player_game_logs.csv")
+# Raw columns the backtests show next to predictions; features already carry minutes and the pregame context.
+METADATA_COLUMNS = ["game_id", "player_name", "team_abbr", "opponent_abbr"]
+_ROW_COLUMN = "__row"
+_STORE_VERSION = 1
+_HASH_CHUNK_BYTES = 1 << 20
+_ROW_GROUP_SIZE = 1024
+
+# train_models entry points the store runs; the fingerprint covers them and everything they reach.
+_FEATURE_ROOTS = ("load_dataset", "_build_features")
+
+_source_hashes: dict[tuple[str, int, int], str] = {}
+_feature_code_hashes: dict[tuple[str, int, int], str] = {}
+
+
+def _file_sha256(path: Path) -> str:
+    stat = path.stat()
+    cache_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    cached = _source_hashes.get(cache_key)
+    if cached:
+        return cached
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    _source_hashes[cache_key] = digest.hexdigest()
+    return _source_hashes[cache_key]
+
+
+def _feature_code_sha256() -> str:
+    """
+    Hash of the train_models code the store is built from: _FEATURE_ROOTS and
+    every module-level function or constant they reference, directly or not.
+    Edits to training or export code leave the store alone. The source is
+    parsed instead of imported so readers never pay for train_models' imports.
+    """
+    path = Path(importlib.util.find_spec("train_models").origin)
+    stat = path.stat()
+    cache_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    cached = _feature_code_hashes.get(cache_key)
+    if cached:
+        return cached
+    source = path.read_text(encoding="utf-8")
+    definitions: dict[str, ast.stmt] = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            definitions[node.name] = node
+        elif isinstance(node, ast.Assign):
+            definitions.update((target.id, node) for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            definitions[node.target.id] = node
+    reached: set[str] = set()
+    pending = list(_FEATURE_ROOTS)
+    while pending:
+        name = pending.pop()
+        if name in reached or name not in definitions:
+            continue
+        reached.add(name)
+        pending.extend(node.id for node in ast.walk(definitions[name]) if isinstance(node, ast.Name))
+    digest = hashlib.sha256()
+    for name in sorted(reached):
+        digest.update(f"{name}\n{ast.get_source_segment(source, definitions[name])}\n".encode("utf-8"))
+    _feature_code_hashes[cache_key] = digest.hexdigest()
+    return _feature_code_hashes[cache_key]
+
+
+def dataset_fingerprint(dataset_path: Path) -> str:
+    combined = f"{_STORE_VERSION}:{_file_sha256(dataset_path)}:{_feature_code_sha256()}"
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()[:20]
+
+
+def _to_timestamp(value: str | date | pd.Timestamp | None) -> pd.Timestamp | None:
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    return None if pd.isna(timestamp) else timestamp.normalize()
+
+
+class FeatureStore:
+    def __init__(self, dataset_path: Path, root: Path | None = None) -> None:
+        self.dataset_path = Path(dataset_path)
+        self.root = Path(root or settings.feature_store_dir)
+        self._lock = threading.Lock()
+        self._manifest: dict[str, Any] | None = None
+
+    def _store_dir(self, fingerprint: str) -> Path:
+        return self.root / fingerprint
+
+    @contextmanager
+    def _build_lock(self) -> Iterator[None]:
+        """Serialize builds across processes (gunicorn workers, cron jobs); self._lock covers threads."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".build.lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def manifest(self) -> dict[str, Any]:
+        """Manifest of the store matching the current CSV and feature code, building it if needed."""
+        if not self.dataset_path.exists():
+            raise FileNotFoundError(f"Historical dataset not found at {self.dataset_path}.")
+        fingerprint = dataset_fingerprint(self.dataset_path)
+        manifest = self._manifest
+        if manifest is not None and manifest["fingerprint"] == fingerprint:
+            return manifest
+        with self._lock:
+            manifest_path = self._store_dir(fingerprint) / "manifest.json"
+            if not manifest_path.exists():
+                with self._build_lock():
+                    # Another process may have finished the same build while we waited.
+                    if not manifest_path.exists():
+                        self._build(fingerprint)
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            self._manifest = manifest
+            return manifest
+
+    def build(self, force: bool = False) -> dict[str, Any]:
+        if force:
+            with self._lock, self._build_lock():
+                self._manifest = self._build(dataset_fingerprint(self.dataset_path), replace=True)
+                return self._manifest
+        return self.manifest()
+
+    def _build(self, fingerprint: str, replace: bool = False) -> dict[str, Any]:
+        """
+        Write the store to a staging directory of its own, then rename it into
+        place. Callers hold _build_lock. An existing store is kept unless
+        replace is set.
+        """
+        from train_models import _build_features, load_dataset
+
+        started = time.perf_counter()
+        raw_frame = load_dataset(self.dataset_path)
+        ordered_raw = raw_frame.sort_values(["player_id", "game_date"]).reset_index(drop=True)
+        feature_frame = _build_features(raw_frame).reset_index(drop=True)
+        feature_columns = feature_frame.columns.tolist()
+        metadata_columns = [
+            column
+            for column in METADATA_COLUMNS
+            if column in ordered_raw.columns and column not in feature_frame.columns
+        ]
+        stored = pd.concat([ordered_raw[metadata_columns], feature_frame], axis=1)
+        stored[_ROW_COLUMN] = range(len(stored))
+
+        store_dir = self._store_dir(fingerprint)
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=f"{fingerprint}.", suffix=".tmp", dir=self.root))
+        staging_dir.chmod(0o755)  # mkdtemp makes it owner-only; the store is read by every worker and cron job.
+        months = stored["game_date"].dt.strftime("%Y-%m")
+        partitions = {}
+        for month, month_frame in stored.groupby(months, sort=True):
+            # Date-sorted row groups let a one-day read skip the rest of the month.
+            month_frame = month_frame.sort_values(["game_date", _ROW_COLUMN])
+            table = pa.Table.from_pandas(month_frame, preserve_index=False)
+            pq.write_table(table, staging_dir / f"{month}.parquet", row_group_size=_ROW_GROUP_SIZE)
+            partitions[month] = len(month_frame)
+
+        target_rows = stored.dropna(subset=["points", "assists", "rebounds"])
+        date_counts = target_rows["game_date"].dt.date.value_counts().sort_index()
+        manifest = {
+            "version": _STORE_VERSION,
+            "fingerprint": fingerprint,
+            "source_path": str(self.dataset_path.resolve()),
+            "built_at": time.time(),
+            "rows": len(stored),
+            "feature_columns": feature_columns,
+            "metadata_columns": metadata_columns,
+            "partitions": partitions,
+            "target_rows_by_date": {day.isoformat(): int(count) for day, count in date_counts.items()},
+            "min_date": stored["game_date"].min().date().isoformat() if len(stored) else None,
+            "max_date": stored["game_date"].max().date().isoformat() if len(stored) else None,
+        }
+        (staging_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        retired_dir = None
+        if replace and store_dir.exists():
+            # Move the old store aside and delete it only after the swap, so readers
+            # find no store just between the two renames rather than for a whole rmtree.
+            retired_dir = Path(tempfile.mkdtemp(prefix=f"{fingerprint}.", suffix=".tmp", dir=self.root))
+            store_dir.rename(retired_dir / fingerprint)
+        try:
+            staging_dir.rename(store_dir)
+        except OSError:
+            if not (store_dir / "manifest.json").exists():
+                if retired_dir is not None:
+                    (retired_dir / fingerprint).rename(store_dir)
+                    retired_dir = None
+                raise
+            # Another process won the race to the same store; keep its copy.
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return json.loads((store_dir / "manifest.json").read_text(encoding="utf-8"))
+        finally:
+            if retired_dir is not None:
+                shutil.rmtree(retired_dir, ignore_errors=True)
+        self._prune(fingerprint)
+        print(f"Feature store {fingerprint}: {len(stored):,} rows in {time.perf_counter() - started:.1f}s")
+        return manifest
+
+    def _prune(self, keep: str) -> None:
+        """Drop older stores built from the same CSV, and staging left behind by builds that died."""
+        source_path = str(self.dataset_path.resolve())
+        for staging_dir in self.root.glob("*.tmp"):
+            # Only a build holding _build_lock, i.e. this one, can be writing staging right now.
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        for manifest_path in self.root.glob("*/manifest.json"):
+            store_dir = manifest_path.parent
+            if store_dir.name == keep:
+                continue
+            try:
+                if json.loads(manifest_path.read_text(encoding="utf-8")).get("source_path") == source_path:
+                    shutil.rmtree(store_dir, ignore_errors=True)
+            except (OSError, ValueError) as exc:
+                print(f"Feature store prune error ({store_dir}): {exc}")
+
+    def load(
+        self,
+        start: str | date | pd.Timestamp | None = None,
+        end: str | date | pd.Timestamp | None = None,
+        *,
+        with_metadata: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Engineered rows with start <= game_date <= end (either bound optional),
+        in the same order _build_features produced them. with_metadata adds
+        the raw game_id/player_name/team/opponent columns in front.
+        """
+        manifest = self.manifest()
+        start_ts, end_ts = _to_timestamp(start), _to_timestamp(end)
+        columns = list(manifest["feature_columns"])
+        if with_metadata:
+            columns = [*manifest["metadata_columns"], *columns]
+
+        filters = []
+        if start_ts is not None:
+            filters.append(("game_date", ">=", start_ts))
+        if end_ts is not None:
+            filters.append(("game_date", "<", end_ts + pd.Timedelta(days=1)))
+        store_dir = self._store_dir(manifest["fingerprint"])
+        tables = [
+            pq.read_table(store_dir / f"{month}.parquet", columns=[*columns, _ROW_COLUMN], filters=filters or None)
+            for month in manifest["partitions"]
+            if (start_ts is None or month >= start_ts.strftime("%Y-%m"))
+            and (end_ts is None or month <= end_ts.strftime("%Y-%m"))
+        ]
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        frame = pa.concat_tables(tables).to_pandas()
+        return frame.sort_values(_ROW_COLUMN).drop(columns=_ROW_COLUMN).reset_index(drop=True)
+
+    def available_dates(self) -> list[str]:
+        return list(self.manifest()["target_rows_by_date"])
+
+
+@lru_cache(maxsize=8)
+def get_feature_store(dataset_path: Path = DEFAULT_DATASET_PATH) -> FeatureStore:
+    return FeatureStore(Path(dataset_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the materialized training feature store.")
+    parser.add_argument("--dataset", default=str(DEFAULT_DATASET_PATH), help="CSV written by data_ingest.py.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the fingerprint is unchanged.")
+    args = parser.parse_args()
+
+    manifest = get_feature_store(Path(args.dataset)).build(force=args.force)
+    print(
+        f"Feature store {manifest['fingerprint']}: {manifest['rows']:,} rows, "
+        f"{manifest['min_date']} → {manifest['max_date']}, {len(manifest['partitions'])} partitions"
+    )
+
+
+if __name__ == "__main__":
+    main()
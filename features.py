@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from statistics import pstdev
-from typing import Any
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
 
+import numpy as np
 import pandas as pd
 
+from game_log import PlayerGameLog
+
 
 LEGACY_FEATURE_ORDER = [
     "points",
@@ -89,11 +92,11 @@ CONTEXT_DEFAULTS = {
 }
 
 
-def _safe_float(value: Any) -> float:
-    if value in (None, "", "None"):
-        return 0.0
+def safe_float(value: Any) -> float:
     if isinstance(value, (int, float)):
         return float(value)
+    if value in (None, "", "None"):
+        return 0.0
     text = str(value).strip()
     if ":" in text:
         minutes, seconds = text.split(":", 1)
@@ -101,6 +104,19 @@ def _safe_float(value: Any) -> float:
     return float(text)
 
 
+@lru_cache(maxsize=8192)
+def _parse_date_text(raw: str) -> datetime | None:
+    # Every player's log repeats the same few hundred game dates, so parse each string once.
+    normalized = raw.replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(normalized)
+    except ValueError:
+        try:
+            return datetime.strptime(raw, "%b %d, %Y")
+        except ValueError:
+            return None
+
+
 def _parse_game_datetime(game: dict[str, Any]) -> datetime:
     raw_candidates = [
         game.get("game", {}).get("date"),
@@ -110,45 +126,40 @@ def _parse_game_datetime(game: dict[str, Any]) -> datetime:
     for raw in raw_candidates:
         if not raw:
             continue
-        normalized = str(raw).replace("Z", "+00:00")
-        try:
-            return datetime.fromisoformat(normalized)
-        except ValueError:
-            try:
-                return datetime.strptime(str(raw), "%b %d, %Y")
-            except ValueError:
-                continue
+        parsed = _parse_date_text(str(raw))
+        if parsed is not None:
+            return parsed
     return datetime.min
 
 
 def _normalize_game(game: dict[str, Any]) -> dict[str, float]:
     normalized = {
-        "points": _safe_float(game.get("points")),
-        "fgm": _safe_float(game.get("fgm")),
-        "fga": _safe_float(game.get("fga")),
-        "fgp": _safe_float(game.get("fgp")),
-        "ftp": _safe_float(game.get("ftp")),
-        "tpm": _safe_float(game.get("tpm")),
-        "tpa": _safe_float(game.get("tpa")),
-        "tpp": _safe_float(game.get("tpp")),
-        "offReb": _safe_float(game.get("offReb")),
-        "defReb": _safe_float(game.get("defReb")),
-        "totReb": _safe_float(game.get("totReb")),
-        "assists": _safe_float(game.get("assists")),
-        "pFouls": _safe_float(game.get("pFouls")),
-        "steals": _safe_float(game.get("steals")),
-        "turnovers": _safe_float(game.get("turnovers")),
-        "blocks": _safe_float(game.get("blocks")),
-        "plusMinus": _safe_float(game.get("plusMinus")),
-        "minutes": _safe_float(game.get("min")),
-        "usage_rate": _safe_float(game.get("usage_rate")),
-        "true_shooting_pct": _safe_float(game.get("true_shooting_pct")),
-        "player_pace": _safe_float(game.get("player_pace")),
-        "player_off_rating": _safe_float(game.get("player_off_rating")),
-        "player_def_rating": _safe_float(game.get("player_def_rating")),
-        "starter": _safe_float(game.get("starter")),
+        "points": safe_float(game.get("points")),
+        "fgm": safe_float(game.get("fgm")),
+        "fga": safe_float(game.get("fga")),
+        "fgp": safe_float(game.get("fgp")),
+        "ftp": safe_float(game.get("ftp")),
+        "tpm": safe_float(game.get("tpm")),
+        "tpa": safe_float(game.get("tpa")),
+        "tpp": safe_float(game.get("tpp")),
+        "offReb": safe_float(game.get("offReb")),
+        "defReb": safe_float(game.get("defReb")),
+        "totReb": safe_float(game.get("totReb")),
+        "assists": safe_float(game.get("assists")),
+        "pFouls": safe_float(game.get("pFouls")),
+        "steals": safe_float(game.get("steals")),
+        "turnovers": safe_float(game.get("turnovers")),
+        "blocks": safe_float(game.get("blocks")),
+        "plusMinus": safe_float(game.get("plusMinus")),
+        "minutes": safe_float(game.get("min")),
+        "usage_rate": safe_float(game.get("usage_rate")),
+        "true_shooting_pct": safe_float(game.get("true_shooting_pct")),
+        "player_pace": safe_float(game.get("player_pace")),
+        "player_off_rating": safe_float(game.get("player_off_rating")),
+        "player_def_rating": safe_float(game.get("player_def_rating")),
+        "starter": safe_float(game.get("starter")),
     }
-    normalized["game_id"] = int(_safe_float(game.get("game", {}).get("id")))
+    normalized["game_id"] = int(safe_float(game.get("game", {}).get("id")))
     normalized["game_datetime"] = _parse_game_datetime(game)
     normalized["opponent_abbr"] = str(game.get("opponent_abbr", "") or "").upper()
     return normalized
@@ -170,22 +181,10 @@ def _window_mean(games: list[dict[str, float]], stat_key: str) -> float:
     return sum(values) / len(values)
 
 
-def _window_std(games: list[dict[str, float]], stat_key: str) -> float:
-    if len(games) <= 1:
-        return 0.0
-    values = [game.get(stat_key, 0.0) for game in games]
-    return pstdev(values)
-
-
-def _window_rate(games: list[dict[str, float]], predicate) -> float:
-    if not games:
-        return 0.0
-    return sum(1.0 for game in games if predicate(game)) / len(games)
-
-
 def _build_inference_context(
     ordered_games: list[dict[str, float]],
     upcoming_context: dict[str, Any] | None,
+    recent_means: dict[str, float] | None = None,
 ) -> dict[str, float]:
     context = {key: float(value) for key, value in CONTEXT_DEFAULTS.items()}
     provided_keys: set[str] = set()
@@ -195,69 +194,22 @@ def _build_inference_context(
                 context[key] = float(value)
                 provided_keys.add(key)
 
-    if ordered_games:
+    if recent_means is None and ordered_games:
         recent_games = ordered_games[:10]
+        recent_means = {
+            key: _window_mean(recent_games, key)
+            for key in ("minutes", "usage_rate", "true_shooting_pct", "player_pace", "player_off_rating", "player_def_rating")
+        }
+    if recent_means is not None:
         if "starter" not in provided_keys:
-            context["starter"] = float(_window_mean(recent_games, "minutes") >= 28.0)
-        if "usage_rate" not in provided_keys:
-            context["usage_rate"] = _window_mean(recent_games, "usage_rate")
-        if "true_shooting_pct" not in provided_keys:
-            context["true_shooting_pct"] = _window_mean(recent_games, "true_shooting_pct")
-        if "player_pace" not in provided_keys:
-            context["player_pace"] = _window_mean(recent_games, "player_pace")
-        if "player_off_rating" not in provided_keys:
-            context["player_off_rating"] = _window_mean(recent_games, "player_off_rating")
-        if "player_def_rating" not in provided_keys:
-            context["player_def_rating"] = _window_mean(recent_games, "player_def_rating")
+            context["starter"] = float(recent_means["minutes"] >= 28.0)
+        for key in ("usage_rate", "true_shooting_pct", "player_pace", "player_off_rating", "player_def_rating"):
+            if key not in provided_keys:
+                context[key] = recent_means[key]
     return context
 
 
-def build_feature_row(game_logs: list[dict[str, Any]], upcoming_context: dict[str, Any] | None = None) -> dict[str, float]:
-    if not game_logs:
-        raise ValueError("game_logs must contain at least one game.")
-    ordered_games = sort_games(game_logs)
-    context = _build_inference_context(ordered_games, upcoming_context)
-    feature_row: dict[str, float] = {}
-
-    for feature_name, stat_key in INFERENCE_STAT_SOURCES.items():
-        for window in (3, 5, 10):
-            games = ordered_games[:window]
-            feature_row[f"{feature_name}_rolling_{window}"] = _window_mean(games, stat_key)
-            feature_row[f"{feature_name}_rolling_std_{window}"] = _window_std(games, stat_key)
-        feature_row[f"{feature_name}_season_avg"] = _window_mean(ordered_games, stat_key)
-        feature_row[f"{feature_name}_last_game"] = ordered_games[0].get(stat_key, 0.0) if ordered_games else 0.0
-
-    for window in (5, 10):
-        games = ordered_games[:window]
-        feature_row[f"lead_role_rate_{window}"] = _window_rate(games, lambda game: game.get("minutes", 0.0) >= 30.0)
-        feature_row[f"heavy_load_rate_{window}"] = _window_rate(games, lambda game: game.get("minutes", 0.0) >= 34.0)
-        feature_row[f"rotation_role_rate_{window}"] = _window_rate(games, lambda game: game.get("minutes", 0.0) >= 24.0)
-        feature_row[f"bench_risk_rate_{window}"] = _window_rate(games, lambda game: game.get("minutes", 0.0) < 20.0)
-
-    assist_specialty_builders = {
-        "assists_per_minute": lambda game: game.get("assists", 0.0) / max(game.get("minutes", 0.0), 1.0),
-        "points_per_minute": lambda game: game.get("points", 0.0) / max(game.get("minutes", 0.0), 1.0),
-        "rebounds_per_minute": lambda game: game.get("totReb", 0.0) / max(game.get("minutes", 0.0), 1.0),
-        "assist_to_turnover": lambda game: game.get("assists", 0.0) / max(game.get("turnovers", 0.0), 1.0),
-        "assist_plus_usage": lambda game: game.get("assists", 0.0) + (game.get("usage_rate", 0.0) * 10.0),
-        "assist_creation": lambda game: (game.get("assists", 0.0) / max(game.get("minutes", 0.0), 1.0)) * game.get("usage_rate", 0.0),
-        "assist_load": lambda game: game.get("assists", 0.0) * game.get("minutes", 0.0),
-    }
-    for feature_name, value_getter in assist_specialty_builders.items():
-        derived_games = [{feature_name: value_getter(game)} for game in ordered_games]
-        for window in (3, 5, 10):
-            games = derived_games[:window]
-            feature_row[f"{feature_name}_rolling_{window}"] = _window_mean(games, feature_name)
-        feature_row[f"{feature_name}_season_avg"] = _window_mean(derived_games, feature_name)
-        feature_row[f"{feature_name}_last_game"] = derived_games[0].get(feature_name, 0.0) if derived_games else 0.0
-
-    for window in (3, 5, 10):
-        assists_games = ordered_games[:window]
-        team_assists = max(context["team_assists_form_5"], 1.0)
-        feature_row[f"assist_share_rolling_{window}"] = _window_mean(assists_games, "assists") / team_assists if assists_games else 0.0
-    feature_row["assist_share_season_avg"] = feature_row["assist_share_rolling_10"]
-    feature_row["assist_share_last_game"] = feature_row["assists_last_game"] / max(context["team_assists_form_5"], 1.0)
-
+def _add_context_features(feature_row: dict[str, float], context: dict[str, float]) -> None:
     feature_row.update(context)
     advanced_fallbacks = {
         "usage_rate": context["usage_rate"],
@@ -316,27 +268,8 @@ def build_feature_row(game_logs: list[dict[str, Any]], upcoming_context: dict[st
         feature_row["implied_game_total"] = 0.0
         feature_row["team_pace_edge_ratio"] = 1.0
 
-    # Opponent-specific matchup history features
-    opponent_abbr_for_matchup = str((upcoming_context or {}).get("opponent_abbr", "") or "").upper()
-    if opponent_abbr_for_matchup and ordered_games:
-        opp_games = [g for g in ordered_games if g.get("opponent_abbr", "").upper() == opponent_abbr_for_matchup]
-    else:
-        opp_games = []
-    for stat, key in [("points", "points"), ("assists", "assists"), ("rebounds", "totReb")]:
-        if opp_games:
-            feature_row[f"vs_opp_{stat}_avg"] = _window_mean(opp_games, key)
-            feature_row[f"vs_opp_{stat}_last"] = opp_games[0].get(key, 0.0)
-        else:
-            feature_row[f"vs_opp_{stat}_avg"] = feature_row.get(f"{stat}_season_avg", 0.0)
-            feature_row[f"vs_opp_{stat}_last"] = 0.0
-    feature_row["vs_opp_minutes_avg"] = _window_mean(opp_games, "minutes") if opp_games else feature_row.get("minutes_season_avg", 0.0)
-    feature_row["vs_opp_games_count"] = float(len(opp_games))
 
-    # Role stability: how consistent are minutes over last 10 games
-    recent_10 = ordered_games[:10]
-    feature_row["minutes_volatility_10"] = _window_std(recent_10, "minutes")
-    feature_row["starter_rate_5"] = _window_mean(ordered_games[:5], "starter")
-    feature_row["starter_rate_10"] = _window_mean(recent_10, "starter")
+def _add_role_features(feature_row: dict[str, float]) -> None:
     feature_row["starter_consistency"] = 1.0 - (feature_row["minutes_volatility_10"] / max(feature_row["minutes_rolling_10"], 1.0))
     feature_row["role_stability_score"] = feature_row["starter_rate_10"] * feature_row["starter_consistency"]
 
@@ -352,10 +285,270 @@ def build_feature_row(game_logs: list[dict[str, Any]], upcoming_context: dict[st
     # Net efficiency: plus_minus trend
     feature_row["plus_minus_trend"] = feature_row["plus_minus_rolling_3"] - feature_row["plus_minus_rolling_10"]
 
+
+WINDOWS = (3, 5, 10)
+STAT_KEYS = tuple(INFERENCE_STAT_SOURCES.values())
+_STAT_INDEX = {key: index for index, key in enumerate(STAT_KEYS)}
+# Raw game-log field behind each stat; opponent ratings are never read from the logs.
+RAW_STAT_KEYS = tuple(
+    {"minutes": "min", "opp_def_rating": None, "opp_pace": None}.get(key, key) for key in STAT_KEYS
+)
+_ASSIST_SPECIALTY_FEATURES = (
+    "assists_per_minute",
+    "points_per_minute",
+    "rebounds_per_minute",
+    "assist_to_turnover",
+    "assist_plus_usage",
+    "assist_creation",
+    "assist_load",
+)
+# Ten-game means _build_inference_context fills player context from; each is its own feature name too.
+_CONTEXT_MEAN_KEYS = ("minutes", "usage_rate", "true_shooting_pct", "player_pace", "player_off_rating", "player_def_rating")
+# Output names per stat column, built once instead of formatted for every row.
+_STAT_FEATURE_NAMES = tuple(
+    (
+        tuple((f"{name}_rolling_{window}", f"{name}_rolling_std_{window}") for window in WINDOWS),
+        f"{name}_season_avg",
+        f"{name}_last_game",
+    )
+    for name in INFERENCE_STAT_SOURCES
+)
+_SPECIALTY_FEATURE_NAMES = tuple(
+    (tuple(f"{name}_rolling_{window}" for window in WINDOWS), f"{name}_season_avg", f"{name}_last_game")
+    for name in _ASSIST_SPECIALTY_FEATURES
+)
+
+
+def game_stat_vector(game: dict[str, Any]) -> list[float]:
+    return [safe_float(game.get(raw_key)) if raw_key else 0.0 for raw_key in RAW_STAT_KEYS]
+
+
+def game_sort_key(game: dict[str, Any]) -> tuple[datetime, int]:
+    return _parse_game_datetime(game), int(safe_float(game.get("game", {}).get("id")))
+
+
+def _sorted_stat_matrix(game_logs: list[dict[str, Any]]) -> tuple[np.ndarray, list[str]]:
+    """
+    Games x STAT_KEYS float64 matrix plus opponent abbreviations, newest game
+    first, in the same order sort_games produces.
+    """
+    if isinstance(game_logs, PlayerGameLog):
+        return game_logs.stat_columns(RAW_STAT_KEYS), game_logs.opponent_codes()
+    keyed_games = sorted(
+        ((game_sort_key(game), game) for game in game_logs),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    stats = np.array([game_stat_vector(game) for _, game in keyed_games], dtype=np.float64)
+    opponents = [game_opponent(game) for _, game in keyed_games]
+    return stats, opponents
+
+
+def game_opponent(game: dict[str, Any]) -> str:
+    return str(game.get("opponent_abbr", "") or "").upper()
+
+
+def assist_specialty_matrix(stats: np.ndarray) -> np.ndarray:
+    assists = stats[:, _STAT_INDEX["assists"]]
+    minutes = stats[:, _STAT_INDEX["minutes"]]
+    usage = stats[:, _STAT_INDEX["usage_rate"]]
+    assists_per_minute = assists / np.maximum(minutes, 1.0)
+    return np.column_stack(
+        [
+            assists_per_minute,
+            stats[:, _STAT_INDEX["points"]] / np.maximum(minutes, 1.0),
+            stats[:, _STAT_INDEX["totReb"]] / np.maximum(minutes, 1.0),
+            assists / np.maximum(stats[:, _STAT_INDEX["turnovers"]], 1.0),
+            assists + (usage * 10.0),
+            assists_per_minute * usage,
+            assists * minutes,
+        ]
+    )
+
+
+def _column_means(values: np.ndarray) -> list[float]:
+    # A running sum adds games in the same order as the per-game loop, so the means match it bit for bit.
+    return (np.cumsum(values, axis=0)[-1] / len(values)).tolist()
+
+
+def _window_means(recent: np.ndarray) -> dict[int, list[float]]:
+    cumulative = np.cumsum(recent, axis=0)
+    rows = len(recent)
+    return {window: (cumulative[min(window, rows) - 1] / min(window, rows)).tolist() for window in WINDOWS}
+
+
+def _window_stds(recent: np.ndarray, means: dict[int, list[float]]) -> dict[int, list[float]]:
+    stds = {}
+    for window in WINDOWS:
+        sample = recent[:window]
+        if len(sample) <= 1:
+            stds[window] = [0.0] * recent.shape[1]
+            continue
+        deviations = sample - np.asarray(means[window])
+        stds[window] = np.sqrt((deviations * deviations).sum(axis=0) / len(sample)).tolist()
+    return stds
+
+
+def matchup_abbr(upcoming_context: dict[str, Any] | None) -> str:
+    return str((upcoming_context or {}).get("opponent_abbr", "") or "").upper()
+
+
+def stat_feature_row(
+    recent_stats: np.ndarray,
+    recent_specialty: np.ndarray,
+    season_avg: list[float],
+    specialty_season: list[float],
+) -> dict[str, float]:
+    """
+    The features that depend only on the games played: rolling, season and
+    last-game stats, role rates and assist specialties, from the newest ten
+    games (newest first) and season averages.
+    """
+    means = _window_means(recent_stats)
+    stds = _window_stds(recent_stats, means)
+    last_game = recent_stats[0].tolist()
+    feature_row: dict[str, float] = {}
+
+    for column, (window_names, season_name, last_name) in enumerate(_STAT_FEATURE_NAMES):
+        for window, (rolling_name, std_name) in zip(WINDOWS, window_names):
+            feature_row[rolling_name] = means[window][column]
+            feature_row[std_name] = stds[window][column]
+        feature_row[season_name] = season_avg[column]
+        feature_row[last_name] = last_game[column]
+
+    minutes = recent_stats[:, _STAT_INDEX["minutes"]]
+    for window in (5, 10):
+        recent_minutes = minutes[:window]
+        count = len(recent_minutes)
+        feature_row[f"lead_role_rate_{window}"] = np.count_nonzero(recent_minutes >= 30.0) / count
+        feature_row[f"heavy_load_rate_{window}"] = np.count_nonzero(recent_minutes >= 34.0) / count
+        feature_row[f"rotation_role_rate_{window}"] = np.count_nonzero(recent_minutes >= 24.0) / count
+        feature_row[f"bench_risk_rate_{window}"] = np.count_nonzero(recent_minutes < 20.0) / count
+
+    specialty_means = _window_means(recent_specialty)
+    specialty_last = recent_specialty[0].tolist()
+    for column, (window_names, season_name, last_name) in enumerate(_SPECIALTY_FEATURE_NAMES):
+        for window, rolling_name in zip(WINDOWS, window_names):
+            feature_row[rolling_name] = specialty_means[window][column]
+        feature_row[season_name] = specialty_season[column]
+        feature_row[last_name] = specialty_last[column]
     return feature_row
 
 
+def contextual_feature_row(
+    stat_row: dict[str, float],
+    matchup: tuple[list[float], list[float], int] | None,
+    upcoming_context: dict[str, Any] | None,
+) -> dict[str, float]:
+    """
+    stat_feature_row output completed for one upcoming game, with an optional
+    (average, last game, count) summary of games against the opponent.
+    stat_row itself is left untouched, so it can be reused across games.
+    """
+    context = _build_inference_context(
+        [],
+        upcoming_context,
+        recent_means={key: stat_row[f"{key}_rolling_10"] for key in _CONTEXT_MEAN_KEYS},
+    )
+    feature_row = dict(stat_row)
+
+    team_assists = max(context["team_assists_form_5"], 1.0)
+    for window in WINDOWS:
+        feature_row[f"assist_share_rolling_{window}"] = feature_row[f"assists_rolling_{window}"] / team_assists
+    feature_row["assist_share_season_avg"] = feature_row["assist_share_rolling_10"]
+    feature_row["assist_share_last_game"] = feature_row["assists_last_game"] / team_assists
+
+    _add_context_features(feature_row, context)
+
+    # Opponent-specific matchup history features
+    for stat, key in [("points", "points"), ("assists", "assists"), ("rebounds", "totReb")]:
+        if matchup:
+            feature_row[f"vs_opp_{stat}_avg"] = matchup[0][_STAT_INDEX[key]]
+            feature_row[f"vs_opp_{stat}_last"] = matchup[1][_STAT_INDEX[key]]
+        else:
+            feature_row[f"vs_opp_{stat}_avg"] = feature_row.get(f"{stat}_season_avg", 0.0)
+            feature_row[f"vs_opp_{stat}_last"] = 0.0
+    feature_row["vs_opp_minutes_avg"] = matchup[0][_STAT_INDEX["minutes"]] if matchup else feature_row.get("minutes_season_avg", 0.0)
+    feature_row["vs_opp_games_count"] = float(matchup[2] if matchup else 0)
+
+    # Role stability: how consistent are minutes over last 10 games
+    feature_row["minutes_volatility_10"] = stat_row["minutes_rolling_std_10"]
+    feature_row["starter_rate_5"] = stat_row["starter_rolling_5"]
+    feature_row["starter_rate_10"] = stat_row["starter_rolling_10"]
+    _add_role_features(feature_row)
+
+    return feature_row
+
+
+def assemble_feature_row(
+    recent_stats: np.ndarray,
+    recent_specialty: np.ndarray,
+    season_avg: list[float],
+    specialty_season: list[float],
+    matchup: tuple[list[float], list[float], int] | None,
+    upcoming_context: dict[str, Any] | None,
+) -> dict[str, float]:
+    """
+    Feature row from the newest ten games (newest first), season averages and an
+    optional (average, last game, count) summary of games against the opponent.
+    """
+    return contextual_feature_row(
+        stat_feature_row(recent_stats, recent_specialty, season_avg, specialty_season),
+        matchup,
+        upcoming_context,
+    )
+
+
+def build_feature_row(game_logs: list[dict[str, Any]], upcoming_context: dict[str, Any] | None = None) -> dict[str, float]:
+    if not game_logs:
+        raise ValueError("game_logs must contain at least one game.")
+    stats, opponents = _sorted_stat_matrix(game_logs)
+    specialty = assist_specialty_matrix(stats)
+
+    matchup = None
+    opponent_abbr_for_matchup = matchup_abbr(upcoming_context)
+    if opponent_abbr_for_matchup:
+        opp_rows = [index for index, opponent in enumerate(opponents) if opponent == opponent_abbr_for_matchup]
+        if opp_rows:
+            opp_stats = stats[opp_rows]
+            matchup = (_column_means(opp_stats), opp_stats[0].tolist(), len(opp_rows))
+
+    return assemble_feature_row(
+        stats[:WINDOWS[-1]],
+        specialty[:WINDOWS[-1]],
+        season_avg=_column_means(stats),
+        specialty_season=_column_means(specialty),
+        matchup=matchup,
+        upcoming_context=upcoming_context,
+    )
+
+
+def build_feature_matrix(feature_rows: Sequence[Mapping[str, float]], feature_names: Sequence[str]) -> np.ndarray:
+    """
+    Feature rows (build_feature_row output) for many players as one float64
+    matrix with columns in feature_names order; a feature a row lacks reads as 0.0.
+    """
+    matrix = np.zeros((len(feature_rows), len(feature_names)), dtype=np.float64)
+    if not feature_rows:
+        return matrix
+    row_names = tuple(feature_rows[0])
+    if all(tuple(row) == row_names for row in feature_rows):
+        # Every row carries the same feature names in the same order, so map columns once.
+        positions = {name: index for index, name in enumerate(row_names)}
+        source = [positions.get(name) for name in feature_names]
+        present = [column for column, index in enumerate(source) if index is not None]
+        values = np.array([list(row.values()) for row in feature_rows], dtype=np.float64)
+        matrix[:, present] = values[:, [source[column] for column in present]]
+    else:
+        for index, row in enumerate(feature_rows):
+            matrix[index] = [row.get(name, 0.0) for name in feature_names]
+    return matrix
+
+
 def build_legacy_feature_frame(game_logs: list[dict[str, Any]]) -> pd.DataFrame:
+    if isinstance(game_logs, PlayerGameLog) and len(game_logs):
+        averages = _column_means(game_logs.stat_columns(LEGACY_FEATURE_ORDER)[:5])
+        return pd.DataFrame([{f"Column_{index}": value for index, value in enumerate(averages)}])
     ordered_games = sort_games(game_logs)[:5]
     if not ordered_games:
         row = {f"Column_{index}": 0.0 for index, _ in enumerate(LEGACY_FEATURE_ORDER)}
@@ -0,0 +1,164 @@
+"""
+Compact per-player game logs.
+A PlayerGameLog keeps one player-season as columns: a float64 matrix of the
+box-score fields, interned id/date/team strings and a single shared player
+record, sorted newest game first. Feature code reads the matrix directly;
+everything else can keep treating it as a sequence of today's game dicts,
+which are rebuilt on access.
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+# Numeric game-log fields, in matrix column order.
+STAT_FIELDS = (
+    "points",
+    "fgm",
+    "fga",
+    "fgp",
+    "ftp",
+    "tpm",
+    "tpa",
+    "tpp",
+    "offReb",
+    "defReb",
+    "totReb",
+    "assists",
+    "pFouls",
+    "steals",
+    "turnovers",
+    "blocks",
+    "plusMinus",
+    "min",
+    "usage_rate",
+    "true_shooting_pct",
+    "player_pace",
+    "player_off_rating",
+    "player_def_rating",
+    "starter",
+)
+STAT_FIELD_INDEX = {field: index for index, field in enumerate(STAT_FIELDS)}
+_KNOWN_KEYS = {"game", "team", "player", "opponent_abbr", *STAT_FIELDS}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class PlayerGameLog(Sequence):
+    __slots__ = (
+        "game_times",
+        "game_numbers",
+        "game_ids",
+        "game_dates",
+        "team_ids",
+        "team_codes",
+        "opponents",
+        "players",
+        "stats",
+        "missing",
+        "extras",
+    )
+
+    def __init__(self, games: Iterable[dict[str, Any]]) -> None:
+        from features import game_sort_key, safe_float
+
+        keyed_games = sorted(((game_sort_key(game), game) for game in games), key=lambda item: item[0], reverse=True)
+        count = len(keyed_games)
+        self.game_times = np.array([key[0] for key, _ in keyed_games], dtype="datetime64[us]")
+        self.game_numbers = np.array([key[1] for key, _ in keyed_games], dtype=np.int64)
+        self.stats = np.zeros((count, len(STAT_FIELDS)), dtype=np.float64)
+        self.missing = np.zeros((count, len(STAT_FIELDS)), dtype=bool)
+        game_ids, game_dates, team_ids, team_codes, opponents, players = [], [], [], [], [], []
+        extras: list[dict[str, Any] | None] = []
+        shared_players: dict[tuple, dict[str, Any]] = {}
+        for row, (_, game) in enumerate(keyed_games):
+            game_info = game.get("game") or {}
+            team = game.get("team") or {}
+            game_ids.append(_intern(game_info.get("id")))
+            game_dates.append(_intern(game_info.get("date")))
+            team_ids.append(team.get("id"))
+            team_codes.append(_intern(team.get("code")))
+            opponents.append(_intern(game.get("opponent_abbr")))
+            player = game.get("player")
+            if isinstance(player, dict):
+                player = shared_players.setdefault(tuple(player.items()), player)
+            players.append(player)
+            for column, field in enumerate(STAT_FIELDS):
+                if field in game:
+                    self.stats[row, column] = safe_float(game[field])
+                else:
+                    self.missing[row, column] = True
+            unknown = {key: value for key, value in game.items() if key not in _KNOWN_KEYS}
+            extras.append(unknown or None)
+        self.game_ids = tuple(game_ids)
+        self.game_dates = tuple(game_dates)
+        self.team_ids = tuple(team_ids)
+        self.team_codes = tuple(team_codes)
+        self.opponents = tuple(opponents)
+        self.players = tuple(players)
+        self.extras = tuple(extras) if any(extras) else None
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._game_dict(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("game index out of range")
+        return self._game_dict(index)
+
+    def _game_dict(self, row: int) -> dict[str, Any]:
+        """Today's nested game dict for one row; numeric fields come back as floats."""
+        game: dict[str, Any] = {"game": {"id": self.game_ids[row], "date": self.game_dates[row]}}
+        if self.team_ids[row] is not None or self.team_codes[row] is not None:
+            game["team"] = {"id": self.team_ids[row], "code": self.team_codes[row]}
+        if self.players[row] is not None:
+            game["player"] = dict(self.players[row])
+        game["opponent_abbr"] = self.opponents[row]
+        values = self.stats[row].tolist()
+        missing = self.missing[row]
+        for column, field in enumerate(STAT_FIELDS):
+            if not missing[column]:
+                game[field] = values[column]
+        if self.extras and self.extras[row]:
+            game.update(self.extras[row])
+        return game
+
+    @property
+    def sort_keys(self) -> list[tuple[datetime, int]]:
+        """features.game_sort_key for every game, newest first."""
+        return list(zip(self.game_times.tolist(), self.game_numbers.tolist()))
+
+    def sort_key(self, row: int) -> tuple[datetime, int]:
+        """features.game_sort_key for one game."""
+        return self.game_times[row].item(), int(self.game_numbers[row])
+
+    def stat_columns(self, fields: Sequence[str | None], rows: int | None = None) -> np.ndarray:
+        """Games x fields matrix, newest first (only the newest rows games if given); None or absent fields read as 0.0."""
+        count = len(self) if rows is None else min(rows, len(self))
+        matrix = np.zeros((count, len(fields)), dtype=np.float64)
+        for column, field in enumerate(fields):
+            if field is not None:
+                matrix[:, column] = self.stats[:count, STAT_FIELD_INDEX[field]]
+        return matrix
+
+    def opponent_codes(self, rows: int | None = None) -> list[str]:
+        return [str(opponent or "").upper() for opponent in self.opponents[:rows]]
+
+
+def compact_game_logs(games: Iterable[dict[str, Any]]) -> Sequence[dict[str, Any]]:
+    """PlayerGameLog for games, or the games as a tuple when a field will not parse as a number."""
+    games = tuple(games)
+    try:
+        return PlayerGameLog(games)
+    except (TypeError, ValueError):
+        return games
@@ -0,0 +1,278 @@
+"""
+On-disk player game-log store shared by every worker process.
+Rows are keyed by (player_id, season, game_id); a per-player summary row keeps
+last_fetched_at and the latest stored game date so refreshes only pull new games,
+plus the stored game count and a revision bumped whenever a stored game is corrected.
+Incremental feature states (see feature_state.py) are kept alongside.
+Callbacks registered with on_new_games hear which players a merge added or corrected games for.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_logs (
+    player_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    game_id TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (player_id, season, game_id)
+);
+CREATE TABLE IF NOT EXISTS player_seasons (
+    player_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    last_fetched_at REAL NOT NULL,
+    latest_game_date TEXT,
+    game_count INTEGER NOT NULL DEFAULT 0,
+    revision INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, season)
+);
+CREATE TABLE IF NOT EXISTS feature_states (
+    player_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (player_id, season)
+);
+CREATE TABLE IF NOT EXISTS league_seasons (
+    season INTEGER PRIMARY KEY,
+    last_fetched_at REAL NOT NULL,
+    latest_game_date TEXT
+);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars sneak in from DataFrame rows
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+_new_game_listeners: list[Callable[[int, set[str]], None]] = []
+
+
+def on_new_games(callback: Callable[[int, set[str]], None]) -> None:
+    """Call callback(season, player_ids) after a merge stores a new or corrected game for those players."""
+    _new_game_listeners.append(callback)
+
+
+def _notify_new_games(season: int, player_ids: set[str]) -> None:
+    for callback in list(_new_game_listeners):
+        try:
+            callback(season, player_ids)
+        except Exception as exc:
+            print(f"Game-log listener error: {exc}")
+
+
+class GameLogStore:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        # Stores created before game_count/revision existed; another worker may have added them first.
+        for column in ("game_count", "revision"):
+            try:
+                conn.execute(f"ALTER TABLE player_seasons ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                continue
+            if column == "game_count":
+                conn.execute(
+                    "UPDATE player_seasons SET game_count = (SELECT COUNT(*) FROM game_logs g "
+                    "WHERE g.player_id = player_seasons.player_id AND g.season = player_seasons.season)"
+                )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_meta(self, player_id: str, season: int) -> dict[str, Any] | None:
+        """Return {"last_fetched_at", "latest_game_date", "revision"} or None if never fetched."""
+        row = self._connection().execute(
+            "SELECT last_fetched_at, latest_game_date, revision FROM player_seasons WHERE player_id = ? AND season = ?",
+            (str(player_id), int(season)),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"last_fetched_at": float(row[0]), "latest_game_date": row[1] or "", "revision": int(row[2])}
+
+    def get_league_meta(self, season: int) -> dict[str, Any] | None:
+        """Watermark of the last league-wide bulk load for a season."""
+        row = self._connection().execute(
+            "SELECT last_fetched_at, latest_game_date FROM league_seasons WHERE season = ?",
+            (int(season),),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"last_fetched_at": float(row[0]), "latest_game_date": row[1] or ""}
+
+    def load(self, player_id: str, season: int) -> tuple:
+        """Stored game rows for one player-season, newest first."""
+        rows = self._connection().execute(
+            "SELECT payload FROM game_logs WHERE player_id = ? AND season = ? "
+            "ORDER BY game_date DESC, game_id DESC",
+            (str(player_id), int(season)),
+        ).fetchall()
+        return tuple(json.loads(row[0]) for row in rows)
+
+    def merge(
+        self,
+        player_id: str,
+        season: int,
+        games: list[tuple[str, str, dict[str, Any]]],
+        fetched_at: float | None = None,
+    ) -> None:
+        """Upsert (game_id, iso_game_date, payload) rows and stamp the fetch time."""
+        self.merge_many(season, {str(player_id): games}, fetched_at=fetched_at)
+
+    def merge_many(
+        self,
+        season: int,
+        games_by_player: dict[str, list[tuple[str, str, dict[str, Any]]]],
+        fetched_at: float | None = None,
+    ) -> None:
+        """
+        Upsert rows for many players in one transaction. Rows whose payload is
+        unchanged are skipped; a changed payload for a stored game (a stat
+        correction) bumps the player-season's revision.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        conn = self._connection()
+        changed_players: set[str] = set()
+        with conn:
+            for player_id, games in games_by_player.items():
+                player_id = str(player_id)
+                stored = dict(
+                    conn.execute(
+                        "SELECT game_id, payload FROM game_logs WHERE player_id = ? AND season = ?",
+                        (player_id, int(season)),
+                    ).fetchall()
+                )
+                rows = {}
+                for game_id, game_date, payload in games:
+                    encoded = json.dumps(payload, default=_json_default)
+                    if stored.get(str(game_id)) != encoded:
+                        rows[str(game_id)] = (player_id, int(season), str(game_id), game_date, encoded)
+                corrected = sum(1 for game_id in rows if game_id in stored)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO game_logs (player_id, season, game_id, game_date, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    list(rows.values()),
+                )
+                latest = conn.execute(
+                    "SELECT MAX(game_date) FROM game_logs WHERE player_id = ? AND season = ?",
+                    (player_id, int(season)),
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT INTO player_seasons (player_id, season, last_fetched_at, latest_game_date, game_count, revision) "
+                    "VALUES (?, ?, ?, ?, ?, 0) "
+                    "ON CONFLICT (player_id, season) DO UPDATE SET last_fetched_at = excluded.last_fetched_at, "
+                    "latest_game_date = excluded.latest_game_date, game_count = excluded.game_count, "
+                    "revision = revision + ?",
+                    (player_id, int(season), fetched_at, latest, len(stored) + len(rows) - corrected, int(corrected > 0)),
+                )
+                if rows:
+                    changed_players.add(player_id)
+        if changed_players:
+            _notify_new_games(int(season), changed_players)
+
+    def merge_league(
+        self,
+        season: int,
+        games_by_player: dict[str, list[tuple[str, str, dict[str, Any]]]],
+        fetched_at: float | None = None,
+    ) -> None:
+        """
+        Store a league-wide load. Every player-season already in the store is
+        stamped fresh too, since the bulk pull covers all of their new games.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        self.merge_many(season, games_by_player, fetched_at=fetched_at)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "UPDATE player_seasons SET last_fetched_at = ? WHERE season = ?",
+                (fetched_at, int(season)),
+            )
+            latest = conn.execute(
+                "SELECT MAX(game_date) FROM game_logs WHERE season = ?",
+                (int(season),),
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO league_seasons (season, last_fetched_at, latest_game_date) VALUES (?, ?, ?)",
+                (int(season), fetched_at, latest),
+            )
+
+    def player_ids(self, season: int) -> list[str]:
+        """Every player with stored games for a season."""
+        rows = self._connection().execute(
+            "SELECT player_id FROM player_seasons WHERE season = ? ORDER BY player_id",
+            (int(season),),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def game_log_versions(self, season: int, player_ids: Iterable[str]) -> dict[str, tuple[str, int, int]]:
+        """
+        (latest stored game date, stored game count, revision) per player-season,
+        read in bulk. The revision changes when a stored game is corrected, so
+        the stamp moves on new games and stat corrections alike. Every worker
+        sees the same value, whichever process stored the games; players with
+        nothing stored are left out.
+        """
+        player_ids = sorted({str(player_id) for player_id in player_ids})
+        conn = self._connection()
+        versions = {}
+        # Stays under SQLite's bound-parameter limit.
+        for start in range(0, len(player_ids), 500):
+            chunk = player_ids[start : start + 500]
+            rows = conn.execute(
+                "SELECT player_id, latest_game_date, game_count, revision FROM player_seasons "
+                f"WHERE season = ? AND player_id IN ({', '.join('?' * len(chunk))})",
+                (int(season), *chunk),
+            ).fetchall()
+            versions.update({row[0]: (row[1] or "", int(row[2]), int(row[3])) for row in rows})
+        return versions
+
+    def load_feature_state(self, player_id: str, season: int) -> dict[str, Any] | None:
+        row = self._connection().execute(
+            "SELECT payload FROM feature_states WHERE player_id = ? AND season = ?",
+            (str(player_id), int(season)),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_feature_states(self, season: int, payloads: dict[str, dict[str, Any]]) -> None:
+        updated_at = time.time()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO feature_states (player_id, season, updated_at, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (str(player_id), int(season), updated_at, json.dumps(payload, default=_json_default))
+                    for player_id, payload in payloads.items()
+                ],
+            )
+
+
+@lru_cache(maxsize=1)
+def get_game_log_store() -> GameLogStore:
+    return GameLogStore(settings.game_log_store_path)
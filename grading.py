@@ -0,0 +1,112 @@
+"""
+Box-score grading engine.
+Pulls one league-wide PlayerGameLogs set per game date and indexes it by
+(player_id, date) and (normalized name, date), so grading a night of tracked
+picks costs one or two upstream calls instead of a season of logs per player.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+from nba_api.stats.endpoints import playergamelogs
+
+from nba_scheduler import schedule_nba_call
+from player_directory import normalize_player_name
+from swr_cache import SWRCache
+
+_NBA_API_TIMEOUT = 60
+_OPEN_DATE_TTL = 900  # dates that may still have games in progress are re-pulled every 15 minutes
+_SEASON_TYPES = ("Regular Season", "PlayIn", "Playoffs")
+
+
+@dataclass
+class _DateIndex:
+    game_date: str
+    final: bool
+    by_player_id: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    by_name: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+
+
+def _season_for(game_day: date) -> str:
+    start_year = game_day.year if game_day.month >= 8 else game_day.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def _actuals(row: dict[str, Any]) -> dict[str, float]:
+    return {
+        "actual_points": float(row.get("PTS") or 0.0),
+        "actual_assists": float(row.get("AST") or 0.0),
+        "actual_rebounds": float(row.get("REB") or 0.0),
+    }
+
+
+def _index_ttl(index: _DateIndex) -> float:
+    return float("inf") if index.final else _OPEN_DATE_TTL
+
+
+class BoxScoreGrader:
+    def __init__(self) -> None:
+        self._cache = SWRCache("grading.box_scores", ttl=_OPEN_DATE_TTL, max_stale=0, ttl_for=_index_ttl)
+
+    def _load_date(self, game_date: str) -> _DateIndex:
+        game_day = date.fromisoformat(game_date)
+        api_date = game_day.strftime("%m/%d/%Y")
+        rows: list[dict[str, Any]] = []
+        for season_type in _SEASON_TYPES:
+            frame = schedule_nba_call(
+                "PlayerGameLogs",
+                lambda season_type=season_type: playergamelogs.PlayerGameLogs(
+                    season_nullable=_season_for(game_day),
+                    season_type_nullable=season_type,
+                    date_from_nullable=api_date,
+                    date_to_nullable=api_date,
+                    timeout=_NBA_API_TIMEOUT,
+                ).get_data_frames()[0],
+            )
+            if not frame.empty:
+                rows = frame.to_dict(orient="records")
+                break
+
+        # Late West-coast games finish after midnight UTC, so only dates two days back are final.
+        index = _DateIndex(game_date=game_date, final=game_day <= datetime.now().date() - timedelta(days=2))
+        for row in rows:
+            matchup = str(row.get("MATCHUP", ""))
+            entry = {
+                "opponent_abbr": matchup.split()[-1].upper() if matchup else "",
+                **_actuals(row),
+            }
+            index.by_player_id.setdefault(str(row.get("PLAYER_ID")), []).append(entry)
+            index.by_name.setdefault(normalize_player_name(row.get("PLAYER_NAME", "")), []).append(entry)
+        return index
+
+    def date_index(self, game_date: str) -> _DateIndex:
+        return self._cache.get(game_date, lambda: self._load_date(game_date))
+
+    def lookup(
+        self,
+        game_date: str,
+        *,
+        player_id: str | int | None = None,
+        player_name: str | None = None,
+        opponent_abbr: str | None = None,
+    ) -> dict[str, float] | None:
+        """Actual points/assists/rebounds for one player on an ISO game date, or None if they did not play."""
+        index = self.date_index(game_date)
+        matches = index.by_player_id.get(str(player_id)) if player_id else None
+        if not matches and player_name:
+            matches = index.by_name.get(normalize_player_name(player_name))
+        if not matches:
+            return None
+        opponent = str(opponent_abbr or "").strip().upper()
+        for entry in matches:
+            if not opponent or not entry["opponent_abbr"] or entry["opponent_abbr"] == opponent:
+                return {key: value for key, value in entry.items() if key.startswith("actual_")}
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_box_score_grader() -> BoxScoreGrader:
+    return BoxScoreGrader()
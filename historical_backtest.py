@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import itertools
-import warnings
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
@@ -9,9 +8,9 @@ from typing import Any
 
 import pandas as pd
 
+from feature_store import get_feature_store
 from features import build_feature_row
-from modeling import load_predictor_bundle
-from train_models import _build_features
+from modeling import load_predictor_bundle, on_bundle_swap
 
 
 DATASET_PATH = Path("data/player_game_logs.csv")
@@ -57,13 +56,15 @@ class HistoricalBacktestOverview:
     available_dates: list[str]
 
 
-def _load_dataset() -> pd.DataFrame:
+def _feature_store():
     if not DATASET_PATH.exists():
         raise FileNotFoundError(f"Historical dataset not found at {DATASET_PATH}.")
-    frame = pd.read_csv(DATASET_PATH)
-    frame["game_date"] = pd.to_datetime(frame["game_date"], errors="coerce")
-    frame = frame.dropna(subset=["game_date"]).copy()
-    return frame
+    return get_feature_store(DATASET_PATH)
+
+
+def _load_feature_range(start_date: Any, end_date: Any) -> pd.DataFrame:
+    """Engineered rows with raw game metadata for an inclusive date range, read from the feature store."""
+    return _feature_store().load(start_date, end_date, with_metadata=True)
 
 
 def _combo_actuals(frame: pd.DataFrame) -> pd.DataFrame:
@@ -77,18 +78,10 @@ def _combo_actuals(frame: pd.DataFrame) -> pd.DataFrame:
 
 @lru_cache(maxsize=1)
 def get_historical_backtest_overview() -> HistoricalBacktestOverview:
-    frame = _load_dataset()
-    unique_dates = (
-        frame["game_date"]
-        .dropna()
-        .dt.date
-        .drop_duplicates()
-        .sort_values()
-        .tolist()
-    )
-    available_dates = [value.isoformat() for value in unique_dates[-10:]]
-    min_date = unique_dates[0].isoformat() if unique_dates else None
-    max_date = unique_dates[-1].isoformat() if unique_dates else None
+    manifest = _feature_store().manifest()
+    available_dates = list(manifest["target_rows_by_date"])[-10:]
+    min_date = manifest["min_date"]
+    max_date = manifest["max_date"]
     return HistoricalBacktestOverview(
         min_date=min_date,
         max_date=max_date,
@@ -98,20 +91,9 @@ def get_historical_backtest_overview() -> HistoricalBacktestOverview:
 
 @lru_cache(maxsize=16)
 def run_historical_backtest(target_date: str) -> HistoricalBacktestResult:
-    raw_frame = _load_dataset()
-    min_date = raw_frame["game_date"].min()
-    max_date = raw_frame["game_date"].max()
-    ordered_raw = raw_frame.sort_values(["player_id", "game_date"]).reset_index(drop=True)
-    feature_frame = _build_features(raw_frame).reset_index(drop=True)
-    metadata_columns = [
-        column
-        for column in ["game_id", "player_name", "team_abbr", "opponent_abbr", "minutes", "home", "rest_days", "is_back_to_back"]
-        if column in ordered_raw.columns
-    ]
-    feature_frame = pd.concat([ordered_raw[metadata_columns], feature_frame], axis=1)
-    feature_frame = feature_frame.loc[:, ~feature_frame.columns.duplicated()]
-    feature_frame["game_date"] = pd.to_datetime(feature_frame["game_date"], errors="coerce")
-    feature_frame = feature_frame.dropna(subset=["game_date"]).copy()
+    manifest = _feature_store().manifest()
+    min_date = pd.to_datetime(manifest["min_date"])
+    max_date = pd.to_datetime(manifest["max_date"])
 
     requested_date = pd.to_datetime(target_date, errors="coerce")
     if pd.isna(requested_date):
@@ -126,7 +108,7 @@ def run_historical_backtest(target_date: str) -> HistoricalBacktestResult:
             player_rows=[],
         )
 
-    day_frame = feature_frame[feature_frame["game_date"].dt.date == requested_date.date()].copy()
+    day_frame = _load_feature_range(requested_date, requested_date)
     if day_frame.empty:
         return HistoricalBacktestResult(
             target_date=requested_date.date().isoformat(),
@@ -141,11 +123,8 @@ def run_historical_backtest(target_date: str) -> HistoricalBacktestResult:
 
     bundle = load_predictor_bundle()
     predictions_by_target: dict[str, pd.Series] = {}
-    for target, spec in bundle.specs.items():
-        frame = day_frame.reindex(columns=spec.feature_names or [], fill_value=0.0)
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
-            predictions_by_target[target] = pd.Series(bundle.models[target].predict(frame), index=day_frame.index)
+    for target in bundle.specs:
+        predictions_by_target[target] = pd.Series(bundle.predict_frame(target, day_frame), index=day_frame.index)
 
     results = day_frame.copy()
     results["pred_points"] = predictions_by_target["points"].astype(float).round(1)
@@ -254,24 +233,9 @@ def run_historical_backtest(target_date: str) -> HistoricalBacktestResult:
 
 def run_batch_backtest(start_date: str, end_date: str) -> BatchBacktestResult:
     """Run predictions across all game dates in a range and aggregate accuracy."""
-    raw_frame = _load_dataset()
-    ordered_raw = raw_frame.sort_values(["player_id", "game_date"]).reset_index(drop=True)
-    feature_frame = _build_features(raw_frame).reset_index(drop=True)
-    metadata_columns = [
-        c for c in ["game_id", "player_name", "team_abbr", "opponent_abbr", "minutes", "home", "rest_days", "is_back_to_back"]
-        if c in ordered_raw.columns
-    ]
-    feature_frame = pd.concat([ordered_raw[metadata_columns], feature_frame], axis=1)
-    feature_frame = feature_frame.loc[:, ~feature_frame.columns.duplicated()]
-    feature_frame["game_date"] = pd.to_datetime(feature_frame["game_date"], errors="coerce")
-    feature_frame = feature_frame.dropna(subset=["game_date"]).copy()
-
     start = pd.to_datetime(start_date)
     end = pd.to_datetime(end_date)
-    range_frame = feature_frame[
-        (feature_frame["game_date"].dt.date >= start.date()) &
-        (feature_frame["game_date"].dt.date <= end.date())
-    ].copy()
+    range_frame = _load_feature_range(start, end)
 
     if range_frame.empty:
         return BatchBacktestResult(
@@ -281,9 +245,8 @@ def run_batch_backtest(start_date: str, end_date: str) -> BatchBacktestResult:
         )
 
     bundle = load_predictor_bundle()
-    for target, spec in bundle.specs.items():
-        frame = range_frame.reindex(columns=spec.feature_names or [], fill_value=0.0)
-        range_frame[f"pred_{target}"] = bundle.models[target].predict(frame)
+    for target in bundle.specs:
+        range_frame[f"pred_{target}"] = bundle.predict_frame(target, range_frame)
 
     range_frame = _combo_actuals(range_frame)
     range_frame["pred_points_rebounds"] = range_frame["pred_points"] + range_frame["pred_rebounds"]
@@ -365,34 +328,16 @@ def run_discrepancy_parlay_sim(
     A pick hits when actual > rolling-10 line.
     A parlay wins when every pick hits.
     """
-    raw_frame = _load_dataset()
-    ordered_raw = raw_frame.sort_values(["player_id", "game_date"]).reset_index(drop=True)
-    feature_frame = _build_features(raw_frame).reset_index(drop=True)
-    metadata_columns = [
-        c for c in ["game_id", "player_name", "team_abbr", "opponent_abbr", "minutes"]
-        if c in ordered_raw.columns
-    ]
-    feature_frame = pd.concat([ordered_raw[metadata_columns], feature_frame], axis=1)
-    feature_frame = feature_frame.loc[:, ~feature_frame.columns.duplicated()]
-    feature_frame["game_date"] = pd.to_datetime(feature_frame["game_date"], errors="coerce")
-    feature_frame = feature_frame.dropna(subset=["game_date"]).copy()
-
     start = pd.to_datetime(start_date)
     end = pd.to_datetime(end_date)
-    range_frame = feature_frame[
-        (feature_frame["game_date"].dt.date >= start.date()) &
-        (feature_frame["game_date"].dt.date <= end.date())
-    ].copy()
+    range_frame = _load_feature_range(start, end)
 
     if range_frame.empty:
         return {"error": "No data in range.", "picks": [], "parlay_results": []}
 
     bundle = load_predictor_bundle()
-    for target, spec in bundle.specs.items():
-        frame = range_frame.reindex(columns=spec.feature_names or [], fill_value=0.0)
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
-            range_frame[f"pred_{target}"] = bundle.models[target].predict(frame)
+    for target in bundle.specs:
+        range_frame[f"pred_{target}"] = bundle.predict_frame(target, range_frame)
 
     # Build individual discrepancy picks
     picks: list[dict[str, Any]] = []
@@ -470,3 +415,7 @@ def run_discrepancy_parlay_sim(
         "picks": sorted(picks, key=lambda p: (p["date"], -p["edge"])),
         "parlay_results": parlay_results,
     }
+
+
+# Cached results were scored by the previous models.
+on_bundle_swap(lambda old_bundle, new_bundle: run_historical_backtest.cache_clear())
@@ -0,0 +1,142 @@
+"""
+Record/replay HTTP layer for every upstream provider.
+HTTP_MODE=record saves each live response under HTTP_FIXTURES_DIR;
+HTTP_MODE=replay serves those fixtures without touching the network, with
+optional per-request latency and random connection errors so board builds,
+grading and backtests can be profiled repeatably offline. HTTP_MODE=live
+(the default) leaves requests untouched.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import settings
+
+# Bodies are stored decoded, so transport headers from the original response no longer apply.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+# Credentials never reach a fixture file, so fixtures can be shared and replay with any key.
+_SECRET_HEADERS = {"set-cookie", "cookie", "authorization"}
+_SECRET_PARAMS = {"apikey", "key", "token"}
+
+
+def _canonical_url(url: str) -> str:
+    """Sorted query with secret params (apiKey, key, token) stripped; used for both the fixture hash and the stored url."""
+    parts = urlsplit(url)
+    params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in _SECRET_PARAMS]
+    query = urlencode(sorted(params))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+def fixture_path(method: str, url: str, body: bytes | str | None = None) -> Path:
+    """Fixture file for a request: <fixtures>/<host>/<sha1 of method, url and body>.json."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    canonical = _canonical_url(url)
+    digest = hashlib.sha1(f"{method.upper()} {canonical}\n".encode("utf-8") + (body or b"")).hexdigest()
+    host = urlsplit(canonical).netloc.replace(":", "_") or "local"
+    return Path(settings.http_fixtures_dir) / host / f"{digest}.json"
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    def __init__(self, mode: str, latency_ms: float = 0.0, error_rate: float = 0.0) -> None:
+        super().__init__()
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        path = fixture_path(request.method or "GET", request.url or "", request.body)
+        if self.mode == "replay":
+            return self._replay(request, path)
+        response = super().send(request, **kwargs)
+        if self.mode == "record":
+            self._record(response, path)
+        return response
+
+    def _record(self, response: requests.Response, path: Path) -> None:
+        content = response.content
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        fixture = {
+            "method": response.request.method,
+            "url": _canonical_url(response.request.url or ""),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS | _SECRET_HEADERS},
+            "recorded_at": time.time(),
+            **body,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(fixture, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _replay(self, request: requests.PreparedRequest, path: Path) -> requests.Response:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        if self.error_rate and random.random() < self.error_rate:
+            raise requests.ConnectionError(f"Injected replay error for {request.method} {request.url}", request=request)
+        if not path.exists():
+            raise requests.ConnectionError(f"No recorded fixture for {request.method} {request.url}", request=request)
+
+        fixture = json.loads(path.read_text(encoding="utf-8"))
+        response = requests.Response()
+        response.status_code = int(fixture["status"])
+        response.reason = fixture.get("reason", "")
+        response.headers = CaseInsensitiveDict(fixture.get("headers") or {})
+        if "base64" in fixture:
+            response._content = base64.b64decode(fixture["base64"])
+        else:
+            response._content = fixture.get("text", "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url or ""
+        response.request = request
+        return response
+
+
+def build_session() -> requests.Session:
+    """A requests.Session that records or replays according to HTTP_MODE."""
+    session = requests.Session()
+    mode = settings.http_mode
+    if mode in {"record", "replay"}:
+        adapter = RecordReplayAdapter(
+            mode,
+            latency_ms=settings.http_replay_latency_ms,
+            error_rate=settings.http_replay_error_rate,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    elif mode != "live":
+        print(f"Unknown HTTP_MODE {mode!r}; using live requests.")
+    return session
+
+
+_shared_session: requests.Session | None = None
+
+
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    """Drop-in for requests.get that goes through the record/replay session."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = build_session()
+    return _shared_session.get(url, **kwargs)
+
+
+def install_nba_api_session() -> None:
+    """Route nba_api's stats.nba.com requests through the record/replay session."""
+    from nba_api.library.http import NBAHTTP
+
+    NBAHTTP.set_session(build_session())
@@ -1,15 +1,18 @@
 """
 ESPN free injury report client.
 Endpoint: https://site.api.espn.com/apis/site/v2/sports/basketball/nba/injuries
-No API key required. Cached for 1 hour per server session.
+No API key required. Cached for 1 hour per server session, served stale
+for up to 6 more hours while a background refresh runs.
 """
 from __future__ import annotations
 
-import threading
-import time
-import requests
+from typing import Callable
+
+from http_replay import http_get
+from swr_cache import SWRCache
 
 _CACHE_TTL = 3600  # seconds
+_MAX_STALE = 6 * 3600
 
 # ESPN uses different abbreviations than nba_api in a few cases
 _ESPN_TO_NBA: dict[str, str] = {
@@ -24,9 +27,14 @@ _ESPN_TO_NBA: dict[str, str] = {
 _OUT_STATUSES = {"out", "doubtful"}
 _QUESTIONABLE_STATUSES = {"questionable", "probable", "day-to-day"}
 
-_cache: dict[str, list[dict]] = {}
-_cache_time: float = 0.0
-_cache_lock = threading.Lock()
+_report_cache = SWRCache("espn.injury_report", ttl=_CACHE_TTL, max_stale=_MAX_STALE)
+_report_listeners: list[Callable[[], None]] = []
+_last_report: dict[str, list[dict]] | None = None
+
+
+def on_injury_report_change(callback: Callable[[], None]) -> None:
+    """Call callback() whenever a refresh brings back a report that differs from the previous one."""
+    _report_listeners.append(callback)
 
 
 def _normalize_abbr(espn_abbr: str) -> str:
@@ -39,53 +47,60 @@ def fetch_injury_report() -> dict[str, list[dict]]:
     Returns {team_abbr: [{"player_name", "status", "description"}]}
     Cached for 1 hour. Returns last known data on fetch error.
     """
-    global _cache, _cache_time
-    now = time.time()
-    with _cache_lock:
-        if _cache and (now - _cache_time) < _CACHE_TTL:
-            return _cache
-
     try:
-        resp = requests.get(
-            "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/injuries",
-            timeout=10,
-            headers={"User-Agent": "Mozilla/5.0"},
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        result: dict[str, list[dict]] = {}
-        for team_entry in data.get("injuries", []):
-            team = team_entry.get("team", {})
-            raw_abbr = team.get("abbreviation", "")
-            if not raw_abbr:
-                continue
-            team_abbr = _normalize_abbr(raw_abbr)
-            players = []
-            for inj in team_entry.get("injuries", []):
-                athlete = inj.get("athlete", {})
-                name = athlete.get("displayName", "").strip()
-                status = inj.get("status", "").strip()
-                description = inj.get("longComment", "") or inj.get("shortComment", "") or ""
-                if name:
-                    players.append({
-                        "player_name": name,
-                        "status": status,
-                        "status_key": status.lower().replace("-", " "),
-                        "description": description.strip(),
-                        "is_out": status.lower().replace("-", " ") in _OUT_STATUSES,
-                        "is_questionable": status.lower().replace("-", " ") in _QUESTIONABLE_STATUSES,
-                    })
-            result[team_abbr] = players
-
-        with _cache_lock:
-            _cache = result
-            _cache_time = now
-        return result
-
+        return _report_cache.get("nba", _fetch_injury_report)
     except Exception as exc:
-        with _cache_lock:
-            return _cache
+        print(f"ESPN injury report fetch error: {exc}")
+        return {}
+
+
+def _fetch_injury_report() -> dict[str, list[dict]]:
+    resp = http_get(
+        "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/injuries",
+        timeout=10,
+        headers={"User-Agent": "Mozilla/5.0"},
+    )
+    resp.raise_for_status()
+    data = resp.json()
+
+    result: dict[str, list[dict]] = {}
+    for team_entry in data.get("injuries", []):
+        team = team_entry.get("team", {})
+        raw_abbr = team.get("abbreviation", "")
+        if not raw_abbr:
+            continue
+        team_abbr = _normalize_abbr(raw_abbr)
+        players = []
+        for inj in team_entry.get("injuries", []):
+            athlete = inj.get("athlete", {})
+            name = athlete.get("displayName", "").strip()
+            status = inj.get("status", "").strip()
+            description = inj.get("longComment", "") or inj.get("shortComment", "") or ""
+            if name:
+                players.append({
+                    "player_name": name,
+                    "status": status,
+                    "status_key": status.lower().replace("-", " "),
+                    "description": description.strip(),
+                    "is_out": status.lower().replace("-", " ") in _OUT_STATUSES,
+                    "is_questionable": status.lower().replace("-", " ") in _QUESTIONABLE_STATUSES,
+                })
+        result[team_abbr] = players
+    _note_report(result)
+    return result
+
+
+def _note_report(report: dict[str, list[dict]]) -> None:
+    global _last_report
+    changed = _last_report is not None and report != _last_report
+    _last_report = report
+    if not changed:
+        return
+    for callback in list(_report_listeners):
+        try:
+            callback()
+        except Exception as exc:
+            print(f"Injury report listener error: {exc}")
 
 
 def get_team_injuries(team_abbr: str) -> list[dict]:
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-from datetime import datetime
-from functools import lru_cache
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
-from api_client import _season_player_dashboard, _recent_player_dashboard
+from api_client import _dashboard_cache, _season_player_dashboard, _recent_player_dashboard
 from config import settings
+from nba_scheduler import schedule_nba_call
+from player_directory import get_player_directory
+from swr_cache import SWRCache
 
 try:
     from injury_client import fetch_injury_report, get_out_player_names, get_player_status
@@ -31,6 +36,80 @@ except ImportError:  # pragma: no cover
     nba_static_teams = None
 
 
+_CONTEXT_TTL = 6 * 3600
+_CONTEXT_MAX_STALE = 48 * 3600
+# While stats.nba.com is down, a failed dashboard load is retried at most this often instead of on every prediction.
+_CONTEXT_ERROR_TTL = 300
+_DATASET_PATH = Path("data/player_game_logs.csv")
+
+# Team/player dashboards and dataset team trends, versioned and refreshed in the background.
+_context_cache = SWRCache(
+    "live_context.dashboards",
+    ttl=_CONTEXT_TTL,
+    max_stale=_CONTEXT_MAX_STALE,
+    error_ttl=_CONTEXT_ERROR_TTL,
+)
+_refresher_lock = threading.Lock()
+_refresher_started = False
+
+
+def context_version(season_start_year: int | None = None) -> str:
+    """
+    Stamp for the dashboard refreshes a context is built from:
+    "<oldest refresh, UTC>-<digest of every component version>".
+    """
+    season = settings.season_start_year if season_start_year is None else int(season_start_year)
+    stamps = [
+        _context_cache.version(("team_context", season)),
+        _context_cache.version(("player_context", season)),
+        _context_cache.version(("team_trends", season)),
+        _dashboard_cache.version(("season", season)),
+        _dashboard_cache.version(("recent", season, 3)),
+        # get_team_rotation's recent minutes and usage.
+        _dashboard_cache.version(("recent", season, 10)),
+    ]
+    loaded = [stamp for stamp in stamps if stamp is not None]
+    if not loaded:
+        return "unloaded"
+    refreshed_at = datetime.fromtimestamp(min(stamp[1] for stamp in loaded), tz=timezone.utc)
+    digest = hashlib.sha1(repr(stamps).encode("utf-8")).hexdigest()[:8]
+    return f"{refreshed_at:%Y%m%dT%H%MZ}-{digest}"
+
+
+def refresh_context_caches() -> int:
+    """Queue background reloads of every loaded dashboard; readers keep the current version meanwhile."""
+    return _context_cache.refresh_all() + _dashboard_cache.refresh_all()
+
+
+def _dataset_mtime() -> float | None:
+    try:
+        return _DATASET_PATH.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _context_refresh_loop(interval_seconds: int) -> None:
+    last_mtime = _dataset_mtime()
+    while True:
+        time.sleep(interval_seconds)
+        mtime = _dataset_mtime()
+        if mtime != last_mtime:
+            # The nightly ingest rewrote the dataset: pull fresh dashboards alongside it.
+            last_mtime = mtime
+            refresh_context_caches()
+
+
+def start_context_refresher(interval_seconds: int = 600) -> None:
+    global _refresher_started
+
+    with _refresher_lock:
+        if _refresher_started:
+            return
+        _refresher_started = True
+
+    threading.Thread(target=_context_refresh_loop, args=(interval_seconds,), daemon=True).start()
+
+
 def _normalize_date(raw_date: str | None) -> datetime | None:
     if not raw_date:
         return None
@@ -43,22 +122,30 @@ def _normalize_date(raw_date: str | None) -> datetime | None:
             return None
 
 
-@lru_cache(maxsize=8)
 def _team_context_by_abbr(season_start_year: int) -> dict[str, dict[str, float]]:
+    try:
+        return _context_cache.get(
+            ("team_context", int(season_start_year)),
+            lambda: _load_team_context(season_start_year),
+        )
+    except Exception:
+        return {}
+
+
+def _load_team_context(season_start_year: int) -> dict[str, dict[str, float]]:
     if leaguedashteamstats is None:
         return {}
 
     season = f"{season_start_year}-{str(season_start_year + 1)[-2:]}"
-    try:
-        endpoint = leaguedashteamstats.LeagueDashTeamStats(
+    frame = schedule_nba_call(
+        "LeagueDashTeamStats",
+        lambda: leaguedashteamstats.LeagueDashTeamStats(
             season=season,
             season_type_all_star="Regular Season",
             measure_type_detailed_defense="Advanced",
             per_mode_detailed="PerGame",
-        )
-        frame = endpoint.get_data_frames()[0]
-    except Exception:
-        return {}
+        ).get_data_frames()[0],
+    )
 
     team_id_to_abbr = {}
     if nba_static_teams is not None:
@@ -80,22 +167,30 @@ def _team_context_by_abbr(season_start_year: int) -> dict[str, dict[str, float]]
     return context
 
 
-@lru_cache(maxsize=8)
 def _player_context_by_id(season_start_year: int) -> dict[int, dict[str, float]]:
+    try:
+        return _context_cache.get(
+            ("player_context", int(season_start_year)),
+            lambda: _load_player_context(season_start_year),
+        )
+    except Exception:
+        return {}
+
+
+def _load_player_context(season_start_year: int) -> dict[int, dict[str, float]]:
     if leaguedashplayerstats is None:
         return {}
 
     season = f"{season_start_year}-{str(season_start_year + 1)[-2:]}"
-    try:
-        endpoint = leaguedashplayerstats.LeagueDashPlayerStats(
+    frame = schedule_nba_call(
+        "LeagueDashPlayerStats",
+        lambda: leaguedashplayerstats.LeagueDashPlayerStats(
             season=season,
             season_type_all_star="Regular Season",
             measure_type_detailed_defense="Advanced",
             per_mode_detailed="PerGame",
-        )
-        frame = endpoint.get_data_frames()[0]
-    except Exception:
-        return {}
+        ).get_data_frames()[0],
+    )
 
     context = {}
     for _, row in frame.iterrows():
@@ -112,20 +207,26 @@ def _player_context_by_id(season_start_year: int) -> dict[int, dict[str, float]]
     return context
 
 
-@lru_cache(maxsize=2)
 def _team_trends_by_abbr(season_start_year: int) -> dict[str, dict[str, float]]:
-    dataset_path = Path("data/player_game_logs.csv")
-    if not dataset_path.exists():
-        return {}
-
     try:
-        frame = pd.read_csv(
-            dataset_path,
-            usecols=["season", "game_id", "game_date", "team_abbr", "opponent_abbr", "points", "assists", "rebounds", "win"],
+        return _context_cache.get(
+            ("team_trends", int(season_start_year)),
+            lambda: _load_team_trends(season_start_year),
         )
     except Exception:
         return {}
 
+
+def _load_team_trends(season_start_year: int) -> dict[str, dict[str, float]]:
+    dataset_path = _DATASET_PATH
+    if not dataset_path.exists():
+        return {}
+
+    frame = pd.read_csv(
+        dataset_path,
+        usecols=["season", "game_id", "game_date", "team_abbr", "opponent_abbr", "points", "assists", "rebounds", "win"],
+    )
+
     season = f"{season_start_year}-{str(season_start_year + 1)[-2:]}"
     frame = frame[frame["season"] == season].copy()
     if frame.empty:
@@ -209,11 +310,9 @@ def _compute_teammate_opportunity(
             try:
                 out_names = get_out_player_names(team_abbr)
                 if out_names:
-                    from nba_api.stats.static import players as _nba_players
-                    static_by_id = {int(p["id"]): p["full_name"].lower() for p in _nba_players.get_players()}
+                    directory = get_player_directory()
                     for r in teammates:
-                        pid = int(r["PLAYER_ID"])
-                        name = static_by_id.get(pid, "").lower()
+                        name = directory.full_name(r["PLAYER_ID"]).lower()
                         if name and any(out in name or name in out for out in out_names):
                             injury_missing_minutes += float(r.get("MIN", 0))
                     used_injury_data = True
@@ -334,6 +433,7 @@ def build_upcoming_context(
 
     # Pass opponent abbreviation through so build_feature_row can filter matchup history
     context["opponent_abbr"] = opponent_abbr
+    context["context_version"] = context_version(settings.season_start_year)
 
     # Teammate availability: detect when key rotation players are missing
     team_abbr_for_opportunity = str(latest_team.get("code", "")).upper() if game_logs else ""
@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import json
 from functools import lru_cache
-from pathlib import Path
 from typing import Any
 
-from config import settings
-from modeling import load_predictor_bundle
+from modeling import load_predictor_bundle, on_bundle_swap
 
 
 GROUP_PATTERNS = {
@@ -57,13 +54,6 @@ GROUP_PATTERNS = {
 }
 
 
-def _load_metadata() -> dict[str, Any]:
-    metadata_path = Path(settings.model_dir) / "model_metadata.json"
-    if not metadata_path.exists():
-        return {"targets": {}}
-    return json.loads(metadata_path.read_text())
-
-
 def _group_name(feature_name: str) -> str:
     for group_name, patterns in GROUP_PATTERNS.items():
         if any(pattern in feature_name for pattern in patterns):
@@ -74,7 +64,8 @@ def _group_name(feature_name: str) -> str:
 @lru_cache(maxsize=1)
 def get_model_insights() -> dict[str, Any]:
     bundle = load_predictor_bundle()
-    metadata = _load_metadata()
+    # The bundle's own metadata, not the file on disk, which a retrain may already have replaced.
+    metadata = bundle.metadata or {"targets": {}}
     targets: list[dict[str, Any]] = []
 
     for target_name in ("points", "assists", "rebounds"):
@@ -131,3 +122,7 @@ def get_model_insights() -> dict[str, Any]:
         )
 
     return {"targets": targets}
+
+
+# Importances and metrics describe the models that were just swapped out.
+on_bundle_swap(lambda old_bundle, new_bundle: get_model_insights.cache_clear())
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import math
 import pickle
+import threading
+import time
 import warnings
-from dataclasses import dataclass
-from functools import lru_cache
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
+import numpy as np
 import pandas as pd
 
 from config import settings
-from features import build_feature_row, build_legacy_feature_frame
+from features import build_feature_matrix, build_feature_row, build_legacy_feature_frame
 
 
 @dataclass(frozen=True)
@@ -21,13 +26,219 @@ class ModelSpec:
     feature_names: list[str] | None = None
 
 
+@dataclass(frozen=True)
+class NativeRegressor:
+    """
+    The fitted SimpleImputer medians and LightGBM booster of a saved
+    Pipeline, applied straight to a float64 feature matrix.
+    """
+    booster: Any
+    fill_values: np.ndarray
+    kept_columns: np.ndarray | None
+
+    @classmethod
+    def from_pipeline(cls, model: Any) -> NativeRegressor | None:
+        steps = getattr(model, "named_steps", None)
+        if not steps or list(steps) != ["imputer", "regressor"]:
+            return None
+        booster = getattr(steps["regressor"], "booster_", None)
+        imputation = _median_imputation(steps["imputer"])
+        if booster is None or imputation is None:
+            return None
+        return cls(booster, *imputation)
+
+    def export(self, booster_file: str) -> dict[str, Any]:
+        """model_metadata.json entry for this model; the caller saves the booster to booster_file."""
+        return {"booster_file": booster_file, **_export_imputation(self.fill_values, self.kept_columns)}
+
+    @classmethod
+    def from_export(cls, model_dir: Path, payload: dict[str, Any]) -> NativeRegressor:
+        booster = _timed_load(model_dir / payload["booster_file"], _load_booster)
+        return cls(booster, *_import_imputation(payload))
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        """Predictions for a rows x features float64 matrix; NaNs are imputed in place."""
+        return self.booster.predict(_impute(matrix, self.fill_values, self.kept_columns))
+
+
+@dataclass(frozen=True)
+class JointRegressor:
+    """
+    The joint-mode model (train_models.py --joint): one median imputer shared
+    by a LightGBM booster per target, all fit on the same feature list, so a
+    prediction builds and imputes the feature matrix once for every target.
+    """
+    feature_names: list[str]
+    boosters: dict[str, Any]
+    fill_values: np.ndarray
+    kept_columns: np.ndarray | None
+
+    @classmethod
+    def from_imputer(cls, imputer: Any, boosters: dict[str, Any], feature_names: list[str]) -> JointRegressor:
+        imputation = _median_imputation(imputer)
+        if imputation is None:
+            raise ValueError("joint models need a fitted median SimpleImputer without indicators")
+        return cls(list(feature_names), dict(boosters), *imputation)
+
+    def predict(self, matrix: np.ndarray, targets: Sequence[str] | None = None) -> dict[str, np.ndarray]:
+        """target -> predictions for a rows x feature_names float64 matrix; NaNs are imputed in place."""
+        matrix = _impute(matrix, self.fill_values, self.kept_columns)
+        return {target: self.boosters[target].predict(matrix) for target in targets or self.boosters}
+
+    def export(self, booster_files: dict[str, str]) -> dict[str, Any]:
+        """model_metadata.json entry for this model; the caller saves each booster to booster_files[target]."""
+        return {"booster_files": dict(booster_files), **_export_imputation(self.fill_values, self.kept_columns)}
+
+    @classmethod
+    def from_export(cls, model_dir: Path, payload: dict[str, Any], feature_names: list[str]) -> JointRegressor:
+        boosters = {target: _timed_load(model_dir / booster_file, _load_booster) for target, booster_file in payload["booster_files"].items()}
+        return cls(list(feature_names), boosters, *_import_imputation(payload))
+
+
+@dataclass(frozen=True)
+class JointTargetModel:
+    """One target of a JointRegressor behind the fitted-Pipeline surface callers use (predict, feature_importances_)."""
+    joint: JointRegressor
+    target: str
+
+    def predict(self, frame: pd.DataFrame) -> np.ndarray:
+        matrix = frame.reindex(columns=self.joint.feature_names, fill_value=0.0).to_numpy(dtype=np.float64, copy=True)
+        return self.joint.predict(matrix, [self.target])[self.target]
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.joint.boosters[self.target].feature_importance()
+
+
+def _median_imputation(imputer: Any) -> tuple[np.ndarray, np.ndarray | None] | None:
+    """(fill values, kept columns) of a fitted median SimpleImputer, or None if it can't be applied as plain fills."""
+    statistics = getattr(imputer, "statistics_", None)
+    if statistics is None or getattr(imputer, "add_indicator", False):
+        return None
+    statistics = np.asarray(statistics, dtype=np.float64)
+    if not (imputer.missing_values is np.nan or (isinstance(imputer.missing_values, float) and np.isnan(imputer.missing_values))):
+        return None
+    # SimpleImputer drops columns that were entirely missing at fit time unless keep_empty_features is set.
+    empty = np.isnan(statistics)
+    kept_columns = None
+    if empty.any() and not getattr(imputer, "keep_empty_features", False):
+        kept_columns = np.flatnonzero(~empty)
+    return np.where(empty, 0.0, statistics), kept_columns
+
+
+def _export_imputation(fill_values: np.ndarray, kept_columns: np.ndarray | None) -> dict[str, Any]:
+    medians = fill_values.tolist()
+    if kept_columns is not None:
+        kept = set(kept_columns.tolist())
+        medians = [value if index in kept else None for index, value in enumerate(medians)]
+    return {"imputer_medians": medians, "drops_empty_features": kept_columns is not None}
+
+
+def _import_imputation(payload: dict[str, Any]) -> tuple[np.ndarray, np.ndarray | None]:
+    medians = np.array([np.nan if value is None else value for value in payload["imputer_medians"]], dtype=np.float64)
+    empty = np.isnan(medians)
+    kept_columns = np.flatnonzero(~empty) if payload.get("drops_empty_features") else None
+    return np.where(empty, 0.0, medians), kept_columns
+
+
+def _impute(matrix: np.ndarray, fill_values: np.ndarray, kept_columns: np.ndarray | None) -> np.ndarray:
+    missing = np.isnan(matrix)
+    if missing.any():
+        matrix[missing] = fill_values[np.nonzero(missing)[1]]
+    return matrix if kept_columns is None else matrix[:, kept_columns]
+
+
+def _load_booster(path: Path) -> Any:
+    import lightgbm
+
+    return lightgbm.Booster(model_file=str(path))
+
+
+def _native_model(target: str, model: Any, feature_names: list[str] | None) -> NativeRegressor | None:
+    """NativeRegressor for a Pipeline, kept only if it reproduces the Pipeline's output exactly."""
+    if not feature_names:
+        return None
+    try:
+        native = NativeRegressor.from_pipeline(model)
+        if native is None:
+            return None
+        probe = np.zeros((3, len(feature_names)), dtype=np.float64)
+        probe[1] = np.nan
+        probe[2] = native.fill_values
+        probe[2, ::3] = np.nan
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+            expected = model.predict(pd.DataFrame(probe, columns=feature_names))
+        if np.array_equal(expected, native.predict(probe.copy())):
+            return native
+        print(f"Native inference disabled for {target}: output differs from the Pipeline.")
+    except Exception as exc:
+        print(f"Native inference error for {target}: {exc}")
+    return None
+
+
+_load_times: dict[str, float] = {}
+
+
+def _timed_load(artifact_path: Path, loader: Callable[[Path], Any]) -> Any:
+    started = time.perf_counter()
+    loaded = loader(artifact_path)
+    elapsed = time.perf_counter() - started
+    _load_times[artifact_path.name] = round(elapsed * 1000.0, 1)
+    print(f"Loaded model artifact {artifact_path.name} in {elapsed * 1000.0:.0f} ms")
+    return loaded
+
+
+def model_load_stats() -> dict[str, float]:
+    """Milliseconds spent loading each model artifact so far in this process."""
+    return dict(_load_times)
+
+
+def _unpickle(artifact_path: Path) -> Any:
+    with open(artifact_path, "rb") as artifact:
+        return pickle.load(artifact)
+
+
+class LazyArtifacts(Mapping):
+    """target -> loaded model; each artifact is loaded on first access, once."""
+
+    def __init__(self, loaders: dict[str, Callable[[], Any]]) -> None:
+        self._loaders = loaders
+        self._loaded: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, target: str) -> Any:
+        if target in self._loaded:
+            return self._loaded[target]
+        loader = self._loaders[target]
+        with self._lock:
+            if target not in self._loaded:
+                self._loaded[target] = loader()
+            return self._loaded[target]
+
+    def __contains__(self, target: object) -> bool:
+        return target in self._loaders
+
+    def __iter__(self):
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+
 @dataclass(frozen=True)
 class PredictorBundle:
     specs: dict[str, ModelSpec]
-    models: dict[str, Any]
+    models: Mapping[str, Any]
     auxiliary_specs: dict[str, ModelSpec]
-    auxiliary_models: dict[str, Any]
+    auxiliary_models: Mapping[str, Any]
     metadata: dict[str, Any]
+    # Targets whose Pipeline can run as imputer medians + raw booster (None where it can't); see NativeRegressor.
+    native_models: Mapping[str, NativeRegressor | None] = field(default_factory=dict)
+    # Hash of model_metadata.json; prediction caches are keyed on it.
+    version: str = "unversioned"
+    # Set when the metadata declares mode "joint": loads the JointRegressor serving every target.
+    joint_model: Callable[[], JointRegressor] | None = None
 
     def _error_band_for_target(self, target: str) -> float:
         metrics = self.metadata.get("targets", {}).get(target, {}).get("metrics", {})
@@ -80,42 +291,101 @@ class PredictorBundle:
             }
         return summary
 
-    def predict(self, game_logs: list[dict[str, Any]], upcoming_context: dict[str, Any] | None = None) -> dict[str, float]:
-        rich_feature_row = build_feature_row(game_logs, upcoming_context=upcoming_context)
-        rich_frame = pd.DataFrame([rich_feature_row])
-        legacy_frame = build_legacy_feature_frame(game_logs)
-        predictions: dict[str, float] = {}
+    def predict(
+        self,
+        game_logs: list[dict[str, Any]],
+        upcoming_context: dict[str, Any] | None = None,
+        feature_row: dict[str, float] | None = None,
+    ) -> dict[str, float]:
+        return self.predict_batch([game_logs], [upcoming_context], [feature_row])[0]
+
+    def predict_frame(self, target: str, frame: pd.DataFrame) -> np.ndarray:
+        """Bulk scoring of feature-store rows for one target (backtests, accuracy test)."""
+        spec = self.specs[target] if target in self.specs else self.auxiliary_specs[target]
+        if self.joint_model is not None:
+            joint = self.joint_model()
+            matrix = frame.reindex(columns=joint.feature_names, fill_value=0.0).to_numpy(dtype=np.float64, copy=True)
+            return joint.predict(matrix, [target])[target]
+        native = self.native_models.get(target)
+        if native is not None and spec.feature_names:
+            return native.predict(frame.reindex(columns=spec.feature_names, fill_value=0.0).to_numpy(dtype=np.float64, copy=True))
+        models = self.models if target in self.specs else self.auxiliary_models
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+            return models[target].predict(frame.reindex(columns=spec.feature_names or [], fill_value=0.0))
+
+    def predict_batch(
+        self,
+        game_logs_list: Sequence[Sequence[dict[str, Any]]],
+        upcoming_contexts: Sequence[dict[str, Any] | None] | None = None,
+        feature_rows: Sequence[dict[str, float] | None] | None = None,
+    ) -> list[dict[str, float]]:
+        """
+        predict() for many players with one model call per target over all of
+        them, which amortizes the sklearn/LightGBM per-call overhead.
+        """
+        count = len(game_logs_list)
+        upcoming_contexts = upcoming_contexts or [None] * count
+        feature_rows = feature_rows or [None] * count
+        rich_feature_rows = [
+            feature_row if feature_row is not None else build_feature_row(game_logs, upcoming_context=upcoming_context)
+            for game_logs, upcoming_context, feature_row in zip(game_logs_list, upcoming_contexts, feature_rows)
+        ]
+        if not rich_feature_rows:
+            return []
+        legacy_frame = None
 
-        for target, spec in self.specs.items():
-            model = self.models[target]
-            if spec.feature_names:
-                frame = rich_frame.reindex(columns=spec.feature_names, fill_value=0.0)
+        def _run(target: str, models: Mapping[str, Any], feature_names: list[str] | None) -> list[float]:
+            # feature_names None means a legacy model trained on build_legacy_feature_frame.
+            nonlocal legacy_frame
+            native = self.native_models.get(target)
+            if native is not None and feature_names:
+                return native.predict(build_feature_matrix(rich_feature_rows, feature_names)).tolist()
+            if feature_names is not None:
+                frame = pd.DataFrame(build_feature_matrix(rich_feature_rows, feature_names), columns=feature_names)
             else:
+                if legacy_frame is None:
+                    legacy_frame = pd.concat(
+                        [build_legacy_feature_frame(game_logs) for game_logs in game_logs_list],
+                        ignore_index=True,
+                    )
                 frame = legacy_frame
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
-                result = model.predict(frame)
-            predictions[target] = float(result[0])
+                return [float(value) for value in models[target].predict(frame)]
 
-        expected_minutes = float(rich_feature_row.get("projected_minutes", 0.0) or 0.0)
+        model_minutes: list[float] | None = None
         minutes_spec = self.auxiliary_specs.get("minutes")
-        minutes_model = self.auxiliary_models.get("minutes")
-        if minutes_spec and minutes_model:
-            minutes_frame = rich_frame.reindex(columns=minutes_spec.feature_names or [], fill_value=0.0)
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
-                model_minutes = float(minutes_model.predict(minutes_frame)[0])
-            heuristic_minutes = float(rich_feature_row.get("projected_minutes", model_minutes) or model_minutes)
-            expected_minutes = (model_minutes * 0.7) + (heuristic_minutes * 0.3)
-        expected_minutes = max(8.0, min(42.0, expected_minutes))
-        predictions["expected_minutes"] = round(expected_minutes, 1)
-        predictions["minutes_baseline"] = round(float(rich_feature_row.get("projected_minutes", 0.0) or 0.0), 1)
-        predictions["confidence_summary"] = self._build_confidence_summary(
-            rich_feature_row,
-            expected_minutes=expected_minutes,
-        )
+        if self.joint_model is not None:
+            joint = self.joint_model()
+            outputs = joint.predict(build_feature_matrix(rich_feature_rows, joint.feature_names))
+            target_values = {target: outputs[target].tolist() for target in self.specs}
+            if minutes_spec and "minutes" in outputs:
+                model_minutes = outputs["minutes"].tolist()
+        else:
+            target_values = {
+                target: _run(target, self.models, spec.feature_names or None)
+                for target, spec in self.specs.items()
+            }
+            if minutes_spec and "minutes" in self.auxiliary_models:
+                model_minutes = _run("minutes", self.auxiliary_models, minutes_spec.feature_names or [])
 
-        return predictions
+        results = []
+        for index, rich_feature_row in enumerate(rich_feature_rows):
+            predictions = {target: values[index] for target, values in target_values.items()}
+            expected_minutes = float(rich_feature_row.get("projected_minutes", 0.0) or 0.0)
+            if model_minutes is not None:
+                heuristic_minutes = float(rich_feature_row.get("projected_minutes", model_minutes[index]) or model_minutes[index])
+                expected_minutes = (model_minutes[index] * 0.7) + (heuristic_minutes * 0.3)
+            expected_minutes = max(8.0, min(42.0, expected_minutes))
+            predictions["expected_minutes"] = round(expected_minutes, 1)
+            predictions["minutes_baseline"] = round(float(rich_feature_row.get("projected_minutes", 0.0) or 0.0), 1)
+            predictions["confidence_summary"] = self._build_confidence_summary(
+                rich_feature_row,
+                expected_minutes=expected_minutes,
+            )
+            results.append(predictions)
+        return results
 
 
 def _load_metadata(model_dir: Path) -> dict[str, Any] | None:
@@ -125,9 +395,11 @@ def _load_metadata(model_dir: Path) -> dict[str, Any] | None:
     return json.loads(metadata_path.read_text())
 
 
-@lru_cache(maxsize=1)
-def load_predictor_bundle() -> PredictorBundle:
-    model_dir = settings.model_dir
+def _metadata_version(metadata: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(metadata, sort_keys=True).encode("utf-8")).hexdigest()[:12] if metadata else "legacy"
+
+
+def _build_predictor_bundle(model_dir: Path) -> PredictorBundle:
     metadata = _load_metadata(model_dir) or {}
 
     if metadata:
@@ -146,14 +418,6 @@ def load_predictor_bundle() -> PredictorBundle:
             "rebounds": ModelSpec(target="rebounds", artifact_name="model_rebounds.pkl"),
         }
 
-    models = {}
-    for target, spec in specs.items():
-        artifact_path = model_dir / spec.artifact_name
-        if not artifact_path.exists():
-            raise FileNotFoundError(f"Model artifact not found: {artifact_path}")
-        with open(artifact_path, "rb") as artifact:
-            models[target] = pickle.load(artifact)
-
     auxiliary_specs = {
         target: ModelSpec(
             target=target,
@@ -162,13 +426,45 @@ def load_predictor_bundle() -> PredictorBundle:
         )
         for target, payload in metadata.get("auxiliary", {}).items()
     }
-    auxiliary_models = {}
-    for target, spec in auxiliary_specs.items():
-        artifact_path = model_dir / spec.artifact_name
-        if not artifact_path.exists():
-            raise FileNotFoundError(f"Auxiliary model artifact not found: {artifact_path}")
-        with open(artifact_path, "rb") as artifact:
-            auxiliary_models[target] = pickle.load(artifact)
+    if metadata.get("mode") == "joint":
+        return _build_joint_bundle(model_dir, metadata, specs, auxiliary_specs)
+
+    native_exports = {
+        target: payload["native"]
+        for section in ("targets", "auxiliary")
+        for target, payload in metadata.get(section, {}).items()
+        if payload.get("native") and (model_dir / payload["native"]["booster_file"]).exists()
+    }
+    for label, section_specs in (("Model", specs), ("Auxiliary model", auxiliary_specs)):
+        for target, spec in section_specs.items():
+            artifact_path = model_dir / spec.artifact_name
+            if not artifact_path.exists() and target not in native_exports:
+                raise FileNotFoundError(f"{label} artifact not found: {artifact_path}")
+
+    # Nothing is unpickled until a target is first used, so workers that never predict NBA stats never pay for it.
+    def _pipeline_loader(spec: ModelSpec) -> Callable[[], Any]:
+        return lambda: _timed_load(model_dir / spec.artifact_name, _unpickle)
+
+    models = LazyArtifacts({target: _pipeline_loader(spec) for target, spec in specs.items()})
+    auxiliary_models = LazyArtifacts({target: _pipeline_loader(spec) for target, spec in auxiliary_specs.items()})
+
+    def _native_loader(target: str, spec: ModelSpec) -> Callable[[], NativeRegressor | None]:
+        def _load() -> NativeRegressor | None:
+            if not settings.native_inference or not spec.feature_names:
+                return None
+            if target in native_exports:
+                try:
+                    return NativeRegressor.from_export(model_dir, native_exports[target])
+                except Exception as exc:
+                    print(f"Native model load error for {target}: {exc}")
+            pipelines = models if target in specs else auxiliary_models
+            return _native_model(target, pipelines[target], spec.feature_names)
+
+        return _load
+
+    native_models = LazyArtifacts(
+        {target: _native_loader(target, spec) for target, spec in {**specs, **auxiliary_specs}.items()}
+    )
 
     return PredictorBundle(
         specs=specs,
@@ -176,4 +472,147 @@ def load_predictor_bundle() -> PredictorBundle:
         auxiliary_specs=auxiliary_specs,
         auxiliary_models=auxiliary_models,
         metadata=metadata,
+        native_models=native_models,
+        version=_metadata_version(metadata),
+    )
+
+
+def _build_joint_bundle(
+    model_dir: Path,
+    metadata: dict[str, Any],
+    specs: dict[str, ModelSpec],
+    auxiliary_specs: dict[str, ModelSpec],
+) -> PredictorBundle:
+    payload = metadata["joint"]
+    native = payload.get("native")
+    has_export = bool(native) and all((model_dir / booster_file).exists() for booster_file in native["booster_files"].values())
+    artifact_path = model_dir / payload["artifact_name"]
+    if not artifact_path.exists() and not has_export:
+        raise FileNotFoundError(f"Joint model artifact not found: {artifact_path}")
+
+    def _load() -> JointRegressor:
+        if has_export:
+            try:
+                return JointRegressor.from_export(model_dir, native, payload["feature_names"])
+            except Exception as exc:
+                print(f"Joint model load error: {exc}")
+        return _timed_load(artifact_path, _unpickle)
+
+    joint = LazyArtifacts({"joint": _load})
+
+    def _target_loader(target: str) -> Callable[[], JointTargetModel]:
+        return lambda: JointTargetModel(joint["joint"], target)
+
+    return PredictorBundle(
+        specs=specs,
+        models=LazyArtifacts({target: _target_loader(target) for target in specs}),
+        auxiliary_specs=auxiliary_specs,
+        auxiliary_models=LazyArtifacts({target: _target_loader(target) for target in auxiliary_specs}),
+        metadata=metadata,
+        version=_metadata_version(metadata),
+        joint_model=lambda: joint["joint"],
     )
+
+
+_bundle: PredictorBundle | None = None
+_bundle_signature: tuple[int, int] | None = None
+_bundle_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_rejected_signature: tuple[int, int] | None = None
+_last_reload_check = 0.0
+_swap_listeners: list[Callable[[PredictorBundle, PredictorBundle], None]] = []
+
+
+def _metadata_signature(model_dir: Path) -> tuple[int, int] | None:
+    try:
+        stat = (model_dir / "model_metadata.json").stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_predictor_bundle() -> PredictorBundle:
+    """
+    The current bundle. After a retrain rewrites model_metadata.json the new
+    bundle is loaded and checked on a background thread and swapped in; until
+    then callers keep getting the old one, so no request waits on a reload.
+    """
+    global _bundle, _bundle_signature
+    bundle = _bundle
+    if bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                signature = _metadata_signature(settings.model_dir)
+                _bundle = _build_predictor_bundle(settings.model_dir)
+                _bundle_signature = signature
+            return _bundle
+    _check_for_new_models()
+    return bundle
+
+
+def model_version() -> str:
+    return load_predictor_bundle().version
+
+
+def on_bundle_swap(callback: Callable[[PredictorBundle, PredictorBundle], None]) -> None:
+    """Call callback(old_bundle, new_bundle) after each hot reload, e.g. to drop cached predictions."""
+    _swap_listeners.append(callback)
+
+
+def _check_for_new_models() -> None:
+    global _last_reload_check
+    interval = settings.model_reload_check_seconds
+    now = time.monotonic()
+    if interval <= 0 or now - _last_reload_check < interval:
+        return
+    _last_reload_check = now
+    signature = _metadata_signature(settings.model_dir)
+    if signature is None or signature in (_bundle_signature, _rejected_signature):
+        return
+    if not _reload_lock.acquire(blocking=False):
+        return
+    threading.Thread(target=_reload_bundle, args=(signature,), name="model-reload", daemon=True).start()
+
+
+def _canary_check(bundle: PredictorBundle) -> None:
+    """
+    Load every model the prediction path uses and predict a median-imputed
+    canary row, so a broken or half-written retrain never gets swapped in.
+    """
+    spec_groups = (bundle.specs, bundle.auxiliary_specs)
+    if any(not spec.feature_names for specs in spec_groups for spec in specs.values()):
+        # Legacy models need real game logs; loading them is the best check available.
+        for specs, models in ((bundle.specs, bundle.models), (bundle.auxiliary_specs, bundle.auxiliary_models)):
+            for target in specs:
+                models[target]
+        return
+    feature_names = dict.fromkeys(name for specs in spec_groups for spec in specs.values() for name in spec.feature_names)
+    canary_row = dict.fromkeys(feature_names, math.nan)
+    predictions = bundle.predict_batch([[]], [None], [canary_row])[0]
+    for target in bundle.specs:
+        if not math.isfinite(predictions[target]):
+            raise ValueError(f"canary prediction for {target} is {predictions[target]!r}")
+
+
+def _reload_bundle(signature: tuple[int, int]) -> None:
+    global _bundle, _bundle_signature, _rejected_signature
+    try:
+        started = time.perf_counter()
+        new_bundle = _build_predictor_bundle(settings.model_dir)
+        _canary_check(new_bundle)
+        with _bundle_lock:
+            old_bundle = _bundle
+            _bundle = new_bundle
+            _bundle_signature = signature
+        print(f"Model bundle {old_bundle.version} -> {new_bundle.version} swapped in after {time.perf_counter() - started:.1f}s")
+    except Exception as exc:
+        _rejected_signature = signature
+        print(f"Model reload error: {exc}")
+        return
+    finally:
+        _reload_lock.release()
+    for callback in list(_swap_listeners):
+        try:
+            callback(old_bundle, new_bundle)
+        except Exception as exc:
+            print(f"Model swap listener error: {exc}")
@@ -0,0 +1,164 @@
+"""
+Central scheduler for every stats.nba.com request.
+A token bucket paces the process, waiting callers are served by priority
+(interactive page requests before background prewarm / ingest), each endpoint
+has a concurrency cap, and throttling responses or timeouts back the whole
+scheduler off before the next attempt.
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable
+
+import requests
+
+from config import settings
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+# stats.nba.com answers throttled requests with an HTML page or drops the
+# connection, so a JSON decode failure counts as a throttle signal too.
+_THROTTLE_ERRORS = (OSError, requests.RequestException, json.JSONDecodeError)
+
+_priority_state = threading.local()
+
+
+def current_priority() -> int:
+    return getattr(_priority_state, "priority", INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Run NBA stats calls made by this thread at the given priority."""
+    previous = current_priority()
+    _priority_state.priority = priority
+    try:
+        yield
+    finally:
+        _priority_state.priority = previous
+
+
+class NBAStatsScheduler:
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        endpoint_concurrency: int,
+        max_attempts: int = 3,
+        max_backoff: float = 60.0,
+    ) -> None:
+        self.max_rate = max(rate_per_second, 0.01)
+        self.rate = self.max_rate
+        self.burst = max(burst, 1)
+        self.endpoint_concurrency = max(endpoint_concurrency, 1)
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self._condition = threading.Condition()
+        self._waiting: list[tuple[int, int, str]] = []
+        self._sequence = itertools.count()
+        self._in_flight: dict[str, int] = {}
+        self.calls = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _next_eligible(self) -> tuple[int, int, str] | None:
+        for ticket in self._waiting:
+            if self._in_flight.get(ticket[2], 0) < self.endpoint_concurrency:
+                return ticket
+        return None
+
+    def _acquire(self, endpoint: str, priority: int) -> None:
+        """Block until this call holds a token and an endpoint slot, in priority order."""
+        ticket = (priority, next(self._sequence), endpoint)
+        with self._condition:
+            bisect.insort(self._waiting, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._next_eligible() == ticket and now >= self._paused_until and self._tokens >= 1.0:
+                    self._waiting.remove(ticket)
+                    self._tokens -= 1.0
+                    self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+                    self.calls += 1
+                    self._condition.notify_all()
+                    return
+                wait = max(self._paused_until - now, (1.0 - self._tokens) / self.rate, 0.01)
+                self._condition.wait(timeout=wait)
+
+    def _release(self, endpoint: str) -> None:
+        with self._condition:
+            self._in_flight[endpoint] -= 1
+            self._condition.notify_all()
+
+    def _on_success(self) -> None:
+        with self._condition:
+            self._backoff = 0.0
+            self.rate = min(self.max_rate, self.rate * 1.25)
+
+    def _on_throttle(self) -> None:
+        with self._condition:
+            self.throttled += 1
+            self._backoff = min(self.max_backoff, max(3.0, self._backoff * 2))
+            self._paused_until = max(self._paused_until, time.monotonic() + self._backoff)
+            self.rate = max(self.max_rate / 8, self.rate / 2)
+            self._condition.notify_all()
+
+    def call(self, endpoint: str, make_request: Callable[[], Any], *, priority: int | None = None) -> Any:
+        """Run make_request() under the rate limit, retrying throttling errors."""
+        priority = current_priority() if priority is None else priority
+        last_exc: BaseException | None = None
+        for _ in range(self.max_attempts):
+            self._acquire(endpoint, priority)
+            try:
+                result = make_request()
+            except _THROTTLE_ERRORS as exc:
+                last_exc = exc
+                self._on_throttle()
+                continue
+            finally:
+                self._release(endpoint)
+            self._on_success()
+            return result
+        with self._condition:
+            self.failures += 1
+        raise last_exc
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "failures": self.failures,
+                "waiting": len(self._waiting),
+                "in_flight": {endpoint: count for endpoint, count in self._in_flight.items() if count},
+                "rate_per_second": round(self.rate, 3),
+                "backoff_seconds": self._backoff,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> NBAStatsScheduler:
+    return NBAStatsScheduler(
+        rate_per_second=settings.nba_stats_rate_per_second,
+        burst=settings.nba_stats_burst,
+        endpoint_concurrency=settings.nba_stats_endpoint_concurrency,
+    )
+
+
+def schedule_nba_call(endpoint: str, make_request: Callable[[], Any], *, priority: int | None = None) -> Any:
+    return get_scheduler().call(endpoint, make_request, priority=priority)
@@ -5,9 +5,8 @@ from datetime import datetime
 from functools import lru_cache
 from typing import Any
 
-import requests
-
 from config import settings
+from http_replay import build_session
 
 
 _ESPN_SITE_API_BASE = "https://site.api.espn.com/apis/site/v2"
@@ -350,7 +349,7 @@ def _search_players_cached(query: str) -> tuple[dict[str, Any], ...]:
     if not query.strip():
         return ()
 
-    session = requests.Session()
+    session = build_session()
     session.headers.update(_DEFAULT_HEADERS)
     endpoints = [
         (
@@ -396,7 +395,7 @@ def _search_players_cached(query: str) -> tuple[dict[str, Any], ...]:
 
 @lru_cache(maxsize=512)
 def _player_gamelogs_cached(player_id: str, season: int, team_id: str | None) -> tuple[dict[str, Any], ...]:
-    session = requests.Session()
+    session = build_session()
     session.headers.update(_DEFAULT_HEADERS)
     endpoint_candidates = [
         (
@@ -435,7 +434,7 @@ def _player_gamelogs_cached(player_id: str, season: int, team_id: str | None) ->
 
 class NCAAApiClient:
     def __init__(self) -> None:
-        self.session = requests.Session()
+        self.session = build_session()
         self.session.headers.update(_DEFAULT_HEADERS)
 
     def search_players(self, query: str) -> list[dict[str, Any]]:
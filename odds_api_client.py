@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Any
 
 import requests
 
 from config import settings
+from http_replay import build_session
+from swr_cache import SWRCache
 
 
 MARKET_MAP = {
@@ -39,8 +40,13 @@ class OddsApiClient:
 
     def __init__(self) -> None:
         self.api_key = settings.odds_api_key
-        self.session = requests.Session()
+        self.session = build_session()
         self.session.headers.update({"Accept": "application/json", "User-Agent": "Mozilla/5.0"})
+        self._board_cache = SWRCache(
+            "odds_api.entries",
+            ttl=settings.board_cache_ttl_seconds,
+            max_stale=settings.board_cache_max_stale_seconds,
+        )
 
     def is_configured(self) -> bool:
         return bool(self.api_key)
@@ -69,8 +75,10 @@ class OddsApiClient:
         except requests.RequestException:
             return {}
 
-    @lru_cache(maxsize=1)
     def _cached_entries(self) -> tuple[OddsApiEntry, ...]:
+        return self._board_cache.get("nba", self._load_entries)
+
+    def _load_entries(self) -> tuple[OddsApiEntry, ...]:
         if not self.is_configured():
             raise OddsApiProviderError("Set ODDS_API_KEY to enable multi-book line shopping.")
         events = self._fetch_events()
@@ -107,9 +115,16 @@ class OddsApiClient:
                         ))
         return tuple(entries)
 
-    def fetch_entries(self) -> list[OddsApiEntry]:
+    def fetch_entries(self, *, fresh: bool = False) -> list[OddsApiEntry]:
+        """Cached lines; fresh=True refetches them now (the last good lines are kept if that fails)."""
+        if fresh:
+            return list(self._board_cache.reload("nba", self._load_entries))
         return list(self._cached_entries())
 
+    def entries_fetched_at(self) -> float | None:
+        entry = self._board_cache.peek("nba")
+        return entry[0] if entry is not None else None
+
     def build_line_map(self) -> dict[tuple[str, str], dict[str, float]]:
         """Returns {(norm_name, market): {book_name: line}} for all players."""
         def _norm(s: str) -> str:
@@ -3,11 +3,12 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
 
 import requests
 
 from config import settings
+from http_replay import build_session
+from swr_cache import SWRCache
 
 
 MARKET_KEY_BY_LABEL = {
@@ -116,7 +117,7 @@ class ParlayPlayProviderError(RuntimeError):
 
 class ParlayPlayClient:
     def __init__(self) -> None:
-        self.session = requests.Session()
+        self.session = build_session()
         self.session.headers.update(
             {
                 "Accept": "application/json, text/plain, */*",
@@ -127,6 +128,11 @@ class ParlayPlayClient:
                 "X-Requested-With": "XMLHttpRequest",
             }
         )
+        self._board_cache = SWRCache(
+            "parlayplay.board_entries",
+            ttl=settings.board_cache_ttl_seconds,
+            max_stale=settings.board_cache_max_stale_seconds,
+        )
         if settings.parlayplay_cookie:
             self.session.headers["Cookie"] = settings.parlayplay_cookie
             csrf_token = _extract_cookie_value(settings.parlayplay_cookie, "csrftoken")
@@ -306,8 +312,10 @@ class ParlayPlayClient:
                     )
         return entries
 
-    @lru_cache(maxsize=1)
     def _cached_board_entries(self) -> tuple[ParlayPlayBoardEntry, ...]:
+        return self._board_cache.get("board", self._load_board_entries)
+
+    def _load_board_entries(self) -> tuple[ParlayPlayBoardEntry, ...]:
         board = self._fetch_board()
         return tuple(
             sorted(
@@ -323,9 +331,21 @@ class ParlayPlayClient:
             )
         )
 
-    def fetch_board_entries(self) -> list[ParlayPlayBoardEntry]:
+    def fetch_board_entries(self, *, fresh: bool = False) -> list[ParlayPlayBoardEntry]:
+        """Cached board; fresh=True refetches it now (the last good board is kept if that fails)."""
+        if fresh:
+            return list(self._board_cache.reload("board", self._load_board_entries))
         return list(self._cached_board_entries())
 
+    def board_fetched_at(self) -> float | None:
+        entry = self._board_cache.peek("board")
+        return entry[0] if entry is not None else None
+
+    def board_start_times(self) -> list[datetime]:
+        """Start times on the cached board, without fetching it."""
+        entry = self._board_cache.peek("board")
+        return [start for start in (_parse_datetime(board_entry.start_time) for board_entry in (entry[1] if entry else ())) if start]
+
     def fetch_player_lines(
         self,
         *,
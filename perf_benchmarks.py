@@ -0,0 +1,926 @@
+"""
+Standalone parity checks and micro-benchmarks for the hot feature/inference paths.
+Every benchmark compares the fast implementation against its reference on
+synthetic data first, then times both. Run all of them or pick by name:
+
+    python perf_benchmarks.py
+    python perf_benchmarks.py feature_row
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+TEAMS = ["ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW", "HOU", "LAL", "MIA", "NYK", "PHX"]
+
+
+def synthetic_game_logs(games: int, seed: int = 7) -> list[dict[str, Any]]:
+    """Game logs shaped like api_client._game_log_row_to_dict output."""
+    rng = random.Random(seed)
+    start = date(2025, 10, 21)
+    logs = []
+    for index in range(games):
+        minutes = max(0.0, rng.gauss(29.0, 7.0))
+        fga = rng.randint(4, 24)
+        fgm = rng.randint(0, fga)
+        tpa = rng.randint(0, 10)
+        off_reb = rng.randint(0, 4)
+        def_reb = rng.randint(0, 10)
+        logs.append(
+            {
+                "game": {"id": 22500001 + index, "date": (start + timedelta(days=2 * index)).strftime("%b %d, %Y").upper()},
+                "opponent_abbr": rng.choice(TEAMS),
+                "points": rng.randint(0, 40),
+                "fgm": fgm,
+                "fga": fga,
+                "fgp": round(fgm / fga, 3),
+                "ftp": round(rng.random(), 3),
+                "tpm": rng.randint(0, tpa),
+                "tpa": tpa,
+                "tpp": round(rng.random(), 3),
+                "offReb": off_reb,
+                "defReb": def_reb,
+                "totReb": off_reb + def_reb,
+                "assists": rng.randint(0, 12),
+                "pFouls": rng.randint(0, 6),
+                "steals": rng.randint(0, 4),
+                "turnovers": rng.randint(0, 6),
+                "blocks": rng.randint(0, 4),
+                "plusMinus": rng.randint(-25, 25),
+                "min": f"{int(minutes)}:{int((minutes % 1) * 60):02d}" if index % 3 else round(minutes, 2),
+                "usage_rate": round(rng.uniform(0.1, 0.35), 4) if index % 4 else 0.0,
+                "true_shooting_pct": round(rng.uniform(0.45, 0.7), 4),
+            }
+        )
+    rng.shuffle(logs)
+    return logs
+
+
+def synthetic_context(seed: int = 11) -> dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "home": float(rng.random() > 0.5),
+        "rest_days": float(rng.randint(0, 4)),
+        "team_pace": rng.uniform(96, 104),
+        "opp_pace": rng.uniform(96, 104),
+        "team_off_rating": rng.uniform(108, 120),
+        "opp_off_rating": rng.uniform(108, 120),
+        "opp_def_rating": rng.uniform(108, 120),
+        "team_assists_form_5": rng.uniform(22, 30),
+        "opp_assists_allowed_5": rng.uniform(22, 30),
+        "opponent_abbr": rng.choice(TEAMS),
+    }
+
+
+def synthetic_training_frame(rows: int, seed: int = 3):
+    """Player-game rows shaped like data_ingest output: 30 teams, 14-man rosters, full schedules."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    roster = 14
+    games = max(1, rows // (2 * roster))
+    home_team = rng.integers(0, 30, games)
+    away_team = (home_team + rng.integers(1, 30, games)) % 30
+    game_dates = pd.Timestamp("2012-10-30") + pd.to_timedelta(np.sort(rng.integers(0, games // 6 + 1, games)), unit="D")
+
+    team = np.concatenate([np.repeat(home_team, roster), np.repeat(away_team, roster)])
+    opponent = np.concatenate([np.repeat(away_team, roster), np.repeat(home_team, roster)])
+    slot = np.tile(np.arange(roster), 2 * games)
+    game_index = np.concatenate([np.repeat(np.arange(games), roster)] * 2)
+    count = len(team)
+    minutes = np.clip(rng.normal(36 - slot * 2.2, 5), 0, 48)
+    home_win = rng.random(games) > 0.45
+    frame = pd.DataFrame(
+        {
+            "game_id": 20000000 + game_index,
+            "game_date": game_dates[game_index],
+            "player_id": 1000 + team * roster + slot,
+            "team_abbr": np.array(TEAMS * 2)[team],
+            "opponent_abbr": np.array(TEAMS * 2)[opponent],
+            "win": np.where(np.arange(count) < count // 2, home_win[game_index], ~home_win[game_index]).astype(float),
+            "home": (np.arange(count) < count // 2).astype(float),
+            "minutes": minutes,
+            "points": rng.poisson(minutes * 0.45).astype(float),
+            "assists": rng.poisson(minutes * 0.1).astype(float),
+            "rebounds": rng.poisson(minutes * 0.16).astype(float),
+            "steals": rng.poisson(0.8, count).astype(float),
+            "blocks": rng.poisson(0.5, count).astype(float),
+            "turnovers": rng.poisson(1.4, count).astype(float),
+            "off_rebounds": rng.poisson(1.0, count).astype(float),
+            "def_rebounds": rng.poisson(3.0, count).astype(float),
+            "plus_minus": rng.integers(-20, 21, count).astype(float),
+            "fg_pct": np.round(rng.uniform(0.3, 0.65, count), 3),
+            "three_pt_pct": np.round(rng.uniform(0.0, 0.5, count), 3),
+            "ft_pct": np.round(rng.uniform(0.5, 1.0, count), 3),
+            "starter": (slot < 5).astype(float),
+            "usage_rate": np.round(rng.uniform(0.1, 0.35, count), 4),
+            "rest_days": rng.integers(0, 4, count).astype(float),
+            "is_back_to_back": (rng.random(count) < 0.15).astype(float),
+            "team_pace": rng.uniform(96, 104, count),
+            "opp_pace": rng.uniform(96, 104, count),
+            "opp_off_rating": rng.uniform(105, 120, count),
+            "opp_def_rating": rng.uniform(105, 120, count),
+        }
+    )
+    # A few missing box-score values, as DNP-CD rows sometimes arrive from the API.
+    missing = rng.random(count) < 0.002
+    frame.loc[missing, ["points", "minutes"]] = np.nan
+    frame = frame.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+    return frame.iloc[:rows] if len(frame) > rows else frame
+
+
+def _assert_frames_match(reference, fast, label: str, tolerance: float = 1e-9) -> None:
+    import numpy as np
+
+    if list(reference.columns) != list(fast.columns):
+        raise AssertionError(f"{label}: columns differ: {sorted(set(reference.columns) ^ set(fast.columns))[:10]}")
+    if len(reference) != len(fast):
+        raise AssertionError(f"{label}: {len(reference)} rows vs {len(fast)}")
+    for column in reference.columns:
+        expected, actual = reference[column].to_numpy(), fast[column].to_numpy()
+        if expected.dtype.kind in "fiub":
+            matches = np.isclose(expected.astype(float), actual.astype(float), rtol=tolerance, atol=tolerance, equal_nan=True)
+        else:
+            matches = expected == actual
+        if not matches.all():
+            first = int(np.argmin(matches))
+            raise AssertionError(f"{label}: {column} row {first}: expected {expected[first]!r}, got {actual[first]!r}")
+
+
+def _time_call(fn: Callable[[], Any], repeat: int) -> float:
+    """Best-of-three mean seconds per call."""
+    best = math.inf
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def _report(label: str, reference_seconds: float, fast_seconds: float) -> None:
+    speedup = reference_seconds / fast_seconds if fast_seconds else math.inf
+    print(f"  {label:<34} ref {reference_seconds * 1e3:>9.3f} ms   fast {fast_seconds * 1e3:>9.3f} ms   {speedup:>6.1f}x")
+
+
+def _assert_rows_match(reference: dict[str, float], fast: dict[str, float], label: str, tolerance: float = 1e-9) -> None:
+    if list(reference) != list(fast):
+        missing = set(reference) ^ set(fast)
+        raise AssertionError(f"{label}: feature names differ: {sorted(missing)[:10]}")
+    for name, expected in reference.items():
+        actual = fast[name]
+        if not math.isclose(expected, actual, rel_tol=tolerance, abs_tol=tolerance):
+            raise AssertionError(f"{label}: {name} expected {expected!r}, got {actual!r}")
+
+
+def _reference_feature_row(game_logs: list[dict[str, Any]], upcoming_context: dict[str, Any] | None = None) -> dict[str, float]:
+    """The original per-game build_feature_row, kept here as the parity and timing reference."""
+    from statistics import pstdev
+
+    from features import (
+        INFERENCE_STAT_SOURCES,
+        _add_context_features,
+        _add_role_features,
+        _build_inference_context,
+        _window_mean,
+        sort_games,
+    )
+
+    def window_std(games: list[dict[str, float]], stat_key: str) -> float:
+        if len(games) <= 1:
+            return 0.0
+        return pstdev([game.get(stat_key, 0.0) for game in games])
+
+    def window_rate(games: list[dict[str, float]], predicate) -> float:
+        if not games:
+            return 0.0
+        return sum(1.0 for game in games if predicate(game)) / len(games)
+
+    if not game_logs:
+        raise ValueError("game_logs must contain at least one game.")
+    ordered_games = sort_games(game_logs)
+    context = _build_inference_context(ordered_games, upcoming_context)
+    feature_row: dict[str, float] = {}
+
+    for feature_name, stat_key in INFERENCE_STAT_SOURCES.items():
+        for window in (3, 5, 10):
+            games = ordered_games[:window]
+            feature_row[f"{feature_name}_rolling_{window}"] = _window_mean(games, stat_key)
+            feature_row[f"{feature_name}_rolling_std_{window}"] = window_std(games, stat_key)
+        feature_row[f"{feature_name}_season_avg"] = _window_mean(ordered_games, stat_key)
+        feature_row[f"{feature_name}_last_game"] = ordered_games[0].get(stat_key, 0.0) if ordered_games else 0.0
+
+    for window in (5, 10):
+        games = ordered_games[:window]
+        feature_row[f"lead_role_rate_{window}"] = window_rate(games, lambda game: game.get("minutes", 0.0) >= 30.0)
+        feature_row[f"heavy_load_rate_{window}"] = window_rate(games, lambda game: game.get("minutes", 0.0) >= 34.0)
+        feature_row[f"rotation_role_rate_{window}"] = window_rate(games, lambda game: game.get("minutes", 0.0) >= 24.0)
+        feature_row[f"bench_risk_rate_{window}"] = window_rate(games, lambda game: game.get("minutes", 0.0) < 20.0)
+
+    assist_specialty_builders = {
+        "assists_per_minute": lambda game: game.get("assists", 0.0) / max(game.get("minutes", 0.0), 1.0),
+        "points_per_minute": lambda game: game.get("points", 0.0) / max(game.get("minutes", 0.0), 1.0),
+        "rebounds_per_minute": lambda game: game.get("totReb", 0.0) / max(game.get("minutes", 0.0), 1.0),
+        "assist_to_turnover": lambda game: game.get("assists", 0.0) / max(game.get("turnovers", 0.0), 1.0),
+        "assist_plus_usage": lambda game: game.get("assists", 0.0) + (game.get("usage_rate", 0.0) * 10.0),
+        "assist_creation": lambda game: (game.get("assists", 0.0) / max(game.get("minutes", 0.0), 1.0)) * game.get("usage_rate", 0.0),
+        "assist_load": lambda game: game.get("assists", 0.0) * game.get("minutes", 0.0),
+    }
+    for feature_name, value_getter in assist_specialty_builders.items():
+        derived_games = [{feature_name: value_getter(game)} for game in ordered_games]
+        for window in (3, 5, 10):
+            games = derived_games[:window]
+            feature_row[f"{feature_name}_rolling_{window}"] = _window_mean(games, feature_name)
+        feature_row[f"{feature_name}_season_avg"] = _window_mean(derived_games, feature_name)
+        feature_row[f"{feature_name}_last_game"] = derived_games[0].get(feature_name, 0.0) if derived_games else 0.0
+
+    for window in (3, 5, 10):
+        assists_games = ordered_games[:window]
+        team_assists = max(context["team_assists_form_5"], 1.0)
+        feature_row[f"assist_share_rolling_{window}"] = _window_mean(assists_games, "assists") / team_assists if assists_games else 0.0
+    feature_row["assist_share_season_avg"] = feature_row["assist_share_rolling_10"]
+    feature_row["assist_share_last_game"] = feature_row["assists_last_game"] / max(context["team_assists_form_5"], 1.0)
+
+    _add_context_features(feature_row, context)
+
+    opponent_abbr_for_matchup = str((upcoming_context or {}).get("opponent_abbr", "") or "").upper()
+    if opponent_abbr_for_matchup and ordered_games:
+        opp_games = [g for g in ordered_games if g.get("opponent_abbr", "").upper() == opponent_abbr_for_matchup]
+    else:
+        opp_games = []
+    for stat, key in [("points", "points"), ("assists", "assists"), ("rebounds", "totReb")]:
+        if opp_games:
+            feature_row[f"vs_opp_{stat}_avg"] = _window_mean(opp_games, key)
+            feature_row[f"vs_opp_{stat}_last"] = opp_games[0].get(key, 0.0)
+        else:
+            feature_row[f"vs_opp_{stat}_avg"] = feature_row.get(f"{stat}_season_avg", 0.0)
+            feature_row[f"vs_opp_{stat}_last"] = 0.0
+    feature_row["vs_opp_minutes_avg"] = _window_mean(opp_games, "minutes") if opp_games else feature_row.get("minutes_season_avg", 0.0)
+    feature_row["vs_opp_games_count"] = float(len(opp_games))
+
+    recent_10 = ordered_games[:10]
+    feature_row["minutes_volatility_10"] = window_std(recent_10, "minutes")
+    feature_row["starter_rate_5"] = _window_mean(ordered_games[:5], "starter")
+    feature_row["starter_rate_10"] = _window_mean(recent_10, "starter")
+    _add_role_features(feature_row)
+
+    return feature_row
+
+
+def bench_feature_row() -> None:
+    from features import build_feature_row
+    from game_log import PlayerGameLog
+
+    print("build_feature_row (vectorized) vs per-game loop")
+    for games in (1, 2, 5, 12, 82):
+        for seed in range(5):
+            logs = synthetic_game_logs(games, seed=seed)
+            for context in (None, synthetic_context(seed), {"opponent_abbr": logs[0]["opponent_abbr"]}):
+                _assert_rows_match(
+                    _reference_feature_row(logs, context),
+                    build_feature_row(logs, context),
+                    f"{games} games, seed {seed}",
+                )
+    print("  parity: ok")
+    for games in (10, 82):
+        logs = synthetic_game_logs(games)
+        context = synthetic_context()
+        _report(
+            f"{games} games",
+            _time_call(lambda: _reference_feature_row(logs, context), 200),
+            _time_call(lambda: build_feature_row(logs, context), 200),
+        )
+    # The app reads logs from the store as a PlayerGameLog, which skips the per-game dict parsing.
+    logs = _stored_game_logs(1, 82)[0]
+    compact = PlayerGameLog(logs)
+    context = synthetic_context()
+    _report(
+        "82 games, stored log",
+        _time_call(lambda: _reference_feature_row(logs, context), 200),
+        _time_call(lambda: build_feature_row(compact, context), 200),
+    )
+
+
+def _model_feature_names() -> dict[str, list[str]]:
+    metadata = json.loads((Path(__file__).resolve().parent / "model_metadata.json").read_text())
+    specs = {**metadata.get("targets", {}), **metadata.get("auxiliary", {})}
+    return {target: payload.get("feature_names") or [] for target, payload in specs.items()}
+
+
+def bench_feature_matrix() -> None:
+    import numpy as np
+    import pandas as pd
+
+    from features import build_feature_matrix, build_feature_row
+
+    feature_names = _model_feature_names()
+    columns = list(dict.fromkeys(name for names in feature_names.values() for name in names))
+    players = {f"player-{index}": synthetic_game_logs(20, seed=index) for index in range(200)}
+    contexts = {key: synthetic_context(index) for index, key in enumerate(players)}
+
+    def per_player() -> list[pd.DataFrame]:
+        frames = []
+        for key, logs in players.items():
+            row_frame = pd.DataFrame([build_feature_row(logs, upcoming_context=contexts[key])])
+            frames.extend(row_frame.reindex(columns=names, fill_value=0.0) for names in feature_names.values())
+        return frames
+
+    def batched() -> list[pd.DataFrame]:
+        rows = [build_feature_row(logs, upcoming_context=contexts[key]) for key, logs in players.items()]
+        matrix = pd.DataFrame(build_feature_matrix(rows, columns), index=list(players), columns=columns)
+        return [matrix[names] for names in feature_names.values()]
+
+    print("build_feature_matrix vs per-player frames (200 players x 4 models)")
+    reference = per_player()
+    fast = batched()
+    targets = len(feature_names)
+    for index, key in enumerate(players):
+        for offset, names in enumerate(feature_names.values()):
+            expected = reference[index * targets + offset].to_numpy()[0]
+            if not np.array_equal(expected, fast[offset].loc[key].to_numpy()):
+                raise AssertionError(f"feature matrix mismatch for {key}, {names[:3]}...")
+    print("  parity: ok")
+    _report("200-player slate", _time_call(per_player, 3), _time_call(batched, 3))
+
+
+def bench_feature_state() -> None:
+    from feature_state import PlayerFeatureState
+    from features import build_feature_row
+    from game_log import PlayerGameLog
+
+    print("PlayerFeatureState (one new game) vs full build_feature_row")
+    for seed in range(5):
+        logs = synthetic_game_logs(82, seed=seed)
+        ordered = sorted(logs, key=lambda game: game["game"]["id"])
+        state, compact_state = PlayerFeatureState(), PlayerFeatureState()
+        for played in range(1, len(ordered) + 1, 9):
+            state.sync(ordered[:played], revision=0)
+            compact_state.sync(PlayerGameLog(ordered[:played]), revision=0)
+            restored = PlayerFeatureState.from_payload(state.to_payload())
+            for context in (None, synthetic_context(seed), {"opponent_abbr": ordered[0]["opponent_abbr"]}):
+                expected = build_feature_row(ordered[:played], context)
+                _assert_rows_match(expected, state.feature_row(context), f"seed {seed}, {played} games")
+                _assert_rows_match(expected, compact_state.feature_row(context), f"seed {seed}, {played} games (columnar)")
+                _assert_rows_match(expected, restored.feature_row(context), f"seed {seed}, {played} games (restored)")
+        # A correction to the newest applied game is caught by its digest alone.
+        corrected = [dict(game) for game in ordered[:played]]
+        corrected[-1]["points"] += 7
+        restored.sync(PlayerGameLog(corrected), revision=0)
+        _assert_rows_match(build_feature_row(corrected), restored.feature_row(), f"seed {seed}, corrected newest game")
+        # An older game keeps its key and the game count; the store's revision bump is what flags it.
+        corrected[3]["points"] += 7
+        restored.sync(PlayerGameLog(corrected), revision=1)
+        _assert_rows_match(build_feature_row(corrected), restored.feature_row(), f"seed {seed}, corrected older game")
+    print("  parity: ok")
+
+    context = synthetic_context()
+    for label, logs in (("columnar", PlayerGameLog(synthetic_game_logs(82))), ("dicts", _stored_game_logs(1, 82)[0])):
+        newest = max(logs, key=lambda game: int(game["game"]["id"]))
+        earlier = [game for game in logs if game is not newest]
+        if isinstance(logs, PlayerGameLog):
+            earlier = PlayerGameLog(earlier)
+        state = PlayerFeatureState()
+        state.sync(earlier, revision=0)
+        # Each timed call needs its own state one game behind, so restore a batch up front.
+        payload = state.to_payload()
+        behind = iter([PlayerFeatureState.from_payload(payload) for _ in range(3 * 200)])
+        state.sync(logs, revision=0)
+
+        def one_new_game() -> dict[str, float]:
+            pending = next(behind)
+            pending.sync(logs, revision=0)
+            return pending.feature_row(context)
+
+        def no_new_games() -> dict[str, float]:
+            state.sync(logs, revision=0)
+            return state.feature_row(context)
+
+        full_rebuild = _time_call(lambda: build_feature_row(logs, context), 200)
+        _report(f"82 games, 1 new ({label})", full_rebuild, _time_call(one_new_game, 200))
+        _report(f"82 games, none new ({label})", full_rebuild, _time_call(no_new_games, 200))
+
+
+def _stored_game_logs(players: int, games: int) -> list[list[dict[str, Any]]]:
+    """Per-player logs as game_log_store.load returns them: freshly JSON-decoded, with team and player records."""
+    logs_by_player = []
+    for player in range(players):
+        logs = synthetic_game_logs(games, seed=player)
+        for game in logs:
+            game["game"]["id"] = f"00{game['game']['id']}"
+            game["team"] = {"id": 1610612700 + player % 30, "code": TEAMS[player % len(TEAMS)]}
+            game["player"] = {"id": str(200000 + player), "firstname": "Synthetic", "lastname": f"Player {player}"}
+        logs_by_player.append(json.loads(json.dumps(logs)))
+    return logs_by_player
+
+
+def bench_game_log() -> None:
+    import tracemalloc
+
+    from feature_state import PlayerFeatureState
+    from features import build_feature_row, build_legacy_feature_frame, sort_games
+    from game_log import PlayerGameLog
+
+    print("PlayerGameLog (columnar) vs dict-per-game logs")
+    for seed, logs in enumerate(_stored_game_logs(5, 82)):
+        compact = PlayerGameLog(logs)
+        expected_games = sort_games(logs)
+        if sort_games(list(compact)) != expected_games:
+            raise AssertionError(f"seed {seed}: adapter dicts normalize differently")
+        for context in (None, synthetic_context(seed), {"opponent_abbr": logs[0]["opponent_abbr"]}):
+            _assert_rows_match(build_feature_row(logs, context), build_feature_row(compact, context), f"seed {seed}")
+            state = PlayerFeatureState()
+            state.sync(compact)
+            _assert_rows_match(build_feature_row(logs, context), state.feature_row(context), f"seed {seed} (state)")
+        if not build_legacy_feature_frame(logs).equals(build_legacy_feature_frame(compact)):
+            raise AssertionError(f"seed {seed}: legacy frames differ")
+    print("  parity: ok")
+
+    players, games = 450, 80
+    tracemalloc.start()
+    logs_by_player = _stored_game_logs(players, games)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    compact_by_player = [PlayerGameLog(logs) for logs in logs_by_player]
+    del logs_by_player
+    compact_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"  {players} players x {games} games: dicts {dict_bytes / 2**20:.1f} MiB, "
+        f"compact {compact_bytes / 2**20:.1f} MiB ({dict_bytes / max(compact_bytes, 1):.1f}x smaller)"
+    )
+
+    logs = _stored_game_logs(1, 82)[0]
+    compact = compact_by_player[0]
+    context = synthetic_context()
+    _report("build_feature_row, 82 games", _time_call(lambda: build_feature_row(logs, context), 200), _time_call(lambda: build_feature_row(compact, context), 200))
+    _report("legacy frame, 82 games", _time_call(lambda: build_legacy_feature_frame(logs), 200), _time_call(lambda: build_legacy_feature_frame(compact), 200))
+
+
+def bench_training_features() -> None:
+    from train_models import _build_features, _build_features_reference
+
+    print("train_models._build_features (vectorized) vs per-player lambdas")
+    for seed in range(3):
+        frame = synthetic_training_frame(20_000, seed=seed)
+        _assert_frames_match(_build_features_reference(frame), _build_features(frame), f"seed {seed}")
+    print("  parity: ok")
+    frame = synthetic_training_frame(100_000)
+    _report("100k rows", _time_call(lambda: _build_features_reference(frame), 1), _time_call(lambda: _build_features(frame), 1))
+    # The lambda path needs several times the memory of the vectorized one at this size, so only the new path runs.
+    frame = synthetic_training_frame(500_000)
+    print(f"  {'500k rows':<34} fast {_time_call(lambda: _build_features(frame), 1) * 1e3:>9.3f} ms")
+
+
+def synthetic_feature_frame(players: int, seed: int = 5):
+    """build_feature_row output for synthetic players, one row each."""
+    import pandas as pd
+
+    from features import build_feature_row
+
+    return pd.DataFrame(
+        [build_feature_row(synthetic_game_logs(20, seed=seed + index), synthetic_context(index)) for index in range(players)]
+    )
+
+
+def synthetic_predictor_bundle(players: int = 300, n_estimators: int = 200, seed: int = 5, legacy_targets: tuple[str, ...] = ()):
+    """
+    PredictorBundle with small LightGBM pipelines trained in-process on
+    synthetic feature rows, laid out like the shipped model_metadata.json.
+    Targets in legacy_targets get a pre-metadata model instead: no feature
+    names, trained on build_legacy_feature_frame.
+    """
+    import numpy as np
+    import pandas as pd
+    from lightgbm import LGBMRegressor
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+
+    from features import build_legacy_feature_frame
+    from modeling import ModelSpec, PredictorBundle
+
+    feature_names = _model_feature_names()
+    frame = synthetic_feature_frame(players, seed=seed)
+    legacy_frame = None
+    if legacy_targets:
+        legacy_frame = pd.concat(
+            [build_legacy_feature_frame(synthetic_game_logs(20, seed=seed + index)) for index in range(players)],
+            ignore_index=True,
+        )
+    rng = np.random.default_rng(seed)
+    models = {}
+    for target, names in feature_names.items():
+        X = legacy_frame if target in legacy_targets else frame.reindex(columns=names, fill_value=0.0)
+        # Knock out some values so the imputer has something to do.
+        X = X.mask(rng.random(X.shape) < 0.02)
+        y = X.iloc[:, : min(5, X.shape[1])].fillna(0.0).sum(axis=1) + rng.normal(0.0, 1.0, len(X))
+        models[target] = Pipeline(
+            steps=[
+                ("imputer", SimpleImputer(strategy="median")),
+                ("regressor", LGBMRegressor(n_estimators=n_estimators, num_leaves=31, min_child_samples=5, random_state=42, verbose=-1)),
+            ]
+        ).fit(X, y)
+    targets = [target for target in feature_names if target != "minutes"]
+    return PredictorBundle(
+        specs={
+            target: ModelSpec(target, f"{target}_model.pkl", None if target in legacy_targets else feature_names[target])
+            for target in targets
+        },
+        models={target: models[target] for target in targets},
+        auxiliary_specs={"minutes": ModelSpec("minutes", "minutes_model.pkl", feature_names["minutes"])},
+        auxiliary_models={"minutes": models["minutes"]},
+        metadata={},
+    )
+
+
+def _reference_predict(bundle, game_logs, upcoming_context=None, rich_feature_row=None) -> dict[str, Any]:
+    """The original per-player PredictorBundle.predict: one DataFrame and one model call per target."""
+    import warnings
+
+    import pandas as pd
+
+    from features import build_feature_row, build_legacy_feature_frame
+
+    if rich_feature_row is None:
+        rich_feature_row = build_feature_row(game_logs, upcoming_context=upcoming_context)
+    rich_frame = pd.DataFrame([rich_feature_row])
+    legacy_frame = build_legacy_feature_frame(game_logs)
+    predictions: dict[str, Any] = {}
+
+    for target, spec in bundle.specs.items():
+        model = bundle.models[target]
+        if spec.feature_names:
+            frame = rich_frame.reindex(columns=spec.feature_names, fill_value=0.0)
+        else:
+            frame = legacy_frame
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+            result = model.predict(frame)
+        predictions[target] = float(result[0])
+
+    expected_minutes = float(rich_feature_row.get("projected_minutes", 0.0) or 0.0)
+    minutes_spec = bundle.auxiliary_specs.get("minutes")
+    minutes_model = bundle.auxiliary_models.get("minutes")
+    if minutes_spec and minutes_model:
+        minutes_frame = rich_frame.reindex(columns=minutes_spec.feature_names or [], fill_value=0.0)
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+            model_minutes = float(minutes_model.predict(minutes_frame)[0])
+        heuristic_minutes = float(rich_feature_row.get("projected_minutes", model_minutes) or model_minutes)
+        expected_minutes = (model_minutes * 0.7) + (heuristic_minutes * 0.3)
+    expected_minutes = max(8.0, min(42.0, expected_minutes))
+    predictions["expected_minutes"] = round(expected_minutes, 1)
+    predictions["minutes_baseline"] = round(float(rich_feature_row.get("projected_minutes", 0.0) or 0.0), 1)
+    predictions["confidence_summary"] = bundle._build_confidence_summary(rich_feature_row, expected_minutes=expected_minutes)
+    return predictions
+
+
+def _assert_predictions_match(reference: list[dict[str, Any]], fast: list[dict[str, Any]], label: str) -> None:
+    for index, (expected, actual) in enumerate(zip(reference, fast)):
+        if expected.keys() != actual.keys():
+            raise AssertionError(f"{label}, player {index}: keys differ: {sorted(expected.keys() ^ actual.keys())}")
+        for key, value in expected.items():
+            if isinstance(value, float):
+                if not math.isclose(value, actual[key], rel_tol=1e-9, abs_tol=1e-9):
+                    raise AssertionError(f"{label}, player {index}: {key} expected {value!r}, got {actual[key]!r}")
+            elif value != actual[key]:
+                raise AssertionError(f"{label}, player {index}: {key} expected {value!r}, got {actual[key]!r}")
+
+
+def bench_predict_batch() -> None:
+    players = 200
+    logs = [synthetic_game_logs(20, seed=1000 + index) for index in range(players)]
+    contexts = [synthetic_context(index) for index in range(players)]
+
+    print(f"PredictorBundle.predict_batch vs original per-player predict ({players} players)")
+    bundle = synthetic_predictor_bundle()
+    legacy_bundle = synthetic_predictor_bundle(n_estimators=50, legacy_targets=("points", "rebounds"))
+    for label, candidate in (("spec models", bundle), ("legacy models", legacy_bundle)):
+        reference = [_reference_predict(candidate, player_logs, context) for player_logs, context in zip(logs, contexts)]
+        _assert_predictions_match(reference, candidate.predict_batch(logs, contexts), label)
+        _assert_predictions_match(reference[:5], [candidate.predict(*inputs) for inputs in zip(logs[:5], contexts[:5])], f"{label}, predict")
+    print("  parity: ok")
+    from features import build_feature_row
+
+    feature_rows = [build_feature_row(player_logs, context) for player_logs, context in zip(logs, contexts)]
+    _report(
+        f"{players} players, rows prebuilt",
+        _time_call(lambda: [_reference_predict(bundle, *inputs) for inputs in zip(logs, contexts, feature_rows)], 1),
+        _time_call(lambda: bundle.predict_batch(logs, contexts, feature_rows), 1),
+    )
+
+
+def bench_native_inference() -> None:
+    from dataclasses import replace
+
+    from features import build_feature_row
+    from modeling import _native_model
+
+    bundle = synthetic_predictor_bundle()
+    native_bundle = replace(
+        bundle,
+        native_models={
+            target: _native_model(target, model, spec.feature_names)
+            for target, spec, model in [
+                *((target, bundle.specs[target], bundle.models[target]) for target in bundle.specs),
+                *((target, bundle.auxiliary_specs[target], bundle.auxiliary_models[target]) for target in bundle.auxiliary_specs),
+            ]
+        },
+    )
+    if None in native_bundle.native_models.values():
+        raise AssertionError("a synthetic pipeline did not convert to a native booster")
+
+    print("Native booster inference vs sklearn Pipeline")
+    rng = random.Random(3)
+    rows = []
+    for index in range(200):
+        row = build_feature_row(synthetic_game_logs(20, seed=2000 + index), synthetic_context(index))
+        for name in rng.sample(sorted(row), 15):
+            row[name] = math.nan
+        rows.append(row)
+    logs = [[]] * len(rows)
+    # repr so NaN confidence scores (NaN rolling std) compare equal; floats repr exactly.
+    if repr(bundle.predict_batch(logs, None, rows)) != repr(native_bundle.predict_batch(logs, None, rows)):
+        raise AssertionError("native batch predictions differ from the Pipeline")
+    for row in rows[:20]:
+        if repr(bundle.predict([], None, row)) != repr(native_bundle.predict([], None, row)):
+            raise AssertionError("native single-row prediction differs from the Pipeline")
+    print("  parity: ok (identical outputs)")
+    row = rows[0]
+    _report("single player", _time_call(lambda: bundle.predict([], None, row), 200), _time_call(lambda: native_bundle.predict([], None, row), 200))
+    _report("200 players", _time_call(lambda: bundle.predict_batch(logs, None, rows), 5), _time_call(lambda: native_bundle.predict_batch(logs, None, rows), 5))
+
+
+_COLD_START_SCRIPT = """
+import json, time
+from perf_benchmarks import synthetic_context, synthetic_game_logs
+from features import build_feature_row
+from modeling import load_predictor_bundle, model_load_stats
+row = build_feature_row(synthetic_game_logs(20), synthetic_context())
+started = time.perf_counter()
+bundle = load_predictor_bundle()
+loaded = time.perf_counter()
+bundle.predict([], None, row)
+print(json.dumps({"bundle": loaded - started, "first": time.perf_counter() - loaded, "artifacts": model_load_stats()}))
+"""
+
+
+def bench_model_load() -> None:
+    import os
+    import pickle
+    import subprocess
+    import sys
+    import tempfile
+
+    from train_models import _export_native_model
+
+    bundle = synthetic_predictor_bundle()
+    check_frame = synthetic_feature_frame(100, seed=900)
+    print("Cold start: lazy native boosters vs unpickled pipelines (fresh interpreter)")
+    with tempfile.TemporaryDirectory() as model_dir:
+        metadata: dict[str, Any] = {"targets": {}, "auxiliary": {}}
+        for section, specs, models in (("targets", bundle.specs, bundle.models), ("auxiliary", bundle.auxiliary_specs, bundle.auxiliary_models)):
+            for target, spec in specs.items():
+                with open(Path(model_dir) / spec.artifact_name, "wb") as artifact:
+                    pickle.dump(models[target], artifact)
+                native = _export_native_model(models[target], Path(model_dir), spec.artifact_name, check_frame.reindex(columns=spec.feature_names, fill_value=0.0))
+                if native is None:
+                    raise AssertionError(f"{target}: native export does not match the pipeline")
+                metadata[section][target] = {"artifact_name": spec.artifact_name, "feature_names": spec.feature_names, "native": native}
+        (Path(model_dir) / "model_metadata.json").write_text(json.dumps(metadata))
+        print("  export parity: ok")
+
+        def cold_start(native: bool) -> dict[str, Any]:
+            env = {**os.environ, "MODEL_DIR": model_dir, "NATIVE_INFERENCE": "true" if native else "false"}
+            output = subprocess.run(
+                [sys.executable, "-c", _COLD_START_SCRIPT],
+                cwd=Path(__file__).resolve().parent,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            return json.loads(output.strip().splitlines()[-1])
+
+        for label, native in (("pickled pipelines", False), ("native boosters", True)):
+            timings = cold_start(native)
+            artifacts = ", ".join(f"{name} {ms:.0f} ms" for name, ms in timings["artifacts"].items())
+            print(
+                f"  {label:<18} bundle {timings['bundle'] * 1e3:>6.1f} ms   first prediction "
+                f"{timings['first'] * 1e3:>7.1f} ms   ({artifacts})"
+            )
+
+
+def bench_predict_frame() -> None:
+    import numpy as np
+    import pandas as pd
+    from lightgbm import LGBMRegressor
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+
+    from modeling import NativeRegressor
+
+    # 32 features keep a 1M-row matrix (and the Pipeline's DataFrame copy) inside a few GB.
+    names = _model_feature_names()["points"][:32]
+    base = synthetic_feature_frame(300).reindex(columns=names, fill_value=0.0)
+    rng = np.random.default_rng(11)
+    train = base.sample(5000, replace=True, random_state=1).reset_index(drop=True)
+    train = train.mask(rng.random(train.shape) < 0.02)
+    target = train.iloc[:, :5].fillna(0.0).sum(axis=1) + rng.normal(0.0, 1.0, len(train))
+    pipeline = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="median")),
+            ("regressor", LGBMRegressor(n_estimators=500, num_leaves=63, min_child_samples=5, random_state=42, verbose=-1)),
+        ]
+    ).fit(train, target)
+    native = NativeRegressor.from_pipeline(pipeline)
+
+    def rows(count: int) -> pd.DataFrame:
+        frame = base.sample(count, replace=True, random_state=count).reset_index(drop=True)
+        return frame.mask(rng.random(frame.shape) < 0.02) + rng.normal(0.0, 0.5, frame.shape)
+
+    print("PredictorBundle.predict_frame (native booster) vs Pipeline.predict (500 trees, 63 leaves, 32 features)")
+    check = rows(10_000)
+    if not np.array_equal(native.predict(check.to_numpy(dtype=np.float64, copy=True)), pipeline.predict(check)):
+        raise AssertionError("native booster differs from Pipeline.predict")
+    print("  parity: ok")
+    for count in (10_000, 100_000, 1_000_000):
+        frame = rows(count)
+        # One run each: at these sizes the spread between runs is small next to a multi-minute best-of-three.
+        seconds = {}
+        for label, fn in (
+            ("pipeline", lambda: pipeline.predict(frame)),
+            ("booster", lambda: native.predict(frame.to_numpy(dtype=np.float64, copy=True))),
+        ):
+            started = time.perf_counter()
+            fn()
+            seconds[label] = time.perf_counter() - started
+        print(f"  {count:>9,} rows   " + "   ".join(f"{label} {value:>7.2f} s" for label, value in seconds.items()))
+        del frame
+
+
+def bench_joint_model(rows: int = 8_000) -> None:
+    import tempfile
+    from dataclasses import replace
+
+    import numpy as np
+
+    from modeling import ModelSpec, PredictorBundle, _native_model
+    from train_models import (
+        AUXILIARY_TARGETS,
+        TARGET_COLUMNS,
+        _build_features,
+        _save_joint_model,
+        _train_auxiliary_target,
+        _train_joint_models,
+        _train_target,
+    )
+
+    features = _build_features(synthetic_training_frame(rows)).dropna(subset=TARGET_COLUMNS).sort_values("game_date")
+    split = int(len(features) * 0.8)
+    training_frame, validation_frame = features.iloc[:split], features.iloc[split:]
+    print(f"Joint model vs four pipelines ({len(training_frame):,} training rows, full candidate grids)")
+
+    started = time.perf_counter()
+    separate = {target: _train_target(training_frame, validation_frame, target) for target in TARGET_COLUMNS}
+    separate.update({target: _train_auxiliary_target(training_frame, validation_frame, target) for target in AUXILIARY_TARGETS})
+    separate_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    joint, joint_metrics, feature_columns = _train_joint_models(training_frame, validation_frame)
+    joint_seconds = time.perf_counter() - started
+    print(f"  {'training':<34} four pipelines {separate_seconds:>7.1f} s   joint {joint_seconds:>7.1f} s")
+    for target, (_, metrics, _) in separate.items():
+        print(f"  {target + ' MAE':<34} four pipelines {metrics['mae']:>7.3f}     joint {joint_metrics[target]['mae']:>7.3f}")
+
+    check_frame = validation_frame[feature_columns]
+    with tempfile.TemporaryDirectory() as model_dir:
+        if _save_joint_model(joint, Path(model_dir), "bench", check_frame) is None:
+            raise AssertionError("joint export does not reproduce the joint model")
+    specs = {target: ModelSpec(target, f"model_{target}.pkl", feature_columns) for target in TARGET_COLUMNS}
+    auxiliary_specs = {target: ModelSpec(target, f"model_{target}.pkl", feature_columns) for target in AUXILIARY_TARGETS}
+    separate_bundle = PredictorBundle(
+        specs=specs,
+        models={target: separate[target][0] for target in specs},
+        auxiliary_specs=auxiliary_specs,
+        auxiliary_models={target: separate[target][0] for target in auxiliary_specs},
+        metadata={},
+        native_models={target: _native_model(target, model, feature_columns) for target, (model, _, _) in separate.items()},
+    )
+    joint_bundle = replace(separate_bundle, joint_model=lambda: joint)
+    feature_rows = check_frame.head(200).to_dict("records")
+    logs = [[]] * len(feature_rows)
+    for target in separate:
+        expected = joint.predict(check_frame.to_numpy(dtype=np.float64, copy=True), [target])[target]
+        if not np.array_equal(expected, joint_bundle.predict_frame(target, validation_frame)):
+            raise AssertionError(f"{target}: predict_frame differs from the joint model")
+    print("  export and predict_frame parity: ok")
+    _report(
+        "single player",
+        _time_call(lambda: separate_bundle.predict([], None, feature_rows[0]), 200),
+        _time_call(lambda: joint_bundle.predict([], None, feature_rows[0]), 200),
+    )
+    _report(
+        "200 players",
+        _time_call(lambda: separate_bundle.predict_batch(logs, None, feature_rows), 5),
+        _time_call(lambda: joint_bundle.predict_batch(logs, None, feature_rows), 5),
+    )
+    _report(
+        "predict_frame, validation split",
+        _time_call(lambda: [separate_bundle.predict_frame(target, validation_frame) for target in separate], 1),
+        _time_call(lambda: [joint_bundle.predict_frame(target, validation_frame) for target in separate], 1),
+    )
+
+
+def _synthetic_stat_lines(rows: int, seed: int):
+    """Correlated points/assists/rebounds outcomes and noisy projections of them."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    minutes = rng.uniform(12.0, 38.0, rows)
+    rates = {"points": 0.5, "assists": 0.12, "rebounds": 0.2}
+    share = rng.gamma(8.0, 1 / 8.0, rows)
+    actual = {target: rng.poisson(rate * minutes * share).astype(np.float64) for target, rate in rates.items()}
+    predicted = {target: rate * minutes * rng.normal(1.0, 0.1, rows) for target, rate in rates.items()}
+    return actual, predicted
+
+
+def bench_prop_probability(rows: int = 2_000) -> None:
+    import numpy as np
+
+    from prop_probability import MARKET_TARGETS, ProbabilityEngine, fit_residuals
+
+    engine = ProbabilityEngine(fit_residuals(*_synthetic_stat_lines(20_000, seed=3)))
+    actual, predicted = _synthetic_stat_lines(rows, seed=4)
+    rng = np.random.default_rng(5)
+    markets = list(rng.choice(list(MARKET_TARGETS), rows))
+    projections = [float(sum(predicted[target][index] for target in MARKET_TARGETS[market])) for index, market in enumerate(markets)]
+    outcomes = np.array([sum(actual[target][index] for target in MARKET_TARGETS[market]) for index, market in enumerate(markets)])
+    lines = [round(projection + rng.normal(0.0, 2.0)) + rng.choice([0.0, 0.5]) for projection in projections]
+    sides = list(rng.choice([1, -1, 0], rows))
+    payouts = [float(value) for value in rng.choice([0.85, 1.0, 1.1], rows)]
+
+    def reference() -> list[tuple[float, float]]:
+        """Row by row with np.interp over that row's own quantile table."""
+        probabilities = []
+        for market, projection, line in zip(markets, projections, lines):
+            index = engine._market_index[market]
+            bucket = int(sum(projection >= edge for edge in engine._edges[index]))
+            table = engine._quantiles[index, bucket]
+            cdf = lambda value: float(np.interp(value, table, engine.levels))
+            probabilities.append((1.0 - cdf(math.floor(line) + 0.5 - projection), cdf(math.ceil(line) - 0.5 - projection)))
+        return probabilities
+
+    scored = engine.evaluate(markets, projections, lines, sides, payouts)
+    expected = np.array(reference())
+    if not (np.allclose(scored["p_over"], expected[:, 0], atol=1e-12) and np.allclose(scored["p_under"], expected[:, 1], atol=1e-12)):
+        raise AssertionError("vectorized probabilities differ from the per-row reference")
+    pushes = 1.0 - scored["p_over"] - scored["p_under"]
+    if pushes.min() < -1e-12 or not np.all(pushes[np.asarray(lines) % 1 == 0.5] < 1e-12):
+        raise AssertionError("push probability is negative or non-zero on half-point lines")
+    print(f"Probability engine ({rows:,} board rows over {len(MARKET_TARGETS)} markets)")
+    print("  per-row parity and push handling: ok")
+    for market in ("Points", "PRA"):
+        rows_in_market = np.array([value == market for value in markets])
+        observed = float((outcomes[rows_in_market] > np.asarray(lines)[rows_in_market]).mean())
+        print(f"  {market + ' P(over)':<34} predicted {scored['p_over'][rows_in_market].mean():.3f}   observed {observed:.3f}")
+    _report(
+        "whole board",
+        _time_call(reference, 3),
+        _time_call(lambda: engine.evaluate(markets, projections, lines, sides, payouts), 20),
+    )
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "feature_row": bench_feature_row,
+    "feature_matrix": bench_feature_matrix,
+    "feature_state": bench_feature_state,
+    "game_log": bench_game_log,
+    "training_features": bench_training_features,
+    "predict_batch": bench_predict_batch,
+    "native_inference": bench_native_inference,
+    "model_load": bench_model_load,
+    "predict_frame": bench_predict_frame,
+    "joint_model": bench_joint_model,
+    "prop_probability": bench_prop_probability,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parity checks and timings for the fast feature/inference paths.")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks to run (default: all): {', '.join(BENCHMARKS)}.")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Indexed view of the nba_api static player list.
+Built once per process: exact-name hash, ID map and a trigram index for
+partial / fuzzy lookups, so resolvers never scan the full player list.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Iterable
+
+from nba_api.stats.static import players as nba_static_players
+
+_REGEX_CHARS = re.compile(r"[\\^$.|?*+()\[\]{}]")
+
+
+def normalize_player_name(value: str) -> str:
+    return " ".join(str(value).lower().replace(".", "").split())
+
+
+def _strip_accents(value: str) -> str:
+    decomposed = unicodedata.normalize("NFD", value)
+    return "".join(char for char in decomposed if unicodedata.category(char) != "Mn")
+
+
+def _search_key(value: str) -> str:
+    return _strip_accents(str(value)).lower()
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[index:index + 3] for index in range(len(value) - 2)}
+
+
+def _resolve_sort_key(player: dict[str, Any]) -> tuple:
+    # Active players first, then the most recent debut.
+    return (
+        not player.get("is_active", False),
+        player.get("from_year") is None,
+        -(player.get("from_year") or 0),
+    )
+
+
+class _TrigramIndex:
+    """Substring lookup over a fixed list of keys; results keep list order."""
+
+    def __init__(self, keys: list[str]) -> None:
+        self.keys = keys
+        self._postings: dict[str, set[int]] = {}
+        for position, key in enumerate(keys):
+            for gram in _trigrams(key):
+                self._postings.setdefault(gram, set()).add(position)
+
+    def contains(self, needle: str) -> list[int]:
+        if not needle:
+            return list(range(len(self.keys)))
+        if len(needle) < 3:
+            return [position for position, key in enumerate(self.keys) if needle in key]
+        postings = sorted((self._postings.get(gram, set()) for gram in _trigrams(needle)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+        return sorted(position for position in candidates if needle in self.keys[position])
+
+    def similar(self, needle: str, min_similarity: float) -> list[tuple[float, int]]:
+        grams = _trigrams(needle)
+        if not grams:
+            return []
+        overlap: dict[int, int] = {}
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                overlap[position] = overlap.get(position, 0) + 1
+        scored = []
+        for position, shared in overlap.items():
+            similarity = shared / len(grams | _trigrams(self.keys[position]))
+            if similarity >= min_similarity:
+                scored.append((similarity, position))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored
+
+
+class PlayerDirectory:
+    def __init__(self, players: Iterable[dict[str, Any]]) -> None:
+        self._players = list(players)
+        self._by_id = {int(player["id"]): player for player in self._players}
+        normalized = [normalize_player_name(player.get("full_name", "")) for player in self._players]
+        self._by_name: dict[str, list[dict[str, Any]]] = {}
+        for name, player in zip(normalized, self._players):
+            self._by_name.setdefault(name, []).append(player)
+        for candidates in self._by_name.values():
+            candidates.sort(key=_resolve_sort_key)
+        self._name_index = _TrigramIndex(normalized)
+        self._search_index = _TrigramIndex([_search_key(player.get("full_name", "")) for player in self._players])
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def get(self, player_id: Any) -> dict[str, Any] | None:
+        try:
+            return self._by_id.get(int(player_id))
+        except (TypeError, ValueError):
+            return None
+
+    def full_name(self, player_id: Any) -> str:
+        return str((self.get(player_id) or {}).get("full_name", ""))
+
+    def resolve_id(self, full_name: str) -> int | None:
+        """Exact normalized-name match first, then substring match."""
+        normalized_target = normalize_player_name(full_name)
+        exact_matches = self._by_name.get(normalized_target)
+        if exact_matches:
+            return int(exact_matches[0]["id"])
+        partial_matches = [self._players[position] for position in self._name_index.contains(normalized_target)]
+        if not partial_matches:
+            return None
+        partial_matches.sort(key=_resolve_sort_key)
+        return int(partial_matches[0]["id"])
+
+    def search(self, query: str, limit: int = 20, min_similarity: float = 0.35) -> list[dict[str, Any]]:
+        """Case/accent-insensitive substring search, falling back to trigram similarity."""
+        query_lower = query.lower().strip()
+        if _REGEX_CHARS.search(query):
+            found = nba_static_players.find_players_by_full_name(query)
+        else:
+            found = [self._players[position] for position in self._search_index.contains(_search_key(query))]
+        if not found:
+            # Nothing contains the query: rank near-misses by trigram similarity.
+            return [
+                self._players[position]
+                for _, position in self._search_index.similar(_search_key(query_lower), min_similarity)[:limit]
+            ]
+        found = sorted(
+            found,
+            key=lambda player: (
+                player["full_name"].lower() != query_lower,
+                player["last_name"].lower() != query_lower,
+                not player.get("is_active", False),
+                player["full_name"],
+            ),
+        )
+        return found[:limit]
+
+
+@lru_cache(maxsize=1)
+def get_player_directory() -> PlayerDirectory:
+    return PlayerDirectory(nba_static_players.get_players())
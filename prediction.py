@@ -1,15 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from api_client import NBAApiClient
+from config import settings
+from feature_state import player_feature_row
 from live_context import build_upcoming_context
 from modeling import load_predictor_bundle
+from nba_scheduler import current_priority, request_priority
 
+BATCH_CONTEXT_WORKERS = 6
 
-def predict_player_statline(player_id, opponent_abbr=None, game_date=None, home=None):
-    client = NBAApiClient()
+
+def _prepare_prediction_inputs(client, player_id, opponent_abbr=None, game_date=None, home=None):
     game_logs = client.get_player_statistics(player_id)
     if not game_logs:
         raise ValueError(f"No game logs found for player_id={player_id}.")
 
-    bundle = load_predictor_bundle()
     upcoming_context = build_upcoming_context(
         game_logs,
         opponent_abbr=opponent_abbr,
@@ -17,11 +22,83 @@ def predict_player_statline(player_id, opponent_abbr=None, game_date=None, home=
         player_id=player_id,
         home=home,
     )
-    predictions = bundle.predict(game_logs, upcoming_context=upcoming_context)
+    feature_row = None
+    if not settings.rapidapi_key:
+        # nba_api logs are the stored season logs, so the incremental state can stand in for a full rebuild.
+        try:
+            feature_row = player_feature_row(player_id, settings.season_start_year, game_logs, upcoming_context)
+        except Exception as exc:
+            print(f"Feature state error for {player_id}: {exc}")
+    return game_logs, upcoming_context, feature_row
+
+
+def predict_player_statline(player_id, opponent_abbr=None, game_date=None, home=None):
+    bundle = load_predictor_bundle()
+    game_logs, upcoming_context, feature_row = _prepare_prediction_inputs(
+        NBAApiClient(),
+        player_id,
+        opponent_abbr=opponent_abbr,
+        game_date=game_date,
+        home=home,
+    )
+    predictions = bundle.predict(game_logs, upcoming_context=upcoming_context, feature_row=feature_row)
+    return _finish_prediction(predictions, upcoming_context)
+
+
+def predict_player_statlines(requests, max_workers=BATCH_CONTEXT_WORKERS):
+    """
+    predict_player_statline for many players. Logs and context load on a
+    thread pool, then the models run once per target for the whole batch.
+    requests are dicts of predict_player_statline keyword arguments; each
+    result is the prediction dict or the exception raised for that player.
+    """
+    if not requests:
+        return []
+    try:
+        bundle = load_predictor_bundle()
+    except Exception as exc:
+        return [exc] * len(requests)
+    client = NBAApiClient()
+    # Worker threads inherit the caller's NBA stats priority (prewarm runs as background).
+    fetch_priority = current_priority()
+
+    def _prepare(request):
+        with request_priority(fetch_priority):
+            try:
+                return _prepare_prediction_inputs(client, **request)
+            except Exception as exc:
+                return exc
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(requests)))) as executor:
+        prepared = list(executor.map(_prepare, requests))
+
+    results = list(prepared)
+    ready = [index for index, inputs in enumerate(prepared) if not isinstance(inputs, Exception)]
+    if ready:
+        try:
+            batch = bundle.predict_batch(
+                [prepared[index][0] for index in ready],
+                [prepared[index][1] for index in ready],
+                [prepared[index][2] for index in ready],
+            )
+        except Exception as exc:
+            batch = [exc] * len(ready)
+        for index, predictions in zip(ready, batch):
+            if isinstance(predictions, Exception):
+                results[index] = predictions
+            else:
+                try:
+                    results[index] = _finish_prediction(predictions, prepared[index][1])
+                except Exception as exc:
+                    results[index] = exc
+    return results
+
 
+def _finish_prediction(predictions, upcoming_context):
     # Surface teammate context for display
     predictions["teammate_availability"] = round(float(upcoming_context.get("teammate_availability", 1.0)), 3)
     predictions["minutes_opportunity_factor"] = round(float(upcoming_context.get("minutes_opportunity_factor", 1.0)), 3)
+    predictions["context_version"] = upcoming_context.get("context_version", "unloaded")
 
     # Surface game-day status
     predictions["game_status"] = upcoming_context.get("game_status", "unknown")
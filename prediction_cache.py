@@ -0,0 +1,203 @@
+"""
+Versioned prediction cache.
+Entries are keyed on (player_id, opponent_abbr, game_date) and stamped with
+the versions they were computed under: the player's game-log version, read
+from the shared game-log store so every worker sees another process's merge,
+the context version (dashboards plus injury report) and the model version. A
+lookup only hits when every stamp still matches and the entry is younger than
+the TTL. The game-log store, the injury refresher and model reloads also call
+the invalidation hooks, which drop the affected entries right away.
+
+Eviction is a segmented LRU over estimated bytes: an entry that is read again
+after being stored moves to a protected segment, so one pass over a board of
+new players evicts other one-off entries before the players every page asks for.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+_caches: dict[str, "PredictionCache"] = {}
+_caches_lock = threading.Lock()
+# Share of max_bytes the protected segment may hold before its LRU entries drop back to probation.
+_PROTECTED_SHARE = 0.8
+
+
+@dataclass
+class _Entry:
+    value: Any
+    versions: tuple
+    stored_at: float
+    size: int
+
+
+def _approximate_size(value: Any) -> int:
+    """Shallow sys.getsizeof of value and its direct members; predictions are flat tuples and dicts."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(key) + sys.getsizeof(item) for key, item in value.items())
+    elif isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class PredictionCache:
+    def __init__(self, name: str, ttl: float, max_bytes: int) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._probation: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._protected: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._probation_bytes = 0
+        self._protected_bytes = 0
+        self._context_generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.outdated = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.rejected = 0
+        with _caches_lock:
+            _caches[name] = self
+
+    def versions(self, game_log_version: Hashable, context_version: str, model_version: str) -> tuple:
+        """The stamp a prediction computed right now from a player's logs at game_log_version would carry."""
+        with self._lock:
+            return (game_log_version, self._context_generation, context_version, model_version)
+
+    def get(self, key: Hashable, versions: tuple) -> Any | None:
+        now = time.time()
+        with self._lock:
+            entry = self._protected.get(key)
+            segment = self._protected
+            if entry is None:
+                entry = self._probation.get(key)
+                segment = self._probation
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.versions != versions or now - entry.stored_at >= self.ttl:
+                if entry.versions != versions:
+                    self.outdated += 1
+                else:
+                    self.expired += 1
+                self.misses += 1
+                self._remove(key)
+                return None
+            self.hits += 1
+            if segment is self._protected:
+                self._protected.move_to_end(key)
+            else:
+                self._promote(key)
+            return entry.value
+
+    def put(self, key: Hashable, versions: tuple, value: Any, context_version: str | None = None) -> bool:
+        """
+        Store value under the versions captured before it was computed, with
+        context_version replaced by the one value was actually built from when
+        the caller knows it. Returns False without storing when the context was
+        invalidated in the meantime, since value may predate the new data. New
+        or corrected games need no check here: the game-log version was read before
+        value was computed, so an entry built across a merge is outdated on its next lookup.
+        """
+        size = _approximate_size(key) + _approximate_size(value)
+        game_log_version, context_generation, captured_context, model_version = versions
+        with self._lock:
+            if context_generation != self._context_generation:
+                self.rejected += 1
+                return False
+            versions = (game_log_version, context_generation, context_version or captured_context, model_version)
+            self._remove(key)
+            self._probation[key] = _Entry(value=value, versions=versions, stored_at=time.time(), size=size)
+            self._probation_bytes += size
+            self._evict()
+            return True
+
+    def invalidate_players(self, player_ids: Iterable[str]) -> int:
+        """New or corrected games for these players were stored by this process: drop their entries now rather than on their next lookup."""
+        player_ids = {str(player_id) for player_id in player_ids}
+        if not player_ids:
+            return 0
+        with self._lock:
+            dropped = [key for segment in (self._probation, self._protected) for key in segment if str(key[0]) in player_ids]
+            for key in dropped:
+                self._remove(key)
+            self.invalidations += len(dropped)
+            return len(dropped)
+
+    def invalidate_context(self) -> int:
+        """Injury report or other shared context changed: every entry is outdated."""
+        with self._lock:
+            self._context_generation += 1
+            return self._clear()
+
+    def clear(self) -> int:
+        """Drop everything, e.g. after a model swap (entries are already keyed on the model version)."""
+        with self._lock:
+            return self._clear()
+
+    def _clear(self) -> int:
+        dropped = len(self._probation) + len(self._protected)
+        self._probation.clear()
+        self._protected.clear()
+        self._probation_bytes = self._protected_bytes = 0
+        self.invalidations += dropped
+        return dropped
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._probation.pop(key, None)
+        if entry is not None:
+            self._probation_bytes -= entry.size
+        entry = self._protected.pop(key, None)
+        if entry is not None:
+            self._protected_bytes -= entry.size
+
+    def _promote(self, key: Hashable) -> None:
+        entry = self._probation.pop(key)
+        self._probation_bytes -= entry.size
+        self._protected[key] = entry
+        self._protected_bytes += entry.size
+        while self._protected_bytes > self.max_bytes * _PROTECTED_SHARE and len(self._protected) > 1:
+            demoted_key, demoted = self._protected.popitem(last=False)
+            self._protected_bytes -= demoted.size
+            self._probation[demoted_key] = demoted
+            self._probation_bytes += demoted.size
+
+    def _evict(self) -> None:
+        while self._probation_bytes + self._protected_bytes > self.max_bytes:
+            segment = self._probation if self._probation else self._protected
+            _, entry = segment.popitem(last=False)
+            if segment is self._probation:
+                self._probation_bytes -= entry.size
+            else:
+                self._protected_bytes -= entry.size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._probation) + len(self._protected),
+                "protected": len(self._protected),
+                "bytes": self._probation_bytes + self._protected_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "outdated": self.outdated,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "rejected": self.rejected,
+            }
+
+
+def prediction_cache_stats() -> dict[str, dict[str, Any]]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
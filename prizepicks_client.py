@@ -3,12 +3,13 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
 from typing import Any
 
 import requests
 
 from config import settings
+from http_replay import build_session
+from swr_cache import SWRCache
 
 
 STAT_NAME_MAP = {
@@ -87,8 +88,13 @@ class PrizePicksClient:
     }
 
     def __init__(self) -> None:
-        self.session = requests.Session()
+        self.session = build_session()
         self.session.headers.update(self._HEADERS)
+        self._board_cache = SWRCache(
+            "prizepicks.board_entries",
+            ttl=settings.board_cache_ttl_seconds,
+            max_stale=settings.board_cache_max_stale_seconds,
+        )
 
     def is_configured(self) -> bool:
         return True
@@ -171,8 +177,10 @@ class PrizePicksClient:
             e.market_label,
         ))
 
-    @lru_cache(maxsize=2)
     def _cached_board_entries(self, sport: str = "nba") -> tuple[PrizePicksBoardEntry, ...]:
+        return self._board_cache.get(sport, lambda: self._load_board_entries(sport))
+
+    def _load_board_entries(self, sport: str = "nba") -> tuple[PrizePicksBoardEntry, ...]:
         league_id = settings.prizepicks_ncaab_league_id if sport == "ncaab" else settings.prizepicks_nba_league_id
         last_exc = None
         for attempt in range(3):
@@ -190,9 +198,21 @@ class PrizePicksClient:
                 raise PrizePicksProviderError(f"PrizePicks request failed: {exc}") from exc
         raise PrizePicksProviderError("PrizePicks rate limited after 3 attempts") from last_exc
 
-    def fetch_board_entries(self, sport: str = "nba") -> list[PrizePicksBoardEntry]:
+    def fetch_board_entries(self, sport: str = "nba", *, fresh: bool = False) -> list[PrizePicksBoardEntry]:
+        """Cached board; fresh=True refetches it now (the last good board is kept if that fails)."""
+        if fresh:
+            return list(self._board_cache.reload(sport, lambda: self._load_board_entries(sport)))
         return list(self._cached_board_entries(sport))
 
+    def board_fetched_at(self, sport: str = "nba") -> float | None:
+        entry = self._board_cache.peek(sport)
+        return entry[0] if entry is not None else None
+
+    def board_start_times(self, sport: str = "nba") -> list[datetime]:
+        """Start times on the cached board, without fetching it."""
+        entry = self._board_cache.peek(sport)
+        return [start for start in (_parse_datetime(board_entry.start_time) for board_entry in (entry[1] if entry else ())) if start]
+
     def fetch_player_lines(
         self,
         *,
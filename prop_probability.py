@@ -0,0 +1,180 @@
+"""
+Over/under probabilities for prop lines.
+Training stores per-market residual quantiles (actual - projection on the
+validation split) in model_metadata.json under "residuals". Combo markets
+such as PRA use the summed residuals of their components, so the correlation
+between a player's points, assists and rebounds is kept. Residuals are split
+into projection buckets because a 30-point projection misses by more than a
+6-point one.
+
+ProbabilityEngine.evaluate scores a whole board in one NumPy pass. Stats are
+whole numbers, so a line of 25 pushes at exactly 25: P(over) is P(actual >= 26)
+and P(under) is P(actual <= 24). Metadata written before residuals were stored
+falls back to normal residuals scaled from each target's validation MAE.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Mapping, Sequence
+from statistics import NormalDist
+from typing import Any
+
+import numpy as np
+
+MARKET_TARGETS: dict[str, tuple[str, ...]] = {
+    "Points": ("points",),
+    "Assists": ("assists",),
+    "Rebounds": ("rebounds",),
+    "Points + Rebounds": ("points", "rebounds"),
+    "Points + Assists": ("points", "assists"),
+    "Assists + Rebounds": ("assists", "rebounds"),
+    "PRA": ("points", "assists", "rebounds"),
+}
+QUANTILE_LEVELS = np.linspace(0.005, 0.995, 100)
+PROJECTION_BUCKETS = 4
+# Validation rows per projection bucket needed before residuals are split by projection.
+_MIN_BUCKET_ROWS = 200
+
+_engine_lock = threading.Lock()
+_engine_cache: tuple[str, "ProbabilityEngine | None"] | None = None
+
+
+def fit_residuals(actual: Mapping[str, Any], predicted: Mapping[str, Any]) -> dict[str, Any]:
+    """model_metadata.json "residuals" entry from validation targets and predictions keyed by target."""
+    markets = {}
+    for label, targets in MARKET_TARGETS.items():
+        if any(target not in actual or target not in predicted for target in targets):
+            continue
+        projection = sum(np.asarray(predicted[target], dtype=np.float64) for target in targets)
+        residual = sum(np.asarray(actual[target], dtype=np.float64) for target in targets) - projection
+        finite = np.isfinite(projection) & np.isfinite(residual)
+        projection, residual = projection[finite], residual[finite]
+        if not len(residual):
+            continue
+
+        buckets = max(1, min(PROJECTION_BUCKETS, len(residual) // _MIN_BUCKET_ROWS))
+        edges = np.unique(np.quantile(projection, np.linspace(0.0, 1.0, buckets + 1)[1:-1]))
+        bucket_index = np.searchsorted(edges, projection, side="right")
+        if np.bincount(bucket_index, minlength=len(edges) + 1).min() == 0:
+            edges = np.empty(0)
+            bucket_index = np.zeros(len(residual), dtype=np.intp)
+        markets[label] = {
+            "rows": int(len(residual)),
+            "edges": [round(float(edge), 4) for edge in edges],
+            "quantiles": [
+                [round(float(value), 4) for value in np.quantile(residual[bucket_index == bucket], QUANTILE_LEVELS)]
+                for bucket in range(len(edges) + 1)
+            ],
+        }
+    return {"levels": [round(float(level), 6) for level in QUANTILE_LEVELS], "markets": markets}
+
+
+def _normal_residuals(metadata: dict[str, Any]) -> dict[str, Any] | None:
+    """Stand-in "residuals" entry for older metadata: normal errors with sigma = MAE * sqrt(pi / 2)."""
+    sigmas = {}
+    for target, payload in metadata.get("targets", {}).items():
+        mae = (payload.get("metrics") or {}).get("mae")
+        if mae:
+            sigmas[target] = float(mae) * math.sqrt(math.pi / 2)
+    markets = {}
+    for label, targets in MARKET_TARGETS.items():
+        if any(target not in sigmas for target in targets):
+            continue
+        # Components treated as independent, which understates the spread of combos; retrain to get measured ones.
+        distribution = NormalDist(0.0, math.sqrt(sum(sigmas[target] ** 2 for target in targets)))
+        markets[label] = {"edges": [], "quantiles": [[distribution.inv_cdf(float(level)) for level in QUANTILE_LEVELS]]}
+    if not markets:
+        return None
+    return {"levels": QUANTILE_LEVELS.tolist(), "markets": markets}
+
+
+class ProbabilityEngine:
+    def __init__(self, residuals: dict[str, Any]) -> None:
+        self.levels = np.asarray(residuals["levels"], dtype=np.float64)
+        markets = residuals["markets"]
+        self.markets = list(markets)
+        self._market_index = {label: index for index, label in enumerate(self.markets)}
+        buckets = max(len(payload["quantiles"]) for payload in markets.values())
+        # Padded to the widest market: unused edges are +inf, so no projection counts past a market's last bucket.
+        self._edges = np.full((len(markets), buckets - 1), np.inf)
+        self._quantiles = np.empty((len(markets), buckets, len(self.levels)))
+        for index, payload in enumerate(markets.values()):
+            self._edges[index, : len(payload["edges"])] = payload["edges"]
+            quantiles = np.asarray(payload["quantiles"], dtype=np.float64)
+            self._quantiles[index, : len(quantiles)] = quantiles
+            self._quantiles[index, len(quantiles) :] = quantiles[-1]
+
+    @classmethod
+    def from_metadata(cls, metadata: dict[str, Any]) -> ProbabilityEngine | None:
+        residuals = metadata.get("residuals") or _normal_residuals(metadata)
+        if not residuals or not residuals.get("markets"):
+            return None
+        return cls(residuals)
+
+    def _cdf(self, tables: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """P(residual <= value) per row, interpolated linearly between that row's quantiles and clamped to the outer levels."""
+        upper = np.clip((tables <= values[:, None]).sum(axis=1), 1, len(self.levels) - 1)
+        lower = upper - 1
+        rows = np.arange(len(values))
+        low, high = tables[rows, lower], tables[rows, upper]
+        span = high - low
+        fraction = np.where(span > 0, (values - low) / np.where(span > 0, span, 1.0), (values >= high).astype(np.float64))
+        fraction = np.clip(fraction, 0.0, 1.0)
+        return self.levels[lower] + fraction * (self.levels[upper] - self.levels[lower])
+
+    def evaluate(
+        self,
+        markets: Sequence[str],
+        projections: Sequence[float],
+        lines: Sequence[float | None],
+        sides: Sequence[int] | None = None,
+        payouts: Sequence[float | None] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Probabilities for a board in one pass. sides holds 1 for an over pick,
+        -1 for under and 0 to take the likelier side; payouts are per-pick
+        multipliers on an even-money stake (None for 1.0). Returns p_over,
+        p_under, side, win_probability and expected_value (profit per unit
+        staked, pushes refunded); rows with an unknown market or no line are NaN.
+        """
+        count = len(markets)
+        market_index = np.array([self._market_index.get(market, -1) for market in markets], dtype=np.intp)
+        projection = np.asarray(projections, dtype=np.float64)
+        line = np.array([np.nan if value is None else value for value in lines], dtype=np.float64)
+        side = np.zeros(count, dtype=np.int8) if sides is None else np.asarray(sides, dtype=np.int8)
+        payout = np.ones(count) if payouts is None else np.array([1.0 if value is None else value for value in payouts], dtype=np.float64)
+
+        valid = (market_index >= 0) & np.isfinite(projection) & np.isfinite(line)
+        p_over = np.full(count, np.nan)
+        p_under = np.full(count, np.nan)
+        if valid.any():
+            market_index, projection, line = market_index[valid], projection[valid], line[valid]
+            bucket = (projection[:, None] >= self._edges[market_index]).sum(axis=1)
+            tables = self._quantiles[market_index, bucket]
+            p_over[valid] = 1.0 - self._cdf(tables, np.floor(line) + 0.5 - projection)
+            p_under[valid] = self._cdf(tables, np.ceil(line) - 0.5 - projection)
+
+        side = np.where(side != 0, side, np.where(p_over >= p_under, 1, -1))
+        win_probability = np.where(side > 0, p_over, p_under)
+        lose_probability = np.where(side > 0, p_under, p_over)
+        expected_value = win_probability * (2.0 * payout - 1.0) - lose_probability
+        return {
+            "p_over": p_over,
+            "p_under": p_under,
+            "side": side,
+            "win_probability": win_probability,
+            "expected_value": expected_value,
+        }
+
+
+def probability_engine(metadata: dict[str, Any], version: str) -> ProbabilityEngine | None:
+    """The engine for a model bundle's metadata, built once per bundle version."""
+    global _engine_cache
+    cached = _engine_cache
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _engine_lock:
+        if _engine_cache is None or _engine_cache[0] != version:
+            _engine_cache = (version, ProbabilityEngine.from_metadata(metadata))
+        return _engine_cache[1]
@@ -0,0 +1,101 @@
+"""
+Per-key request coalescing ("single flight").
+While a call for a key is running, other callers for the same key wait for its
+result instead of issuing their own upstream request. Each named group counts
+how many calls it absorbed so duplicate fetches can be checked at runtime.
+"""
+from __future__ import annotations
+
+import threading
+from functools import wraps
+from typing import Any, Callable, Hashable
+
+_groups: dict[str, "SingleFlight"] = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+def get_group(name: str) -> SingleFlight:
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = SingleFlight(name)
+            _groups[name] = group
+        return group
+
+
+def coalesced(name: str) -> Callable:
+    """Decorator: concurrent calls with the same arguments share one execution."""
+    group = get_group(name)
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            return group.do(key, lambda: fn(*args, **kwargs))
+        return wrapper
+
+    return decorator
+
+
+def singleflight_stats() -> dict[str, dict[str, int]]:
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,204 @@
+"""
+Stale-while-revalidate cache.
+Fresh entries are returned as-is. Once an entry passes its TTL it is still
+returned immediately while a single background refresh runs for that key;
+only entries older than ttl + max_stale (or missing) are loaded inline.
+A failed refresh keeps serving the last good value. With error_ttl set, a
+failed inline load of a missing key is remembered for that long and re-raised
+without calling the loader again, so a down upstream is not retried per request.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+from nba_scheduler import BACKGROUND, request_priority
+from singleflight import get_group
+
+_caches: dict[str, "SWRCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class BackgroundRefresher:
+    """Runs refresh jobs on a small pool, at most one pending job per key."""
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="swr-refresh")
+        self._pending: set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, fn: Callable[[], Any]) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        self._executor.submit(self._run, key, fn)
+        return True
+
+    def _run(self, key: Hashable, fn: Callable[[], Any]) -> None:
+        try:
+            with request_priority(BACKGROUND):
+                fn()
+        except Exception as exc:
+            print(f"Background refresh error ({key}): {exc}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+
+_refresher = BackgroundRefresher()
+
+
+def refresh_in_background(key: Hashable, fn: Callable[[], Any]) -> bool:
+    """Queue fn() on the shared refresh pool unless a refresh for key is already pending."""
+    return _refresher.submit(key, fn)
+
+
+class SWRCache:
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_stale: float,
+        ttl_for: Callable[[Any], float] | None = None,
+        error_ttl: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.ttl_for = ttl_for
+        self.error_ttl = error_ttl
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._failures: dict[Hashable, tuple[float, Exception]] = {}
+        self._versions: dict[Hashable, int] = {}
+        self._loaders: dict[Hashable, Callable[[], Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._flight = get_group(f"swr.{name}")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+        self.error_hits = 0
+        with _caches_lock:
+            _caches[name] = self
+
+    def _entry_ttl(self, value: Any) -> float:
+        return self.ttl_for(value) if self.ttl_for is not None else self.ttl
+
+    def peek(self, key: Hashable = None) -> tuple[float, Any] | None:
+        """(stored_at, value) without triggering a load."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any, stored_at: float | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries[key] = (time.time() if stored_at is None else stored_at, value)
+            self._versions[key] = self._generation
+
+    def version(self, key: Hashable = None) -> tuple[int, float] | None:
+        """(generation, stored_at) of the value currently served for key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return self._versions[key], entry[0]
+
+    def refresh_all(self) -> int:
+        """Queue a background refresh of every loaded key; never blocks readers."""
+        with self._lock:
+            loaders = list(self._loaders.items())
+        for key, loader in loaders:
+            refresh_in_background((self.name, key), lambda key=key, loader=loader: self._refresh(key, loader))
+        return len(loaders)
+
+    def invalidate(self, key: Hashable = None, *, all_keys: bool = False) -> None:
+        with self._lock:
+            if all_keys:
+                self._entries.clear()
+                self._loaders.clear()
+                self._failures.clear()
+            else:
+                self._entries.pop(key, None)
+                self._loaders.pop(key, None)
+                self._failures.pop(key, None)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = loader()
+        self.set(key, value)
+        with self._lock:
+            self._loaders[key] = loader
+            self._failures.pop(key, None)
+        return value
+
+    def reload(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Load key now and swap the new value in, coalesced with any load already
+        running for it. On failure the previous value stays in place and the
+        error is raised to the caller.
+        """
+        try:
+            return self._flight.do(key, lambda: self._load(key, loader))
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+            raise
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        self.reload(key, loader)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        now = time.time()
+        entry = self.peek(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = now - stored_at
+            ttl = self._entry_ttl(value)
+            if age < ttl:
+                self.hits += 1
+                return value
+            if age < ttl + self.max_stale:
+                self.stale_hits += 1
+                refresh_in_background((self.name, key), lambda: self._refresh(key, loader))
+                return value
+
+        if entry is None and self.error_ttl:
+            with self._lock:
+                failure = self._failures.get(key)
+            if failure is not None and now - failure[0] < self.error_ttl:
+                self.error_hits += 1
+                raise failure[1].with_traceback(None)
+
+        self.misses += 1
+        try:
+            return self._flight.do(key, lambda: self._load(key, loader))
+        except Exception as exc:
+            if entry is None:
+                if self.error_ttl:
+                    with self._lock:
+                        self._failures[key] = (time.time(), exc)
+                raise
+            print(f"{self.name} refresh error, serving last good value: {exc}")
+            return entry[1]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "generation": self._generation,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refresh_errors": self.refresh_errors,
+            "error_hits": self.error_hits,
+        }
+
+
+def swr_stats() -> dict[str, dict[str, Any]]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
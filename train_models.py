@@ -3,7 +3,10 @@ from __future__ import annotations
 import argparse
 import json
 import pickle
+import re
+import time
 from pathlib import Path
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
@@ -12,6 +15,8 @@ from sklearn.impute import SimpleImputer
 from sklearn.metrics import mean_absolute_error, r2_score, root_mean_squared_error
 from sklearn.pipeline import Pipeline
 
+from prop_probability import fit_residuals
+
 
 TARGET_COLUMNS = ["points", "assists", "rebounds"]
 AUXILIARY_TARGETS = ["minutes"]
@@ -200,7 +205,44 @@ def _add_team_context_features(frame: pd.DataFrame) -> pd.DataFrame:
     return enriched
 
 
-def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
+_STAT_SOURCES = {
+    "points": "points",
+    "assists": "assists",
+    "rebounds": "rebounds",
+    "minutes": "minutes",
+    "fg_pct": "fg_pct",
+    "three_pt_pct": "three_pt_pct",
+    "ft_pct": "ft_pct",
+    "usage_rate": "usage_rate",
+    "true_shooting_pct": "true_shooting_pct",
+    "player_pace": "player_pace",
+    "opp_def_rating": "opp_def_rating",
+    "opp_pace": "opp_pace",
+    "steals": "steals",
+    "blocks": "blocks",
+    "turnovers": "turnovers",
+    "off_rebounds": "off_rebounds",
+    "def_rebounds": "def_rebounds",
+    "plus_minus": "plus_minus",
+    "player_off_rating": "player_off_rating",
+    "player_def_rating": "player_def_rating",
+    "starter": "starter",
+}
+_ROLE_SIGNAL_COLUMNS = ("lead_role_game", "heavy_load_game", "rotation_role_game", "bench_risk_game")
+_ASSIST_SPECIALTY_SOURCES = {
+    "assists_per_minute": "assists_per_minute_raw",
+    "points_per_minute": "points_per_minute_raw",
+    "rebounds_per_minute": "rebounds_per_minute_raw",
+    "assist_to_turnover": "assist_to_turnover_raw",
+    "assist_share": "assist_share_raw",
+    "assist_plus_usage": "assist_plus_usage_raw",
+    "assist_creation": "assist_creation_raw",
+    "assist_load": "assist_load_raw",
+}
+_ROLLING_WINDOWS = (3, 5, 10)
+
+
+def _prepare_feature_frame(frame: pd.DataFrame) -> pd.DataFrame:
     ordered = frame.sort_values(["player_id", "game_date"]).copy()
     ordered = _add_team_context_features(ordered)
     for column_name, default_value in OPTIONAL_NUMERIC_DEFAULTS.items():
@@ -208,63 +250,10 @@ def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
             ordered[column_name] = default_value
         ordered[column_name] = pd.to_numeric(ordered[column_name], errors="coerce").fillna(default_value)
 
-    engineered_columns = {}
-    stat_sources = {
-        "points": "points",
-        "assists": "assists",
-        "rebounds": "rebounds",
-        "minutes": "minutes",
-        "fg_pct": "fg_pct",
-        "three_pt_pct": "three_pt_pct",
-        "ft_pct": "ft_pct",
-        "usage_rate": "usage_rate",
-        "true_shooting_pct": "true_shooting_pct",
-        "player_pace": "player_pace",
-        "opp_def_rating": "opp_def_rating",
-        "opp_pace": "opp_pace",
-        "steals": "steals",
-        "blocks": "blocks",
-        "turnovers": "turnovers",
-        "off_rebounds": "off_rebounds",
-        "def_rebounds": "def_rebounds",
-        "plus_minus": "plus_minus",
-        "player_off_rating": "player_off_rating",
-        "player_def_rating": "player_def_rating",
-        "starter": "starter",
-    }
-    role_signals = {
-        "lead_role_game": (ordered["minutes"] >= 30).astype(float),
-        "heavy_load_game": (ordered["minutes"] >= 34).astype(float),
-        "rotation_role_game": (ordered["minutes"] >= 24).astype(float),
-        "bench_risk_game": (ordered["minutes"] < 20).astype(float),
-    }
-    for column_name, values in role_signals.items():
-        ordered[column_name] = values
-
-    for feature_name, source_column in stat_sources.items():
-        for window in (3, 5, 10):
-            engineered_columns[f"{feature_name}_rolling_{window}"] = (
-                ordered.groupby("player_id")[source_column]
-                .transform(lambda series: series.shift(1).rolling(window, min_periods=1).mean())
-            )
-            engineered_columns[f"{feature_name}_rolling_std_{window}"] = (
-                ordered.groupby("player_id")[source_column]
-                .transform(lambda series: series.shift(1).rolling(window, min_periods=2).std())
-            )
-        engineered_columns[f"{feature_name}_season_avg"] = (
-            ordered.groupby("player_id")[source_column]
-            .transform(lambda series: series.shift(1).expanding().mean())
-            .reset_index(level=0, drop=True)
-        )
-        engineered_columns[f"{feature_name}_last_game"] = ordered.groupby("player_id")[source_column].shift(1)
-
-    for source_column in ("lead_role_game", "heavy_load_game", "rotation_role_game", "bench_risk_game"):
-        feature_prefix = source_column.removesuffix("_game")
-        for window in (5, 10):
-            engineered_columns[f"{feature_prefix}_rate_{window}"] = (
-                ordered.groupby("player_id")[source_column]
-                .transform(lambda series: series.shift(1).rolling(window, min_periods=1).mean())
-            )
+    ordered["lead_role_game"] = (ordered["minutes"] >= 30).astype(float)
+    ordered["heavy_load_game"] = (ordered["minutes"] >= 34).astype(float)
+    ordered["rotation_role_game"] = (ordered["minutes"] >= 24).astype(float)
+    ordered["bench_risk_game"] = (ordered["minutes"] < 20).astype(float)
 
     safe_minutes = ordered["minutes"].replace(0, np.nan)
     safe_turnovers = ordered["turnovers"].replace(0, np.nan)
@@ -277,31 +266,10 @@ def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
     ordered["assist_plus_usage_raw"] = ordered["assists"] + (ordered["usage_rate"] * 10.0)
     ordered["assist_creation_raw"] = ordered["assists_per_minute_raw"] * ordered["usage_rate"]
     ordered["assist_load_raw"] = ordered["assists"] * ordered["minutes"]
+    return ordered
 
-    assist_specialty_sources = {
-        "assists_per_minute": "assists_per_minute_raw",
-        "points_per_minute": "points_per_minute_raw",
-        "rebounds_per_minute": "rebounds_per_minute_raw",
-        "assist_to_turnover": "assist_to_turnover_raw",
-        "assist_share": "assist_share_raw",
-        "assist_plus_usage": "assist_plus_usage_raw",
-        "assist_creation": "assist_creation_raw",
-        "assist_load": "assist_load_raw",
-    }
-    for feature_name, source_column in assist_specialty_sources.items():
-        for window in (3, 5, 10):
-            engineered_columns[f"{feature_name}_rolling_{window}"] = (
-                ordered.groupby("player_id")[source_column]
-                .transform(lambda series: series.shift(1).rolling(window, min_periods=1).mean())
-            )
-        engineered_columns[f"{feature_name}_season_avg"] = (
-            ordered.groupby("player_id")[source_column]
-            .transform(lambda series: series.shift(1).expanding().mean())
-            .reset_index(level=0, drop=True)
-        )
-        engineered_columns[f"{feature_name}_last_game"] = ordered.groupby("player_id")[source_column].shift(1)
 
-    engineered = pd.DataFrame(engineered_columns, index=ordered.index)
+def _add_matchup_features(engineered: pd.DataFrame, ordered: pd.DataFrame) -> None:
     engineered["projected_minutes"] = (
         engineered["minutes_rolling_3"] * 0.5
         + engineered["minutes_rolling_5"] * 0.35
@@ -334,11 +302,9 @@ def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
     engineered["assist_stability_index"] = engineered["assists_rolling_10"] - engineered["assists_rolling_std_10"]
     engineered["playmaking_pressure_index"] = ordered["team_assists_form_5"] - ordered["opp_assists_allowed_5"]
 
-    # Role stability features
-    engineered["minutes_volatility_10"] = (
-        ordered.groupby("player_id")["minutes"]
-        .transform(lambda s: s.shift(1).rolling(10, min_periods=2).std())
-    )
+
+def _add_role_stability_features(engineered: pd.DataFrame, ordered: pd.DataFrame) -> None:
+    """Everything after minutes_volatility_10, which each builder computes itself."""
     engineered["starter_rate_5"] = engineered["starter_rolling_5"]
     engineered["starter_rate_10"] = engineered["starter_rolling_10"]
     safe_minutes_10 = engineered["minutes_rolling_10"].replace(0, np.nan).fillna(1.0)
@@ -365,6 +331,193 @@ def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
     )
     engineered["team_pace_edge_ratio"] = ordered["team_pace"] / safe_opp_pace.replace(0, np.nan).fillna(1.0)
 
+
+def _select_feature_frame(ordered: pd.DataFrame, engineered: pd.DataFrame) -> pd.DataFrame:
+    # Pick the context columns before joining so the full working frame is never copied.
+    context_columns = [column for column in PREGAME_CONTEXT_COLUMNS if column in ordered.columns]
+    return pd.concat(
+        [ordered[["game_date", "player_id", *TARGET_COLUMNS, "minutes", *context_columns]], engineered],
+        axis=1,
+        copy=False,
+    )
+
+
+def _shift_within_player(values: np.ndarray, position: np.ndarray, lag: int) -> np.ndarray:
+    """values[i - lag] for rows at least lag games into their player's history, else NaN (rows sorted by player)."""
+    shifted = np.full_like(values, np.nan)
+    shifted[lag:] = values[:-lag]
+    shifted[position < lag] = np.nan
+    return shifted
+
+
+def _prior_rolling(
+    values: np.ndarray,
+    position: np.ndarray,
+    *,
+    with_std: bool,
+) -> tuple[dict[int, np.ndarray], dict[int, np.ndarray]]:
+    """
+    Rolling mean (min_periods=1) and sample std (min_periods=2) of each row's
+    previous 3/5/10 games, matching shift(1).rolling(window) per player.
+    """
+    totals = np.zeros_like(values)
+    counts = np.zeros_like(values)
+    means = {}
+    window_counts = {}
+    for lag in range(1, _ROLLING_WINDOWS[-1] + 1):
+        shifted = _shift_within_player(values, position, lag)
+        valid = ~np.isnan(shifted)
+        totals += np.where(valid, shifted, 0.0)
+        counts += valid
+        if lag in _ROLLING_WINDOWS:
+            window_counts[lag] = counts.copy()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means[lag] = np.where(counts >= 1, totals / counts, np.nan)
+
+    stds = {}
+    if with_std:
+        squares = {window: np.zeros_like(values) for window in _ROLLING_WINDOWS}
+        for lag in range(1, _ROLLING_WINDOWS[-1] + 1):
+            shifted = _shift_within_player(values, position, lag)
+            for window in _ROLLING_WINDOWS:
+                if lag <= window:
+                    deviation = shifted - means[window]
+                    squares[window] += np.where(np.isnan(deviation), 0.0, deviation * deviation)
+        for window in _ROLLING_WINDOWS:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stds[window] = np.where(
+                    window_counts[window] >= 2,
+                    np.sqrt(squares[window] / (window_counts[window] - 1)),
+                    np.nan,
+                )
+    return means, stds
+
+
+def _prior_expanding_mean(block: pd.DataFrame, keys: list[pd.Series]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """shift(1).expanding().mean() per group for every column at once, plus the prior non-null counts."""
+    filled = block.fillna(0.0)
+    present = block.notna().astype(float)
+    prior_totals = filled.groupby(keys).cumsum().groupby(keys).shift(1)
+    prior_counts = present.groupby(keys).cumsum().groupby(keys).shift(1)
+    means = prior_totals / prior_counts.where(prior_counts >= 1)
+    return means, prior_counts
+
+
+def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized feature builder: one sort, shifted per-player windows and
+    grouped cumulative sums instead of a Python lambda per player and column.
+    Produces the same columns as _build_features_reference.
+    """
+    ordered = _prepare_feature_frame(frame)
+    player_keys = [ordered["player_id"]]
+    position = ordered.groupby("player_id").cumcount().to_numpy()
+
+    rolling_sources = list(dict.fromkeys([*_STAT_SOURCES.values(), *_ROLE_SIGNAL_COLUMNS, *_ASSIST_SPECIALTY_SOURCES.values()]))
+    season_means, _ = _prior_expanding_mean(ordered[rolling_sources].astype(float), player_keys)
+    last_games = ordered[rolling_sources].astype(float).groupby(ordered["player_id"]).shift(1)
+
+    # Columns are written as soon as each source is rolled so at most one source's
+    # window buffers are alive at a time; 500k-row training sets stay within a few GB.
+    engineered_columns = {}
+    for feature_name, source_column in _STAT_SOURCES.items():
+        means, stds = _prior_rolling(ordered[source_column].to_numpy(dtype=float), position, with_std=True)
+        for window in _ROLLING_WINDOWS:
+            engineered_columns[f"{feature_name}_rolling_{window}"] = means[window]
+            engineered_columns[f"{feature_name}_rolling_std_{window}"] = stds[window]
+        engineered_columns[f"{feature_name}_season_avg"] = season_means[source_column].to_numpy()
+        engineered_columns[f"{feature_name}_last_game"] = last_games[source_column].to_numpy()
+    minutes_volatility_10 = engineered_columns["minutes_rolling_std_10"]
+
+    for source_column in _ROLE_SIGNAL_COLUMNS:
+        feature_prefix = source_column.removesuffix("_game")
+        means, _ = _prior_rolling(ordered[source_column].to_numpy(dtype=float), position, with_std=False)
+        for window in (5, 10):
+            engineered_columns[f"{feature_prefix}_rate_{window}"] = means[window]
+
+    for feature_name, source_column in _ASSIST_SPECIALTY_SOURCES.items():
+        means, _ = _prior_rolling(ordered[source_column].to_numpy(dtype=float), position, with_std=False)
+        for window in _ROLLING_WINDOWS:
+            engineered_columns[f"{feature_name}_rolling_{window}"] = means[window]
+        engineered_columns[f"{feature_name}_season_avg"] = season_means[source_column].to_numpy()
+        engineered_columns[f"{feature_name}_last_game"] = last_games[source_column].to_numpy()
+
+    engineered = pd.DataFrame(engineered_columns, index=ordered.index)
+    del engineered_columns, last_games
+    _add_matchup_features(engineered, ordered)
+
+    # Role stability features
+    engineered["minutes_volatility_10"] = minutes_volatility_10
+    _add_role_stability_features(engineered, ordered)
+
+    # Opponent-specific history features: how player performs against this specific team
+    if "opponent_abbr" in ordered.columns:
+        history_stats = ["points", "assists", "rebounds", "minutes"]
+        matchup_keys = [ordered["player_id"], ordered["opponent_abbr"]]
+        history = ordered[history_stats].astype(float)
+        vs_opp_means, vs_opp_counts = _prior_expanding_mean(history, matchup_keys)
+        for stat in history_stats:
+            engineered[f"vs_opp_{stat}_avg"] = vs_opp_means[stat].fillna(season_means[stat])
+        engineered["vs_opp_games_count"] = vs_opp_counts["points"].fillna(0.0)
+        matchup_last = history[["points", "assists", "rebounds"]].groupby(matchup_keys).shift(1)
+        for stat in ("points", "assists", "rebounds"):
+            engineered[f"vs_opp_{stat}_last"] = matchup_last[stat].fillna(0.0)
+
+    return _select_feature_frame(ordered, engineered)
+
+
+def _build_features_reference(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per-player lambda implementation of _build_features, kept for parity checks."""
+    ordered = _prepare_feature_frame(frame)
+    engineered_columns = {}
+    for feature_name, source_column in _STAT_SOURCES.items():
+        for window in (3, 5, 10):
+            engineered_columns[f"{feature_name}_rolling_{window}"] = (
+                ordered.groupby("player_id")[source_column]
+                .transform(lambda series: series.shift(1).rolling(window, min_periods=1).mean())
+            )
+            engineered_columns[f"{feature_name}_rolling_std_{window}"] = (
+                ordered.groupby("player_id")[source_column]
+                .transform(lambda series: series.shift(1).rolling(window, min_periods=2).std())
+            )
+        engineered_columns[f"{feature_name}_season_avg"] = (
+            ordered.groupby("player_id")[source_column]
+            .transform(lambda series: series.shift(1).expanding().mean())
+            .reset_index(level=0, drop=True)
+        )
+        engineered_columns[f"{feature_name}_last_game"] = ordered.groupby("player_id")[source_column].shift(1)
+
+    for source_column in _ROLE_SIGNAL_COLUMNS:
+        feature_prefix = source_column.removesuffix("_game")
+        for window in (5, 10):
+            engineered_columns[f"{feature_prefix}_rate_{window}"] = (
+                ordered.groupby("player_id")[source_column]
+                .transform(lambda series: series.shift(1).rolling(window, min_periods=1).mean())
+            )
+
+    for feature_name, source_column in _ASSIST_SPECIALTY_SOURCES.items():
+        for window in (3, 5, 10):
+            engineered_columns[f"{feature_name}_rolling_{window}"] = (
+                ordered.groupby("player_id")[source_column]
+                .transform(lambda series: series.shift(1).rolling(window, min_periods=1).mean())
+            )
+        engineered_columns[f"{feature_name}_season_avg"] = (
+            ordered.groupby("player_id")[source_column]
+            .transform(lambda series: series.shift(1).expanding().mean())
+            .reset_index(level=0, drop=True)
+        )
+        engineered_columns[f"{feature_name}_last_game"] = ordered.groupby("player_id")[source_column].shift(1)
+
+    engineered = pd.DataFrame(engineered_columns, index=ordered.index)
+    _add_matchup_features(engineered, ordered)
+
+    # Role stability features
+    engineered["minutes_volatility_10"] = (
+        ordered.groupby("player_id")["minutes"]
+        .transform(lambda s: s.shift(1).rolling(10, min_periods=2).std())
+    )
+    _add_role_stability_features(engineered, ordered)
+
     # Opponent-specific history features: how player performs against this specific team
     if "opponent_abbr" in ordered.columns:
         for stat in ("points", "assists", "rebounds", "minutes"):
@@ -389,14 +542,7 @@ def _build_features(frame: pd.DataFrame) -> pd.DataFrame:
                 .fillna(0.0)
             )
 
-    ordered = pd.concat([ordered, engineered], axis=1)
-
-    feature_columns = [
-        column
-        for column in [*PREGAME_CONTEXT_COLUMNS, *engineered.columns.tolist()]
-        if column in ordered.columns
-    ]
-    return ordered[["game_date", "player_id", *TARGET_COLUMNS, "minutes", *feature_columns]]
+    return _select_feature_frame(ordered, engineered)
 
 
 def _prop_style_metrics(y_true: pd.Series, predictions: pd.Series, tolerances: list[int]) -> dict[str, float]:
@@ -411,25 +557,47 @@ def _prop_style_metrics(y_true: pd.Series, predictions: pd.Series, tolerances: l
     return metrics
 
 
-def _train_target(
-    training_frame: pd.DataFrame,
-    validation_frame: pd.DataFrame,
-    target: str,
-) -> tuple[Pipeline, dict[str, float], list[str]]:
-    feature_columns = [
+def _feature_columns(training_frame: pd.DataFrame) -> list[str]:
+    return [
         column
         for column in training_frame.columns
         if column not in {"game_date", "player_id", *TARGET_COLUMNS, *AUXILIARY_TARGETS}
     ]
-    X_train = training_frame[feature_columns]
-    y_train = training_frame[target]
-    X_valid = validation_frame[feature_columns]
-    y_valid = validation_frame[target]
+
+
+def _sample_weights(training_frame: pd.DataFrame) -> pd.Series:
     days_from_end = (training_frame["game_date"].max() - training_frame["game_date"]).dt.days
     sample_weight = (0.995 ** days_from_end).clip(lower=0.15)
     # Down-weight short-minute games (garbage time / early foul trouble / DNP-adjacent)
     quality_weight = np.where(training_frame["minutes"].fillna(0) < 15, 0.25, 1.0)
-    sample_weight = (sample_weight * quality_weight).clip(lower=0.05)
+    return (sample_weight * quality_weight).clip(lower=0.05)
+
+
+def _validation_metrics(validation_frame: pd.DataFrame, target: str, predictions: np.ndarray) -> dict[str, float]:
+    config = TARGET_CONFIG.get(target) or AUXILIARY_TARGET_CONFIG[target]
+    y_valid = validation_frame[target]
+    metrics = _prop_style_metrics(y_valid, predictions, config["tolerances"])
+
+    line_column = config.get("line_column")
+    if line_column in validation_frame.columns and (validation_frame[line_column] > 0).any():
+        available = validation_frame[line_column].notna()
+        line_values = validation_frame.loc[available, line_column]
+        line_predictions = pd.Series(predictions, index=validation_frame.index).loc[available]
+        actual = y_valid.loc[available]
+        metrics["over_under_hit_rate"] = float(((line_predictions > line_values) == (actual > line_values)).mean())
+    return metrics
+
+
+def _train_target(
+    training_frame: pd.DataFrame,
+    validation_frame: pd.DataFrame,
+    target: str,
+) -> tuple[Pipeline, dict[str, float], list[str]]:
+    feature_columns = _feature_columns(training_frame)
+    X_train = training_frame[feature_columns]
+    y_train = training_frame[target]
+    X_valid = validation_frame[feature_columns]
+    sample_weight = _sample_weights(training_frame)
 
     best_model = None
     best_metrics = None
@@ -451,15 +619,7 @@ def _train_target(
         )
         model.fit(X_train, y_train, regressor__sample_weight=sample_weight)
         predictions = model.predict(X_valid)
-        metrics = _prop_style_metrics(y_valid, predictions, TARGET_CONFIG[target]["tolerances"])
-
-        line_column = TARGET_CONFIG[target]["line_column"]
-        if line_column in validation_frame.columns and (validation_frame[line_column] > 0).any():
-            available = validation_frame[line_column].notna()
-            line_values = validation_frame.loc[available, line_column]
-            line_predictions = pd.Series(predictions, index=validation_frame.index).loc[available]
-            actual = y_valid.loc[available]
-            metrics["over_under_hit_rate"] = float(((line_predictions > line_values) == (actual > line_values)).mean())
+        metrics = _validation_metrics(validation_frame, target, predictions)
 
         if metrics["mae"] < best_mae:
             best_model = model
@@ -474,19 +634,12 @@ def _train_auxiliary_target(
     validation_frame: pd.DataFrame,
     target: str,
 ) -> tuple[Pipeline, dict[str, float], list[str]]:
-    feature_columns = [
-        column
-        for column in training_frame.columns
-        if column not in {"game_date", "player_id", *TARGET_COLUMNS, *AUXILIARY_TARGETS}
-    ]
+    feature_columns = _feature_columns(training_frame)
     X_train = training_frame[feature_columns]
     y_train = training_frame[target]
     X_valid = validation_frame[feature_columns]
     y_valid = validation_frame[target]
-    days_from_end = (training_frame["game_date"].max() - training_frame["game_date"]).dt.days
-    sample_weight = (0.995 ** days_from_end).clip(lower=0.15)
-    quality_weight = np.where(training_frame["minutes"].fillna(0) < 15, 0.25, 1.0)
-    sample_weight = (sample_weight * quality_weight).clip(lower=0.05)
+    sample_weight = _sample_weights(training_frame)
 
     best_model = None
     best_metrics = None
@@ -518,7 +671,56 @@ def _train_auxiliary_target(
     return best_model, best_metrics, feature_columns
 
 
-def train_models(dataset_path: Path, output_dir: Path, validation_ratio: float) -> dict[str, dict[str, float]]:
+def _train_joint_models(
+    training_frame: pd.DataFrame,
+    validation_frame: pd.DataFrame,
+) -> tuple[Any, dict[str, dict[str, float]], list[str]]:
+    """
+    Joint mode: one median imputer and one binned LightGBM Dataset shared by
+    every target, with the same candidate grids as the per-target pipelines.
+    Returns a modeling.JointRegressor, per-target validation metrics and the
+    shared feature list.
+    """
+    import lightgbm
+
+    from modeling import JointRegressor
+
+    feature_columns = _feature_columns(training_frame)
+    imputer = SimpleImputer(strategy="median").fit(training_frame[feature_columns])
+    X_train = imputer.transform(training_frame[feature_columns])
+    X_valid = imputer.transform(validation_frame[feature_columns])
+    # Binning ~290 columns is a large share of each fit, so the Dataset is built once and only the label changes.
+    # feature_pre_filter stays off because the candidates use different min_child_samples on the same bins.
+    dataset = lightgbm.Dataset(
+        X_train,
+        weight=_sample_weights(training_frame).to_numpy(),
+        params={"feature_pre_filter": False, "verbose": -1},
+        free_raw_data=False,
+    ).construct()
+
+    boosters = {}
+    metrics_by_target = {}
+    for target in [*TARGET_COLUMNS, *AUXILIARY_TARGETS]:
+        config = TARGET_CONFIG.get(target) or AUXILIARY_TARGET_CONFIG[target]
+        dataset.set_label(training_frame[target].to_numpy(dtype=np.float64))
+        best_mae = float("inf")
+        for params in config["candidate_params"]:
+            booster_params = {key: value for key, value in params.items() if key != "n_estimators"}
+            booster = lightgbm.train(
+                {"objective": "regression", "subsample": 0.8, "colsample_bytree": 0.8, "random_state": 42, "verbose": -1, **booster_params},
+                dataset,
+                num_boost_round=params["n_estimators"],
+            )
+            metrics = _validation_metrics(validation_frame, target, booster.predict(X_valid))
+            if metrics["mae"] < best_mae:
+                boosters[target] = booster
+                metrics_by_target[target] = metrics
+                best_mae = metrics["mae"]
+
+    return JointRegressor.from_imputer(imputer, boosters, feature_columns), metrics_by_target, feature_columns
+
+
+def load_dataset(dataset_path: Path) -> pd.DataFrame:
     frame = pd.read_csv(dataset_path)
     missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
     if missing:
@@ -529,8 +731,114 @@ def train_models(dataset_path: Path, output_dir: Path, validation_ratio: float)
         )
 
     frame["game_date"] = pd.to_datetime(frame["game_date"], errors="coerce")
-    frame = frame.dropna(subset=["game_date"]).copy()
-    feature_frame = _build_features(frame)
+    return frame.dropna(subset=["game_date"]).copy()
+
+
+def _write_atomic(path: Path, write: Callable[[Path], Any]) -> None:
+    """Write through a temp file and rename, so a serving worker never reads a half-written artifact."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    write(tmp_path)
+    tmp_path.replace(path)
+
+
+# Artifacts are named per training run (model_points.<run_id>.pkl), so a serving bundle only ever opens its own files.
+_RUN_ARTIFACT_PATTERN = re.compile(r"^model_\w+\.\d{8}-\d{6}\.(pkl|txt)$")
+
+
+def _referenced_artifacts(metadata: dict[str, Any]) -> set[str]:
+    """Every artifact file a model_metadata.json entry points at."""
+    payloads = [*metadata.get("targets", {}).values(), *metadata.get("auxiliary", {}).values()]
+    if metadata.get("joint"):
+        payloads.append(metadata["joint"])
+    names = set()
+    for payload in payloads:
+        names.add(payload["artifact_name"])
+        native = payload.get("native") or {}
+        if native.get("booster_file"):
+            names.add(native["booster_file"])
+        names.update((native.get("booster_files") or {}).values())
+    return names
+
+
+def _prune_old_runs(output_dir: Path, keep: set[str]) -> None:
+    """Delete artifacts of earlier training runs that neither the new nor the replaced metadata references."""
+    for path in output_dir.iterdir():
+        if _RUN_ARTIFACT_PATTERN.match(path.name) and path.name not in keep:
+            try:
+                path.unlink()
+            except OSError as exc:
+                print(f"Could not prune old model artifact {path.name}: {exc}")
+
+
+def _export_native_model(model: Pipeline, output_dir: Path, artifact_name: str, check_frame: pd.DataFrame) -> dict[str, Any] | None:
+    """
+    Save the pipeline's booster as LightGBM text next to the pickle and return
+    the metadata entry modeling.py loads it from, or None if the exported model
+    does not reproduce the pipeline on check_frame.
+    """
+    from modeling import NativeRegressor
+
+    native = NativeRegressor.from_pipeline(model)
+    if native is None:
+        return None
+    booster_file = f"{Path(artifact_name).stem}.txt"
+    _write_atomic(output_dir / booster_file, lambda path: native.booster.save_model(str(path)))
+    exported = native.export(booster_file)
+    reloaded = NativeRegressor.from_export(output_dir, exported)
+    if not np.array_equal(model.predict(check_frame), reloaded.predict(check_frame.to_numpy(dtype=np.float64))):
+        print(f"Native export of {artifact_name} does not match the pipeline; serving the pickle instead.")
+        (output_dir / booster_file).unlink(missing_ok=True)
+        return None
+    return exported
+
+
+def _save_joint_model(joint: Any, output_dir: Path, run_id: str, check_frame: pd.DataFrame) -> dict[str, Any] | None:
+    """
+    Save each joint booster as LightGBM text and return the metadata entry
+    modeling.py loads them from, or None if the reloaded boosters do not
+    reproduce the joint model on check_frame.
+    """
+    from modeling import JointRegressor
+
+    booster_files = {target: f"model_joint_{target}.{run_id}.txt" for target in joint.boosters}
+    for target, booster_file in booster_files.items():
+        _write_atomic(output_dir / booster_file, lambda path: joint.boosters[target].save_model(str(path)))
+    exported = joint.export(booster_files)
+    reloaded = JointRegressor.from_export(output_dir, exported, joint.feature_names)
+    expected = joint.predict(check_frame.to_numpy(dtype=np.float64))
+    actual = reloaded.predict(check_frame.to_numpy(dtype=np.float64))
+    if any(not np.array_equal(expected[target], actual[target]) for target in expected):
+        print("Native export of the joint model does not match it; serving the pickle instead.")
+        for booster_file in booster_files.values():
+            (output_dir / booster_file).unlink(missing_ok=True)
+        return None
+    return exported
+
+
+def _publish_metadata(output_dir: Path, metadata: dict[str, Any]) -> None:
+    """
+    Point model_metadata.json at this run's artifacts, written last: running
+    workers hot-reload when it changes (modeling.load_predictor_bundle). The
+    replaced run's files stay so workers still serving it can finish loading
+    them; runs before that are pruned.
+    """
+    metadata_path = output_dir / "model_metadata.json"
+    keep: set[str] | None = _referenced_artifacts(metadata)
+    if metadata_path.exists():
+        try:
+            keep |= _referenced_artifacts(json.loads(metadata_path.read_text()))
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Could not read the replaced model metadata, leaving old artifacts in place: {exc}")
+            keep = None
+    _write_atomic(metadata_path, lambda path: path.write_text(json.dumps(metadata, indent=2)))
+    if keep is not None:
+        _prune_old_runs(output_dir, keep)
+
+
+def train_models(dataset_path: Path, output_dir: Path, validation_ratio: float, joint: bool = False) -> dict[str, dict[str, float]]:
+    from feature_store import get_feature_store
+
+    feature_frame = get_feature_store(dataset_path).load()
     feature_frame = feature_frame.dropna(subset=["points", "assists", "rebounds"]).copy()
     feature_frame = feature_frame.sort_values("game_date")
 
@@ -542,43 +850,70 @@ def train_models(dataset_path: Path, output_dir: Path, validation_ratio: float)
 
     output_dir.mkdir(parents=True, exist_ok=True)
     metrics_by_target = {}
-    metadata = {"targets": {}, "auxiliary": {}}
+    run_id = time.strftime("%Y%m%d-%H%M%S")
+    metadata = {"run_id": run_id, "targets": {}, "auxiliary": {}}
 
     artifact_names = {
-        "points": "model_points.pkl",
-        "assists": "model_assists.pkl",
-        "rebounds": "model_rebounds.pkl",
+        "points": f"model_points.{run_id}.pkl",
+        "assists": f"model_assists.{run_id}.pkl",
+        "rebounds": f"model_rebounds.{run_id}.pkl",
     }
     auxiliary_artifact_names = {
-        "minutes": "model_minutes.pkl",
+        "minutes": f"model_minutes.{run_id}.pkl",
     }
 
+    if joint:
+        joint_model, metrics_by_target, feature_columns = _train_joint_models(training_frame, validation_frame)
+        artifact_name = f"model_joint.{run_id}.pkl"
+        _write_atomic(output_dir / artifact_name, lambda path: path.write_bytes(pickle.dumps(joint_model)))
+        metadata["mode"] = "joint"
+        metadata["joint"] = {
+            "artifact_name": artifact_name,
+            "feature_names": feature_columns,
+            "native": _save_joint_model(joint_model, output_dir, run_id, validation_frame[feature_columns]),
+        }
+        for target in [*TARGET_COLUMNS, *AUXILIARY_TARGETS]:
+            section = "targets" if target in TARGET_COLUMNS else "auxiliary"
+            metadata[section][target] = {
+                "artifact_name": artifact_name,
+                "feature_names": feature_columns,
+                "metrics": metrics_by_target[target],
+            }
+        validation_matrix = validation_frame[feature_columns].to_numpy(dtype=np.float64, copy=True)
+        metadata["residuals"] = fit_residuals(validation_frame, joint_model.predict(validation_matrix, TARGET_COLUMNS))
+        _publish_metadata(output_dir, metadata)
+        return {target: metrics_by_target[target] for target in TARGET_COLUMNS}
+
+    validation_predictions = {}
     for target in TARGET_COLUMNS:
         model, metrics, feature_columns = _train_target(training_frame, validation_frame, target)
         artifact_name = artifact_names[target]
-        with open(output_dir / artifact_name, "wb") as artifact:
-            pickle.dump(model, artifact)
+        _write_atomic(output_dir / artifact_name, lambda path: path.write_bytes(pickle.dumps(model)))
+        validation_predictions[target] = model.predict(validation_frame[feature_columns])
 
         metrics_by_target[target] = metrics
         metadata["targets"][target] = {
             "artifact_name": artifact_name,
             "feature_names": feature_columns,
             "metrics": metrics,
+            "native": _export_native_model(model, output_dir, artifact_name, validation_frame[feature_columns]),
         }
 
     for target in AUXILIARY_TARGETS:
         model, metrics, feature_columns = _train_auxiliary_target(training_frame, validation_frame, target)
         artifact_name = auxiliary_artifact_names[target]
-        with open(output_dir / artifact_name, "wb") as artifact:
-            pickle.dump(model, artifact)
+        _write_atomic(output_dir / artifact_name, lambda path: path.write_bytes(pickle.dumps(model)))
 
         metadata["auxiliary"][target] = {
             "artifact_name": artifact_name,
             "feature_names": feature_columns,
             "metrics": metrics,
+            "native": _export_native_model(model, output_dir, artifact_name, validation_frame[feature_columns]),
         }
 
-    (output_dir / "model_metadata.json").write_text(json.dumps(metadata, indent=2))
+    metadata["residuals"] = fit_residuals(validation_frame, validation_predictions)
+
+    _publish_metadata(output_dir, metadata)
     return metrics_by_target
 
 
@@ -587,12 +922,18 @@ def main() -> None:
     parser.add_argument("--dataset", required=True, help="CSV file with game-by-game player stats.")
     parser.add_argument("--output-dir", default=".", help="Directory to write model artifacts.")
     parser.add_argument("--validation-ratio", type=float, default=0.2, help="Fraction of rows reserved for validation.")
+    parser.add_argument(
+        "--joint",
+        action="store_true",
+        help="Train one shared imputer and binned dataset for points, assists, rebounds and minutes instead of four pipelines.",
+    )
     args = parser.parse_args()
 
     metrics_by_target = train_models(
         dataset_path=Path(args.dataset),
         output_dir=Path(args.output_dir),
         validation_ratio=args.validation_ratio,
+        joint=args.joint,
     )
 
     print(json.dumps(metrics_by_target, indent=2))
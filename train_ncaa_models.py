@@ -21,6 +21,7 @@ from sklearn.metrics import mean_absolute_error
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from http_replay import build_session
 from ncaa_features import build_feature_row, sort_games
 from underdog_client import UnderdogClient
 from config import settings
@@ -300,7 +301,7 @@ def main() -> None:
 
     print(f"Found {len(player_names)} unique players on the board.\n")
 
-    session = requests.Session()
+    session = build_session()
     session.headers.update(SR_HEADERS)
 
     slug_cache: dict[str, str | None] = {}
@@ -3,12 +3,13 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
 from typing import Any, Iterable
 
 import requests
 
 from config import settings
+from http_replay import build_session
+from swr_cache import SWRCache
 
 
 MARKET_KEY_BY_LABEL = {
@@ -111,13 +112,18 @@ class UnderdogProviderError(RuntimeError):
 
 class UnderdogClient:
     def __init__(self) -> None:
-        self.session = requests.Session()
+        self.session = build_session()
         self.session.headers.update(
             {
                 "Accept": "application/json",
                 "User-Agent": settings.underdog_user_agent,
             }
         )
+        self._board_cache = SWRCache(
+            "underdog.board_entries",
+            ttl=settings.board_cache_ttl_seconds,
+            max_stale=settings.board_cache_max_stale_seconds,
+        )
 
     def is_configured(self) -> bool:
         return all(
@@ -327,8 +333,10 @@ class UnderdogClient:
                     )
         return entries
 
-    @lru_cache(maxsize=2)
     def _cached_board_entries(self, sport: str = "nba") -> tuple[UnderdogBoardEntry, ...]:
+        return self._board_cache.get(sport, lambda: self._load_board_entries(sport))
+
+    def _load_board_entries(self, sport: str = "nba") -> tuple[UnderdogBoardEntry, ...]:
         board = self._fetch_board(sport)
         return tuple(
             sorted(
@@ -343,9 +351,21 @@ class UnderdogClient:
             )
         )
 
-    def fetch_board_entries(self, sport: str = "nba") -> list[UnderdogBoardEntry]:
+    def fetch_board_entries(self, sport: str = "nba", *, fresh: bool = False) -> list[UnderdogBoardEntry]:
+        """Cached board; fresh=True refetches it now (the last good board is kept if that fails)."""
+        if fresh:
+            return list(self._board_cache.reload(sport, lambda: self._load_board_entries(sport)))
         return list(self._cached_board_entries(sport))
 
+    def board_fetched_at(self, sport: str = "nba") -> float | None:
+        entry = self._board_cache.peek(sport)
+        return entry[0] if entry is not None else None
+
+    def board_start_times(self, sport: str = "nba") -> list[datetime]:
+        """Start times on the cached board, without fetching it."""
+        entry = self._board_cache.peek(sport)
+        return [start for start in (_parse_datetime(board_entry.start_time) for board_entry in (entry[1] if entry else ())) if start]
+
     def _line_group_rank(self, candidates: list[tuple[int, UnderdogBoardEntry]]) -> tuple[int, int, int, float, float, datetime]:
         best_context_score = max((score for score, _ in candidates), default=0)
         selections = {entry.selection_key for _, entry in candidates if entry.selection_key}